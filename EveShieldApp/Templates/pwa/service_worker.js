@@ -0,0 +1,208 @@
+{% load static %}// EveShield service worker - generated by EveShieldApp.views.service_worker
+const CACHE_NAME = 'eveshield-{{ cache_version }}';
+const SNAPSHOT_URL = '{% url "eveshield:api:directory_snapshot" %}';
+const EMERGENCY_URL = '{% url "eveshield:resources:emergency_contacts" %}';
+const STYLESHEETS = [
+    '{% static "vendor/bootstrap/css/bootstrap.min.css" %}',
+    '{% static "vendor/bootstrap-icons/bootstrap-icons.min.css" %}',
+    '{% static "css/eveshield.css" %}',
+];
+
+// Pages and assets survivors need even without a connection.
+const PRECACHE_URLS = [
+    EMERGENCY_URL,
+    '{% url "eveshield:resources:list" %}',
+    ...STYLESHEETS,
+    '{% static "vendor/popper/popper.min.js" %}',
+    '{% static "vendor/bootstrap/js/bootstrap.min.js" %}',
+    '{% static "vendor/bootstrap-icons/fonts/bootstrap-icons.woff2" %}',
+];
+
+// Navigations under these prefixes are served from the device, and the
+// copy is refreshed in the background.
+const OFFLINE_PAGES = ['/resources/', '/lawyers/', '/mental-health/'];
+
+// Directory pages the snapshot can stand in for: path, snapshot key, title
+// and the field describing the provider's work.
+const DIRECTORIES = {
+    '{% url "eveshield:lawyers:directory" %}': { key: 'lawyers', title: 'Lawyers', work: 'specialization' },
+    '{% url "eveshield:mental_health:directory" %}': { key: 'therapists', title: 'Counsellors', work: 'specialty' },
+};
+
+// Everything this worker stores is fetched without cookies, so the cache
+// only ever holds what a signed-out visitor sees and nothing of one
+// person's account is left on a shared device for the next.
+function anonymous(url) {
+    return new Request(url, { credentials: 'omit' });
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        // All or nothing: if any page, asset or the directory snapshot fails
+        // to load, this worker is not installed and the previous one, with a
+        // complete cache, stays.
+        caches.open(CACHE_NAME)
+            .then((cache) => cache.addAll(PRECACHE_URLS.map(anonymous)))
+            .then(() => syncSnapshot())
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys().then((keys) =>
+            Promise.all(keys.filter((key) => key !== CACHE_NAME).map((key) => caches.delete(key)))
+        ).then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+
+    if (url.pathname === SNAPSHOT_URL) {
+        event.respondWith(syncSnapshot().then(jsonResponse, () => cachedSnapshot().then(
+            (snapshot) => snapshot ? jsonResponse(snapshot) : Response.error()
+        )));
+    } else if (url.pathname.startsWith('{% get_static_prefix %}')) {
+        event.respondWith(cacheFirst(request));
+    } else if (request.mode === 'navigate' && OFFLINE_PAGES.some((prefix) => url.pathname.startsWith(prefix))) {
+        event.respondWith(offlinePage(event, request, url));
+    }
+});
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(CACHE_NAME);
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// The stored copy of a page straight away, with a fresh one fetched in the
+// background for next time. Without a stored copy the page comes from the
+// network; offline, directory pages are built from the snapshot.
+async function offlinePage(event, request, url) {
+    const cache = await caches.open(CACHE_NAME);
+    const directory = DIRECTORIES[url.pathname];
+    const refresh = fetch(anonymous(request.url)).then((response) => {
+        if (response.ok && !response.redirected) {
+            return cache.put(request.url, response);
+        }
+    }).catch(() => {});
+    event.waitUntil(directory ? Promise.all([refresh, syncSnapshot().catch(() => {})]) : refresh);
+
+    const cached = await cache.match(request.url);
+    if (cached) {
+        return cached;
+    }
+    try {
+        return await fetch(request);
+    } catch (error) {
+        const snapshot = directory ? await cachedSnapshot() : null;
+        if (snapshot) {
+            return renderDirectory(directory, snapshot, url.searchParams);
+        }
+        return cache.match(EMERGENCY_URL);
+    }
+}
+
+async function cachedSnapshot() {
+    const cache = await caches.open(CACHE_NAME);
+    const response = await cache.match(SNAPSHOT_URL);
+    return response ? response.json() : null;
+}
+
+// Keep a full directory snapshot in the cache and only ask the server for
+// rows that changed since the cached version. Resolves to the merged
+// snapshot; rejects if the server could not be reached.
+async function syncSnapshot() {
+    const snapshot = await cachedSnapshot();
+    const query = snapshot && snapshot.version ? '?since=' + encodeURIComponent(snapshot.version) : '';
+    const response = await fetch(anonymous(SNAPSHOT_URL + query));
+    if (!response.ok) {
+        throw new Error(response.statusText);
+    }
+    const delta = await response.json();
+
+    const merged = snapshot && !delta.full ? mergeSnapshot(snapshot, delta) : delta;
+    merged.full = true;
+    const cache = await caches.open(CACHE_NAME);
+    await cache.put(SNAPSHOT_URL, jsonResponse(merged));
+    return merged;
+}
+
+function mergeSnapshot(snapshot, delta) {
+    const merged = { version: delta.version || snapshot.version };
+    for (const key of ['lawyers', 'therapists']) {
+        const rows = new Map(snapshot[key].map((row) => [row.id, row]));
+        for (const row of delta[key]) {
+            if (row.is_active) {
+                rows.set(row.id, row);
+            } else {
+                rows.delete(row.id);
+            }
+        }
+        merged[key] = Array.from(rows.values());
+    }
+    return merged;
+}
+
+function jsonResponse(data) {
+    return new Response(JSON.stringify(data), { headers: { 'Content-Type': 'application/json' } });
+}
+
+function escapeHtml(value) {
+    return String(value || '').replace(/[&<>"']/g, (character) => '&#' + character.charCodeAt(0) + ';');
+}
+
+// A plain directory page from the snapshot, honouring the page's county and
+// search filters, for when the visitor is offline without a stored copy.
+function renderDirectory(directory, snapshot, params) {
+    const county = params.get('county') || '';
+    const search = (params.get('search') || '').toLowerCase();
+    const rows = snapshot[directory.key]
+        .filter((row) => !county || row.county === county)
+        .filter((row) => !search || [row.name, row[directory.work]].some(
+            (text) => (text || '').toLowerCase().includes(search)
+        ))
+        .sort((a, b) => a.name.localeCompare(b.name));
+
+    const cards = rows.map((row) => `
+        <div class="col-md-6 col-lg-4"><div class="card h-100"><div class="card-body">
+            <h5 class="card-title">${escapeHtml(row.name)}</h5>
+            <p class="card-text text-muted">${escapeHtml(row[directory.work])}</p>
+            <p class="card-text"><i class="bi bi-geo-alt"></i> ${escapeHtml(row.county)}</p>
+            ${row.phone ? `<a class="btn btn-sm btn-primary" href="tel:${escapeHtml(row.phone)}">${escapeHtml(row.phone)}</a>` : ''}
+            ${row.email ? `<a class="btn btn-sm btn-outline-primary" href="mailto:${escapeHtml(row.email)}">Email</a>` : ''}
+        </div></div></div>`).join('');
+
+    const html = `<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>${directory.title} (offline) - EveShield</title>
+    ${STYLESHEETS.map((href) => `<link rel="stylesheet" href="${href}">`).join('\n    ')}
+</head>
+<body>
+    <main class="container py-4">
+        <h1 class="h3">${directory.title}</h1>
+        <div class="alert alert-warning">
+            You are offline. This list was saved on your device and may be out of date.
+            In an emergency call <a href="tel:999">999</a> or the GBV hotline <a href="tel:1195">1195</a>.
+        </div>
+        <div class="row g-3">${cards || '<p>No matching entries saved on this device.</p>'}</div>
+    </main>
+</body>
+</html>`;
+    return new Response(html, { headers: { 'Content-Type': 'text/html; charset=utf-8' } });
+}
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from EveShieldApp import models
+
+
+@transaction.atomic
+def register_user(user, *, phone="", county=None):
+    """
+    Save a new ``user`` and its profile in one transaction.
+
+    The profile is inserted by the post_save signal on User with these
+    fields already set, so signup costs two INSERTs and nothing else.
+    """
+    user._profile_fields = {"phone": phone, "county": county}
+    user.save()
+    return user
+
+
+@transaction.atomic
+def bulk_register_users(users, profile_fields):
+    """
+    Insert many new users and their profiles with two bulk INSERTs.
+
+    ``profile_fields`` holds one dict of UserProfile fields per user.
+    bulk_create skips signals, so the profiles are created here.
+    """
+    users = User.objects.bulk_create(users)
+    models.UserProfile.objects.bulk_create(
+        [models.UserProfile(user=user, **fields) for user, fields in zip(users, profile_fields)]
+    )
+    return users
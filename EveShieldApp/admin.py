@@ -3,43 +3,88 @@ from django.contrib import admin
 from EveShieldApp import models
 
 
+@admin.register(models.County)
+class CountyAdmin(admin.ModelAdmin):
+    list_display = ("code", "name", "latitude", "longitude")
+    search_fields = ("name",)
+    ordering = ("code",)
+
+
 @admin.register(models.UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "phone", "county", "created_at")
     list_filter = ("county", "created_at")
-    search_fields = ("user__username", "user__email", "phone", "county")
+    search_fields = ("user__username", "user__email", "phone", "county__name")
 
 
 @admin.register(models.GBVReport)
 class GBVReportAdmin(admin.ModelAdmin):
-    list_display = ("id", "type_of_violence", "location", "status", "created_at")
-    list_filter = ("status", "type_of_violence", "created_at")
+    list_display = ("id", "type_of_violence", "location", "county", "status", "created_at")
+    list_filter = ("status", "type_of_violence", "county", "created_at")
     search_fields = ("location", "details", "admin_notes")
     readonly_fields = ("created_at", "updated_at")
     fieldsets = (
         (
             "Report Information",
-            {"fields": ("type_of_violence", "location", "details", "incident_date", "file_upload")},
+            {"fields": ("type_of_violence", "location", "county", "details", "incident_date", "file_upload")},
         ),
         ("Status & Management", {"fields": ("status", "admin_notes", "created_at", "updated_at")}),
     )
 
 
+@admin.register(models.ArchivedReport)
+class ArchivedReportAdmin(admin.ModelAdmin):
+    list_display = ("id", "type_of_violence", "county", "year", "resolved_at", "archived_at")
+    list_filter = ("year", "type_of_violence", "county")
+    search_fields = ("location", "details", "admin_notes")
+
+    # Archived reports are a read-only record; archive_reports is the only writer.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("id", "report", "channel", "recipient_name", "status", "attempts", "sent_at", "created_at")
+    list_filter = ("status", "channel", "created_at")
+    search_fields = ("recipient", "recipient_name")
+    raw_id_fields = ("report",)
+
+    # send_notifications is the only writer; failed messages can be deleted.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(models.Lawyer)
 class LawyerAdmin(admin.ModelAdmin):
     list_display = ("name", "county", "phone", "email", "is_active", "created_at")
     list_filter = ("county", "is_active", "created_at")
-    search_fields = ("name", "county", "specialization", "phone", "email")
+    search_fields = ("name", "county__name", "specialization", "phone", "email")
     list_editable = ("is_active",)
 
+    # Deactivate instead: the directory API and offline snapshots only tell
+    # clients about removals through is_active.
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(models.Therapist)
 class TherapistAdmin(admin.ModelAdmin):
     list_display = ("name", "county", "specialty", "phone", "email", "is_active", "created_at")
     list_filter = ("county", "is_active", "created_at")
-    search_fields = ("name", "county", "specialty", "phone", "email")
+    search_fields = ("name", "county__name", "specialty", "phone", "email")
     list_editable = ("is_active",)
 
+    # Deactivate instead, as for lawyers.
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(models.ResourceArticle)
 class ResourceArticleAdmin(admin.ModelAdmin):
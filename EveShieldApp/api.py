@@ -0,0 +1,252 @@
+import hashlib
+from datetime import timedelta
+
+from django.db.models import Count, Max
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+
+from EveShieldApp import gazetteer, geo, models
+
+# Fields clients may select with ?fields=; "id" is always returned.
+LAWYER_FIELDS = (
+    "id",
+    "name",
+    "phone",
+    "whatsapp",
+    "email",
+    "county",
+    "specialization",
+    "address",
+    "updated_at",
+)
+THERAPIST_FIELDS = (
+    "id",
+    "name",
+    "specialty",
+    "phone",
+    "email",
+    "county",
+    "address",
+    "qualifications",
+    "updated_at",
+)
+
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 1500
+DEFAULT_NEARBY_LIMIT = 10
+MAX_NEARBY_LIMIT = 50
+
+COUNTY_NAME = "county__name"
+
+# Saves do not always commit in updated_at order, so ?since= polls look back
+# this far; clients merge rows by id, so the repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=2)
+
+LAWYER_SNAPSHOT_FIELDS = ("id", "name", "phone", "whatsapp", "email", "county", "specialization", "is_active")
+THERAPIST_SNAPSHOT_FIELDS = ("id", "name", "phone", "email", "county", "specialty", "qualifications", "is_active")
+
+
+def parse_since(request):
+    """The ?since= timestamp as an aware datetime, or None for a full listing"""
+    since = request.GET.get("since")
+    if not since:
+        return None
+    since_dt = parse_datetime(since)
+    if since_dt is None or since_dt.tzinfo is None:
+        raise ValueError("'since' must be an ISO 8601 timestamp with a UTC offset.")
+    return since_dt
+
+
+def parse_fields(request, allowed):
+    requested = [name.strip() for name in request.GET.get("fields", "").split(",") if name.strip()]
+    if not requested:
+        return allowed
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    return ("id", *dict.fromkeys(name for name in requested if name != "id"))
+
+
+def parse_location(request):
+    """Search origin from ?lat=&lon= or a place name in ?near="""
+    near = request.GET.get("near")
+    if near:
+        place = gazetteer.locate(near)
+        if place is None:
+            raise ValueError(f"Unknown place: {near}.")
+        return place[1], place[2]
+    try:
+        lat, lon = float(request.GET["lat"]), float(request.GET["lon"])
+    except (KeyError, ValueError):
+        raise ValueError("Pass 'near' or numeric 'lat' and 'lon'.") from None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("'lat'/'lon' out of range.")
+    return lat, lon
+
+
+def parse_bounded(request, name, default, maximum, cast):
+    try:
+        value = cast(request.GET.get(name, default))
+    except ValueError:
+        raise ValueError(f"'{name}' must be a number.") from None
+    if not 0 < value <= maximum:
+        raise ValueError(f"'{name}' must be between 0 and {maximum}.")
+    return value
+
+
+def value_fields(fields):
+    """values() arguments for ``fields``, reading the county name through its FK"""
+    return [COUNTY_NAME if name == "county" else name for name in fields]
+
+
+def with_county_name(row):
+    if COUNTY_NAME in row:
+        row["county"] = row.pop(COUNTY_NAME)
+    return row
+
+
+async def table_stats(model):
+    return await model.objects.aaggregate(latest=Max("updated_at"), total=Count("id"))
+
+
+async def directory_api(request, model, allowed_fields):
+    """
+    Versioned JSON listing of one directory.
+
+    A full listing returns every active entry. With ``since`` only entries
+    updated after it, less SYNC_OVERLAP, are returned, and entries
+    deactivated since then are listed as tombstones. Entries are never
+    deleted (the admin only deactivates them), so every removal reaches
+    clients as a tombstone.
+
+    A strong ETag over the table version and query lets polling clients get
+    a bodiless 304 when nothing changed. CompressionMiddleware weakens it
+    (``W/``) on compressed responses, as their bytes differ from the
+    identity response; If-None-Match compares weakly, so 304s still work.
+    """
+    try:
+        since = parse_since(request)
+        fields = parse_fields(request, allowed_fields)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    stats = await table_stats(model)
+    raw = f"{model._meta.label}:{stats['latest']}:{stats['total']}:{','.join(fields)}:{since}"
+    etag = quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        entries_qs = model.objects.order_by("id")
+        if since is not None:
+            entries_qs = entries_qs.filter(updated_at__gte=since - SYNC_OVERLAP)
+        else:
+            entries_qs = entries_qs.filter(is_active=True)
+
+        results, tombstones = [], []
+        async for row in entries_qs.values(*value_fields(fields), "is_active").aiterator():
+            if row.pop("is_active"):
+                results.append(with_county_name(row))
+            else:
+                tombstones.append(row["id"])
+
+        response = JsonResponse(
+            {
+                # Full precision: DjangoJSONEncoder would round to milliseconds
+                # and make the next ?since= poll re-send the newest rows.
+                "version": stats["latest"] and stats["latest"].isoformat(),
+                "since": since and since.isoformat(),
+                "results": results,
+                "tombstones": tombstones,
+            }
+        )
+
+    response.headers["ETag"] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+async def lawyer_list(request):
+    """Lawyer directory API"""
+    return await directory_api(request, models.Lawyer, LAWYER_FIELDS)
+
+
+async def therapist_list(request):
+    """Therapist directory API"""
+    return await directory_api(request, models.Therapist, THERAPIST_FIELDS)
+
+
+async def nearby_api(request, model, fields):
+    """Nearest active providers within ``radius`` km, closest first"""
+    try:
+        lat, lon = parse_location(request)
+        radius = parse_bounded(request, "radius", DEFAULT_RADIUS_KM, MAX_RADIUS_KM, float)
+        limit = parse_bounded(request, "limit", DEFAULT_NEARBY_LIMIT, MAX_NEARBY_LIMIT, int)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    results = await geo.anearest(
+        model.objects.filter(is_active=True).order_by(), lat, lon, radius, limit, fields=value_fields(fields)
+    )
+    return JsonResponse(
+        {
+            "origin": [lat, lon],
+            "radius_km": radius,
+            "results": [with_county_name(row) for row in results],
+        }
+    )
+
+
+async def lawyer_nearby(request):
+    """Nearest lawyers API"""
+    return await nearby_api(request, models.Lawyer, LAWYER_FIELDS)
+
+
+async def therapist_nearby(request):
+    """Nearest therapists API"""
+    return await nearby_api(request, models.Therapist, THERAPIST_FIELDS)
+
+
+async def directory_snapshot(request):
+    """
+    Combined lawyer and therapist snapshot used by the service worker.
+
+    Without ``since`` it returns every active entry. With ``since`` (the
+    ``version`` of a previous snapshot) it returns only rows updated after
+    it, less SYNC_OVERLAP, including deactivated ones, so clients can merge
+    the delta.
+    """
+    try:
+        since = parse_since(request)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    lawyers_qs = models.Lawyer.objects.order_by()
+    therapists_qs = models.Therapist.objects.order_by()
+    if since is not None:
+        lawyers_qs = lawyers_qs.filter(updated_at__gte=since - SYNC_OVERLAP)
+        therapists_qs = therapists_qs.filter(updated_at__gte=since - SYNC_OVERLAP)
+    else:
+        lawyers_qs = lawyers_qs.filter(is_active=True)
+        therapists_qs = therapists_qs.filter(is_active=True)
+
+    versions = [
+        stats["latest"]
+        for stats in (await table_stats(models.Lawyer), await table_stats(models.Therapist))
+        if stats["latest"]
+    ]
+
+    snapshot = {
+        "version": max(versions).isoformat() if versions else request.GET.get("since"),
+        "full": since is None,
+        "lawyers": [
+            with_county_name(row)
+            async for row in lawyers_qs.values(*value_fields(LAWYER_SNAPSHOT_FIELDS)).aiterator()
+        ],
+        "therapists": [
+            with_county_name(row)
+            async for row in therapists_qs.values(*value_fields(THERAPIST_SNAPSHOT_FIELDS)).aiterator()
+        ],
+    }
+    return JsonResponse(snapshot)
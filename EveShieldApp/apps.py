@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EveshieldappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'EveShieldApp'
+
+    def ready(self):
+        from EveShieldApp import signals  # noqa: F401
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from EveShieldApp import models
+
+ARCHIVE_BATCH_SIZE = 500
+
+# Columns copied from the live table; the archive adds ``year`` and ``archived_at``.
+ARCHIVED_FIELDS = [
+    "id",
+    "type_of_violence",
+    "location",
+    "county_id",
+    "details",
+    "incident_date",
+    "file_upload",
+    "status",
+    "urgency",
+    "admin_notes",
+    "created_at",
+    "updated_at",
+    "resolved_at",
+]
+
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = settings.REPORT_ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable(cutoff):
+    """Live reports resolved before ``cutoff``"""
+    return models.GBVReport.objects.filter(status=models.ReportStatus.RESOLVED, resolved_at__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move up to ``batch_size`` archivable reports into the archive table.
+
+    Each batch is its own transaction: the copy and the delete commit
+    together, so an interrupted run leaves every report in exactly one
+    table and the next run carries on where it stopped. On SQLite the
+    write lock is taken when the transaction begins (see the DATABASES
+    transaction_mode), so a busy site makes the batch wait, not fail.
+    Returns the number of reports moved.
+    """
+    with transaction.atomic():
+        rows = list(archivable(cutoff).select_for_update().order_by("id").values(*ARCHIVED_FIELDS)[:batch_size])
+        if not rows:
+            return 0
+        models.ArchivedReport.objects.bulk_create(
+            [models.ArchivedReport(year=row["created_at"].year, **row) for row in rows]
+        )
+        # The LSH bands cascade with the live row; archived reports are not deduplicated.
+        models.GBVReport.objects.filter(id__in=[row["id"] for row in rows]).delete()
+    return len(rows)
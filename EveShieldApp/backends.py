@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+
+from EveShieldApp.hashers import acheck_password, run_hasher
+
+UserModel = get_user_model()
+
+
+class HashingPoolModelBackend(ModelBackend):
+    """
+    ModelBackend whose async path hashes on the password hashing pool.
+
+    Django's own ``aauthenticate`` verifies the password on the event loop,
+    which stalls every other request for the length of a hash.
+    """
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as wrong passwords.
+            await run_hasher(make_password, password)
+            return None
+        if await acheck_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
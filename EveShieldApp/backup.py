@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+BACKUP_PAGES = 64
+BACKUP_PAUSE = 0.005
+HASH_BLOCK_SIZE = 1024 * 1024
+
+DATABASE_FILE = "db.sqlite3"
+MANIFEST_FILE = "manifest.json"
+# Media files are stored once per content hash and shared between snapshots.
+OBJECTS_DIR = "objects"
+
+
+class BackupError(Exception):
+    pass
+
+
+def database_path(alias="default"):
+    database = settings.DATABASES[alias]
+    if database["ENGINE"] != "django.db.backends.sqlite3":
+        raise BackupError(f"Database {alias!r} is not SQLite")
+    return str(database["NAME"])
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_BLOCK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_database(source_path, target_path, pages=BACKUP_PAGES, pause=BACKUP_PAUSE):
+    """
+    Copy a SQLite database with the online backup API.
+
+    ``pages`` pages are copied per step with a ``pause`` between steps, so
+    the copy never saturates the disk. In WAL mode the copy runs inside one
+    read transaction: writers carry on appending to the WAL and the copy is
+    the database as of its start. Otherwise SQLite restarts the copy
+    whenever another connection writes, which on a busy site may not finish.
+    """
+    source = sqlite3.connect(source_path, isolation_level=None)
+    target = sqlite3.connect(target_path)
+    try:
+        (journal_mode,) = source.execute("PRAGMA journal_mode").fetchone()
+        if journal_mode == "wal":
+            source.execute("BEGIN")
+            source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        source.backup(target, pages=pages, progress=lambda status, remaining, total: time.sleep(pause))
+        if source.in_transaction:
+            source.execute("ROLLBACK")
+        (result,) = target.execute("PRAGMA integrity_check").fetchone()
+    finally:
+        target.close()
+        source.close()
+    if result != "ok":
+        raise BackupError(f"Integrity check of {target_path} failed: {result}")
+
+
+def object_path(root, digest):
+    return root / OBJECTS_DIR / digest[:2] / digest
+
+
+def snapshot_media(root, previous):
+    """
+    Add the files under MEDIA_ROOT to the object store and return ``(manifest, copied)``.
+
+    Files whose size and mtime match ``previous`` (the last snapshot's
+    media manifest) are not read again, and content already in the store
+    is not copied again.
+    """
+    media_root = Path(settings.MEDIA_ROOT)
+    manifest, copied = {}, 0
+    for dirpath, _, filenames in os.walk(media_root):
+        for filename in filenames:
+            path = Path(dirpath, filename)
+            name = path.relative_to(media_root).as_posix()
+            stat = path.stat()
+            entry = previous.get(name)
+            if entry is None or (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                entry = {"sha256": sha256(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            stored = object_path(root, entry["sha256"])
+            if not stored.exists():
+                stored.parent.mkdir(parents=True, exist_ok=True)
+                partial = stored.with_suffix(".partial")
+                shutil.copyfile(path, partial)
+                os.replace(partial, stored)
+                copied += 1
+            manifest[name] = entry
+    return manifest, copied
+
+
+def snapshots(root=None):
+    """Completed snapshot directories, oldest first"""
+    root = Path(root or settings.BACKUP_ROOT)
+    if not root.is_dir():
+        return []
+    return sorted(path for path in root.iterdir() if (path / MANIFEST_FILE).is_file())
+
+
+def load_manifest(snapshot):
+    with open(Path(snapshot) / MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def create_snapshot(root=None, pages=BACKUP_PAGES, pause=BACKUP_PAUSE, media=True):
+    """
+    Write a new snapshot under ``root`` (BACKUP_ROOT by default) and return its manifest.
+
+    The manifest is written last, so an interrupted snapshot is ignored by
+    later snapshots and by restore.
+    """
+    root = Path(root or settings.BACKUP_ROOT)
+    created_at = timezone.now()
+    # Microseconds, so a second run within the same second gets its own
+    # directory; names still sort in creation order.
+    snapshot = root / created_at.strftime("%Y%m%dT%H%M%S.%f")
+    snapshot.mkdir(parents=True)
+
+    database = snapshot / DATABASE_FILE
+    copy_database(database_path(), database, pages, pause)
+
+    previous = snapshots(root)
+    media_manifest, copied = {}, 0
+    if media:
+        media_manifest, copied = snapshot_media(root, load_manifest(previous[-1])["media"] if previous else {})
+
+    manifest = {
+        "created_at": created_at.isoformat(),
+        "database": {"sha256": sha256(database), "size": database.stat().st_size},
+        "media": media_manifest,
+        "media_copied": copied,
+    }
+    partial = snapshot / (MANIFEST_FILE + ".partial")
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(partial, snapshot / MANIFEST_FILE)
+    return snapshot, manifest
+
+
+def verify_snapshot(snapshot):
+    """Problems found in ``snapshot`` as a list of messages; empty when it can be restored"""
+    snapshot = Path(snapshot)
+    manifest = load_manifest(snapshot)
+    problems = []
+
+    database = snapshot / DATABASE_FILE
+    if not database.is_file() or sha256(database) != manifest["database"]["sha256"]:
+        problems.append(f"{DATABASE_FILE} is missing or does not match the manifest")
+    else:
+        connection = sqlite3.connect(f"{database.as_uri()}?mode=ro", uri=True)
+        try:
+            (result,) = connection.execute("PRAGMA integrity_check").fetchone()
+        finally:
+            connection.close()
+        if result != "ok":
+            problems.append(f"{DATABASE_FILE} failed the integrity check: {result}")
+
+    root = snapshot.parent
+    for digest in {entry["sha256"] for entry in manifest["media"].values()}:
+        stored = object_path(root, digest)
+        if not stored.is_file() or sha256(stored) != digest:
+            problems.append(f"media object {digest} is missing or corrupt")
+    return problems
+
+
+def restore_snapshot(snapshot, pages=BACKUP_PAGES):
+    """
+    Restore the database and MEDIA_ROOT from a verified snapshot.
+
+    Media files that are not in the snapshot are left in place. Raises
+    BackupError without touching anything if the snapshot fails
+    verification.
+    """
+    snapshot = Path(snapshot)
+    problems = verify_snapshot(snapshot)
+    if problems:
+        raise BackupError("; ".join(problems))
+    manifest = load_manifest(snapshot)
+
+    connections["default"].close()
+    copy_database(snapshot / DATABASE_FILE, database_path(), pages, pause=0)
+
+    media_root, restored = Path(settings.MEDIA_ROOT), 0
+    for name, entry in manifest["media"].items():
+        path = media_root / name
+        if path.is_file() and path.stat().st_size == entry["size"] and sha256(path) == entry["sha256"]:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(object_path(snapshot.parent, entry["sha256"]), path)
+        # Keep the recorded mtime so the next snapshot does not hash the file again.
+        os.utime(path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        restored += 1
+    return restored
@@ -0,0 +1,147 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+
+from EveShieldApp import minhash, models
+
+# Estimated Jaccard similarity above which a candidate is shown to reviewers.
+DUPLICATE_THRESHOLD = 0.5
+DUPLICATE_LIMIT = 5
+
+
+def sign_report(report):
+    """Refresh ``report.minhash``; returns True when the signature changed"""
+    packed = minhash.signature(report.details)
+    current = bytes(report.minhash) if report.minhash is not None else None
+    report.minhash = packed
+    return packed != current
+
+
+def band_rows(report_id, packed):
+    if packed is None:
+        return []
+    return [
+        models.ReportBand(report_id=report_id, band=band, bucket=bucket)
+        for band, bucket in enumerate(minhash.band_buckets(packed))
+    ]
+
+
+@transaction.atomic
+def index_reports(signatures):
+    """Replace the LSH bands of the reports in ``signatures`` (id -> packed signature)"""
+    models.ReportBand.objects.filter(report_id__in=list(signatures)).delete()
+    models.ReportBand.objects.bulk_create(
+        [row for report_id, packed in signatures.items() for row in band_rows(report_id, packed)],
+        batch_size=1000,
+    )
+
+
+def candidate_ids(report):
+    """Reports sharing at least one band bucket with ``report``, via the (band, bucket) index"""
+    if report.minhash is None:
+        return []
+    condition = reduce(
+        or_,
+        (Q(band=band, bucket=bucket) for band, bucket in enumerate(minhash.band_buckets(report.minhash))),
+    )
+    return list(
+        models.ReportBand.objects.filter(condition)
+        .exclude(report_id=report.id)
+        .values_list("report_id", flat=True)
+        .distinct()
+    )
+
+
+def possible_duplicates(report, threshold=DUPLICATE_THRESHOLD, limit=DUPLICATE_LIMIT):
+    """Most similar other reports as ``(report, similarity)``, best first"""
+    matches = []
+    for candidate in models.GBVReport.objects.filter(id__in=candidate_ids(report)).only(
+        "id", "type_of_violence", "location", "status", "created_at", "minhash"
+    ):
+        score = minhash.similarity(report.minhash, candidate.minhash)
+        if score >= threshold:
+            matches.append((candidate, score))
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches[:limit]
+
+
+def band_matches(band, groups, buckets, signatures, threshold):
+    """
+    Pairs of reports sharing a bucket of ``band`` whose similarity reaches
+    ``threshold``.
+
+    ``groups`` holds the report ids of each bucket of the band, and
+    ``buckets`` each report's bucket per band. A pair that also shares an
+    earlier band is left to that band, so every pair is compared once
+    however the bands are split between processes.
+    """
+    matches = []
+    for report_ids in groups:
+        for index, first in enumerate(report_ids):
+            for second in report_ids[index + 1 :]:
+                if any(buckets[first][earlier] == buckets[second][earlier] for earlier in range(band)):
+                    continue
+                if minhash.similarity(signatures[first], signatures[second]) >= threshold:
+                    matches.append((first, second))
+    return matches
+
+
+def clusters(threshold=DUPLICATE_THRESHOLD, workers=1):
+    """
+    Groups of likely-duplicate report ids, largest first.
+
+    Only pairs that share an LSH bucket are compared, one band per task
+    across ``workers`` processes, and pairs above ``threshold`` are merged
+    with union-find, so a chain of near matches ends up in one group.
+    """
+    signatures = {
+        report_id: bytes(packed)
+        for report_id, packed in models.GBVReport.objects.filter(minhash__isnull=False).values_list("id", "minhash")
+    }
+    bands = defaultdict(lambda: defaultdict(list))
+    buckets = defaultdict(dict)
+    for report_id, band, bucket in models.ReportBand.objects.values_list("report_id", "band", "bucket").iterator():
+        bands[band][bucket].append(report_id)
+        buckets[report_id][band] = bucket
+
+    tasks = []
+    for band, band_buckets in bands.items():
+        groups = [report_ids for report_ids in band_buckets.values() if len(report_ids) > 1]
+        involved = {report_id for report_ids in groups for report_id in report_ids}
+        tasks.append(
+            (
+                band,
+                groups,
+                {report_id: buckets[report_id] for report_id in involved},
+                {report_id: signatures[report_id] for report_id in involved},
+                threshold,
+            )
+        )
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            found = list(pool.map(band_matches, *zip(*tasks))) if tasks else []
+    else:
+        found = [band_matches(*task) for task in tasks]
+
+    parent = {}
+
+    def find(report_id):
+        root = parent.setdefault(report_id, report_id)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    for matches in found:
+        for first, second in matches:
+            parent[find(second)] = find(first)
+
+    groups = defaultdict(list)
+    for report_id in parent:
+        groups[find(report_id)].append(report_id)
+    return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=len, reverse=True)
@@ -0,0 +1,157 @@
+import asyncio
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+# Types browsers may show in the tab; anything else (HTML and SVG above all,
+# which would run on this origin) is downloaded instead.
+INLINE_TYPES = ("image/jpeg", "image/png", "image/gif", "image/webp", "application/pdf", "text/plain")
+INLINE_PREFIXES = ("video/", "audio/")
+
+# Read size when Django streams a file itself; bigger than FileResponse's
+# default since evidence is often video.
+BLOCK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def byte_range(header, size):
+    """
+    The ``(start, stop)`` offsets a Range header asks for, or None to send
+    the whole file: without a header, and for several ranges or a syntax
+    RFC 9110 says to ignore. ``start >= stop`` means it cannot be satisfied.
+    """
+    match = RANGE_RE.fullmatch(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if not last:
+            return start, size
+        if int(last) < start:
+            return None
+        return start, min(int(last) + 1, size)
+    if last:
+        # A suffix range: the last N bytes.
+        return max(size - int(last), 0), size if int(last) else 0
+    return None
+
+
+class FileRange:
+    """Reads at most ``length`` bytes of ``file`` from its current position"""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def handoff(name):
+    """An empty response telling the front server to send the file itself"""
+    response = HttpResponse()
+    if settings.EVIDENCE_SENDFILE == "X-Accel-Redirect":
+        response["X-Accel-Redirect"] = settings.EVIDENCE_ACCEL_PREFIX + quote(name)
+    else:
+        response[settings.EVIDENCE_SENDFILE] = default_storage.path(name)
+    return response
+
+
+async def read_async(filelike):
+    """``filelike`` in BLOCK_SIZE chunks, each read in a worker thread so the event loop never waits on disk"""
+    try:
+        while chunk := await asyncio.to_thread(filelike.read, BLOCK_SIZE):
+            yield chunk
+    finally:
+        filelike.close()
+
+
+def stream(request, path, size, modified):
+    """Send the file from Django, honouring a single-range Range header"""
+    requested = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if requested and if_range and parse_http_date_safe(if_range) != int(modified):
+        # The copy the client holds part of has changed (or it validates with
+        # an ETag, which these responses never carry): send all of it.
+        requested = None
+    span = byte_range(requested, size)
+
+    if span is None:
+        start, stop, status = 0, size, 200
+    else:
+        start, stop = span
+        if start >= stop:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        status = 206
+
+    file = open(path, "rb")
+    if isinstance(request, ASGIRequest):
+        # Django would read a synchronous iterator into memory in full
+        # before sending it under ASGI.
+        file.seek(start)
+        response = FileResponse(read_async(FileRange(file, stop - start)), status=status)
+    elif span is None:
+        # A real file object, so WSGI servers with wsgi.file_wrapper send it
+        # with sendfile() and the bytes never pass through Python.
+        return FileResponse(file)
+    else:
+        file.seek(start)
+        response = FileResponse(FileRange(file, stop - start), status=status)
+    response["Content-Length"] = str(stop - start)
+    if status == 206:
+        response["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    return response
+
+
+def serve(request, name):
+    """
+    Send the evidence file ``name`` (a default_storage name); permission is
+    the caller's to check.
+
+    With EVIDENCE_SENDFILE set, the transfer, byte ranges included, is
+    handed to the front server. Otherwise Django sends the file itself with
+    Range support, in BLOCK_SIZE reads, so a video can be seeked without
+    it being read into memory; under ASGI the reads are asynchronous, as
+    Django would buffer a synchronous file whole.
+    """
+    path = default_storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("The evidence file is missing")
+
+    if settings.EVIDENCE_SENDFILE:
+        response = handoff(name)
+    else:
+        response = stream(request, path, stat.st_size, stat.st_mtime)
+        response.block_size = BLOCK_SIZE
+
+    if response.status_code != 416:
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        inline = content_type in INLINE_TYPES or content_type.startswith(INLINE_PREFIXES)
+        response["Content-Type"] = content_type
+        response["Content-Disposition"] = content_disposition_header(not inline, os.path.basename(name))
+        response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Accept-Ranges"] = "bytes"
+    # Evidence stays out of shared and browser caches.
+    patch_cache_control(response, private=True, no_store=True)
+    return response
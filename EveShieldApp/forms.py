@@ -2,7 +2,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
-from EveShieldApp import models
+from EveShieldApp import accounts, models
 
 
 class UserRegistrationForm(UserCreationForm):
@@ -12,23 +12,30 @@ class UserRegistrationForm(UserCreationForm):
     first_name = forms.CharField(max_length=30, required=False)
     last_name = forms.CharField(max_length=30, required=False)
     phone = forms.CharField(max_length=20, required=False)
-    county = forms.CharField(max_length=100, required=False)
+    county = forms.ModelChoiceField(queryset=models.County.objects.all(), required=False)
 
     class Meta:
         model = User
         fields = ("username", "email", "first_name", "last_name", "password1", "password2")
 
+    def clean_email(self):
+        email = self.cleaned_data["email"]
+        # Addresses compare case-insensitively, as mail servers treat them,
+        # the same check import_users makes.
+        if User.objects.filter(email__iexact=email).exists():
+            raise forms.ValidationError("An account with this email address already exists.")
+        return email
+
     def save(self, commit=True):
         user = super().save(commit=False)
         user.email = self.cleaned_data["email"]
         user.first_name = self.cleaned_data["first_name"]
         user.last_name = self.cleaned_data["last_name"]
         if commit:
-            user.save()
-            models.UserProfile.objects.create(
-                user=user,
+            accounts.register_user(
+                user,
                 phone=self.cleaned_data.get("phone", ""),
-                county=self.cleaned_data.get("county", ""),
+                county=self.cleaned_data.get("county"),
             )
         return user
 
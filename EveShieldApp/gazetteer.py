@@ -0,0 +1,146 @@
+import re
+
+# The 47 counties as (code, name, latitude, longitude). Coordinates are the
+# county headquarters, which is where most providers are located.
+COUNTIES = [
+    (1, "Mombasa", -4.0435, 39.6682),
+    (2, "Kwale", -4.1737, 39.4521),
+    (3, "Kilifi", -3.5107, 39.9093),
+    (4, "Tana River", -1.4833, 40.0333),
+    (5, "Lamu", -2.2717, 40.9020),
+    (6, "Taita-Taveta", -3.3961, 38.5561),
+    (7, "Garissa", -0.4536, 39.6401),
+    (8, "Wajir", 1.7471, 40.0573),
+    (9, "Mandera", 3.9366, 41.8670),
+    (10, "Marsabit", 2.3346, 37.9899),
+    (11, "Isiolo", 0.3546, 37.5822),
+    (12, "Meru", 0.0463, 37.6559),
+    (13, "Tharaka-Nithi", -0.3333, 37.6500),
+    (14, "Embu", -0.5310, 37.4506),
+    (15, "Kitui", -1.3671, 38.0106),
+    (16, "Machakos", -1.5177, 37.2634),
+    (17, "Makueni", -1.7800, 37.6300),
+    (18, "Nyandarua", -0.2700, 36.3800),
+    (19, "Nyeri", -0.4201, 36.9476),
+    (20, "Kirinyaga", -0.4989, 37.2803),
+    (21, "Murang'a", -0.7210, 37.1526),
+    (22, "Kiambu", -1.1714, 36.8356),
+    (23, "Turkana", 3.1191, 35.5973),
+    (24, "West Pokot", 1.2389, 35.1119),
+    (25, "Samburu", 1.0968, 36.6980),
+    (26, "Trans Nzoia", 1.0157, 35.0062),
+    (27, "Uasin Gishu", 0.5143, 35.2698),
+    (28, "Elgeyo-Marakwet", 0.6703, 35.5081),
+    (29, "Nandi", 0.2036, 35.1025),
+    (30, "Baringo", 0.4919, 35.7430),
+    (31, "Laikipia", 0.2725, 36.5383),
+    (32, "Nakuru", -0.3031, 36.0800),
+    (33, "Narok", -1.0783, 35.8601),
+    (34, "Kajiado", -1.8524, 36.7768),
+    (35, "Kericho", -0.3677, 35.2831),
+    (36, "Bomet", -0.7813, 35.3416),
+    (37, "Kakamega", 0.2827, 34.7519),
+    (38, "Vihiga", 0.0760, 34.7229),
+    (39, "Bungoma", 0.5635, 34.5606),
+    (40, "Busia", 0.4608, 34.1115),
+    (41, "Siaya", 0.0607, 34.2881),
+    (42, "Kisumu", -0.0917, 34.7680),
+    (43, "Homa Bay", -0.5273, 34.4571),
+    (44, "Migori", -1.0634, 34.4731),
+    (45, "Kisii", -0.6817, 34.7667),
+    (46, "Nyamira", -0.5633, 34.9358),
+    (47, "Nairobi", -1.2921, 36.8219),
+]
+
+# Towns people commonly give instead of a county: name -> (county, lat, lon).
+TOWNS = {
+    "Thika": ("Kiambu", -1.0333, 37.0693),
+    "Ruiru": ("Kiambu", -1.1466, 36.9609),
+    "Kikuyu": ("Kiambu", -1.2463, 36.6629),
+    "Limuru": ("Kiambu", -1.1136, 36.6424),
+    "Eldoret": ("Uasin Gishu", 0.5143, 35.2698),
+    "Kitale": ("Trans Nzoia", 1.0157, 35.0062),
+    "Malindi": ("Kilifi", -3.2192, 40.1169),
+    "Watamu": ("Kilifi", -3.3540, 40.0240),
+    "Mtwapa": ("Kilifi", -3.9420, 39.7460),
+    "Naivasha": ("Nakuru", -0.7167, 36.4333),
+    "Nanyuki": ("Laikipia", 0.0062, 37.0722),
+    "Nyahururu": ("Laikipia", 0.0380, 36.3636),
+    "Voi": ("Taita-Taveta", -3.3961, 38.5561),
+    "Lodwar": ("Turkana", 3.1191, 35.5973),
+    "Kakuma": ("Turkana", 3.7167, 34.8667),
+    "Maralal": ("Samburu", 1.0968, 36.6980),
+    "Kapenguria": ("West Pokot", 1.2389, 35.1119),
+    "Iten": ("Elgeyo-Marakwet", 0.6703, 35.5081),
+    "Kapsabet": ("Nandi", 0.2036, 35.1025),
+    "Kabarnet": ("Baringo", 0.4919, 35.7430),
+    "Kerugoya": ("Kirinyaga", -0.4989, 37.2803),
+    "Chuka": ("Tharaka-Nithi", -0.3333, 37.6500),
+    "Ol Kalou": ("Nyandarua", -0.2700, 36.3800),
+    "Wote": ("Makueni", -1.7800, 37.6300),
+    "Hola": ("Tana River", -1.4833, 40.0333),
+    "Ukunda": ("Kwale", -4.2875, 39.5661),
+    "Diani": ("Kwale", -4.3167, 39.5667),
+    "Athi River": ("Machakos", -1.4561, 36.9781),
+    "Kitengela": ("Kajiado", -1.4760, 36.9620),
+    "Ngong": ("Kajiado", -1.3527, 36.6699),
+    "Webuye": ("Bungoma", 0.6070, 34.7700),
+    "Malaba": ("Busia", 0.6350, 34.2820),
+    "Bondo": ("Siaya", -0.0980, 34.2710),
+}
+
+# Alternative spellings seen in free-text fields.
+COUNTY_ALIASES = {
+    "Nairobi City": "Nairobi",
+    "Taita Taveta": "Taita-Taveta",
+    "Taita": "Taita-Taveta",
+    "Tharaka Nithi": "Tharaka-Nithi",
+    "Tharaka": "Tharaka-Nithi",
+    "Elgeyo Marakwet": "Elgeyo-Marakwet",
+    "Keiyo Marakwet": "Elgeyo-Marakwet",
+    "Muranga": "Murang'a",
+    "Homabay": "Homa Bay",
+    "Transnzoia": "Trans Nzoia",
+    "Uasingishu": "Uasin Gishu",
+}
+
+COUNTY_BY_NAME = {name: (code, lat, lon) for code, name, lat, lon in COUNTIES}
+
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace for matching"""
+    text = re.sub(r"[-'’`]", " ", (text or "").lower())
+    text = re.sub(r"[^a-z ]+", " ", text)
+    return " ".join(text.split())
+
+
+def _build_lookup():
+    entries = {}
+    for _code, name, lat, lon in COUNTIES:
+        entries[normalize(name)] = (name, lat, lon)
+    for alias, name in COUNTY_ALIASES.items():
+        _code, lat, lon = COUNTY_BY_NAME[name]
+        entries[normalize(alias)] = (name, lat, lon)
+    for town, (county, lat, lon) in TOWNS.items():
+        entries[normalize(town)] = (county, lat, lon)
+    # Try longer names first so "homa bay" wins over a shorter partial match.
+    keys = sorted(entries, key=len, reverse=True)
+    pattern = re.compile(r"\b(" + "|".join(re.escape(key) for key in keys) + r")\b")
+    return entries, pattern
+
+
+_ENTRIES, _PATTERN = _build_lookup()
+
+
+def locate(*texts):
+    """
+    Resolve free text (county, town or address) to ``(county, lat, lon)``.
+
+    Each text is tried in order, so pass the most specific one first.
+    Returns None when nothing in the gazetteer matches.
+    """
+    for text in texts:
+        match = _PATTERN.search(normalize(text))
+        if match:
+            return _ENTRIES[match.group(1)]
+    return None
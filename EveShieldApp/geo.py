@@ -0,0 +1,142 @@
+import math
+
+from django.db.models import Q
+
+from EveShieldApp import gazetteer
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def encode_geohash(lat, lon, precision=GEOHASH_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size_degrees(precision):
+    """(lat, lon) size in degrees of a geohash cell at ``precision``"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def precision_for_radius(lat, radius_km):
+    """Finest precision whose cells are still at least ``radius_km`` across"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lon_size = cell_size_degrees(precision)
+        smallest_km = min(
+            lat_size * KM_PER_DEGREE,
+            lon_size * KM_PER_DEGREE * math.cos(math.radians(lat)),
+        )
+        if smallest_km >= radius_km:
+            return precision
+    return 0
+
+
+def covering_cells(lat, lon, radius_km):
+    """
+    Geohash prefixes whose cells cover every point within ``radius_km``.
+
+    That is the cell containing the point plus its eight neighbours at a
+    precision where a cell is at least the radius wide. Returns an empty
+    list when the radius is too large for any prefix to help.
+    """
+    precision = precision_for_radius(lat, radius_km)
+    if precision == 0:
+        return []
+    lat_size, lon_size = cell_size_degrees(precision)
+    cells = set()
+    for dlat in (-lat_size, 0.0, lat_size):
+        for dlon in (-lon_size, 0.0, lon_size):
+            neighbour_lat = max(min(lat + dlat, 89.999999), -89.999999)
+            neighbour_lon = (lon + dlon + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(neighbour_lat, neighbour_lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def location(instance):
+    """What geocode() works from, as compared between loading and saving"""
+    return tuple(instance.__dict__.get(name) for name in ("county_id", "address", "latitude", "longitude"))
+
+
+def geocode(instance):
+    """
+    Fill in coordinates from the gazetteer when missing, and refresh the geohash.
+
+    Coordinates are looked up again when the county or address changed
+    since the instance was loaded (``_loaded_location``), unless they were
+    edited in the same change.
+    """
+    loaded = getattr(instance, "_loaded_location", None)
+    if loaded is not None:
+        county_id, address, latitude, longitude = loaded
+        moved = (instance.county_id, instance.address) != (county_id, address)
+        if moved and (instance.latitude, instance.longitude) == (latitude, longitude):
+            instance.latitude = instance.longitude = None
+    if instance.latitude is None or instance.longitude is None:
+        # A town in the address is more precise than the county headquarters.
+        place = gazetteer.locate(instance.address)
+        if place is not None:
+            _county, instance.latitude, instance.longitude = place
+        elif instance.county is not None:
+            instance.latitude, instance.longitude = instance.county.latitude, instance.county.longitude
+    if instance.latitude is not None and instance.longitude is not None:
+        instance.geohash = encode_geohash(instance.latitude, instance.longitude)
+    else:
+        instance.geohash = ""
+    instance._loaded_location = location(instance)
+
+
+def within_cells(queryset, lat, lon, radius_km):
+    """Narrow ``queryset`` to rows in the covering cells using index range scans"""
+    cells = covering_cells(lat, lon, radius_km)
+    queryset = queryset.exclude(geohash="")
+    if not cells:
+        return queryset
+
+    condition = Q()
+    for cell in cells:
+        # A range instead of startswith so the B-tree index is used on every backend.
+        condition |= Q(geohash__gte=cell, geohash__lt=cell + "~")
+    return queryset.filter(condition)
+
+
+async def anearest(queryset, lat, lon, radius_km, limit, fields=()):
+    """Nearest ``limit`` rows within ``radius_km``, closest first, each with distance_km"""
+    candidates = within_cells(queryset, lat, lon, radius_km).values(*fields, "latitude", "longitude")
+    matches = []
+    async for row in candidates.aiterator():
+        distance = haversine_km(lat, lon, row["latitude"], row["longitude"])
+        if distance <= radius_km:
+            row["distance_km"] = round(distance, 1)
+            matches.append(row)
+    matches.sort(key=lambda row: row["distance_km"])
+    return matches[:limit]
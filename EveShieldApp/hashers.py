@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """Django's scrypt hasher with the cost taken from PASSWORD_SCRYPT_* settings"""
+
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
+    block_size = settings.PASSWORD_SCRYPT_BLOCK_SIZE
+    parallelism = settings.PASSWORD_SCRYPT_PARALLELISM
+    # OpenSSL refuses to use more than 32 MiB by default; scrypt needs 128 * n * r bytes.
+    maxmem = 2 * 128 * work_factor * block_size
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Django's Argon2id hasher (needs argon2-cffi) with the cost taken from PASSWORD_ARGON2_* settings"""
+
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST
+    parallelism = settings.PASSWORD_ARGON2_PARALLELISM
+
+
+# scrypt, Argon2 and PBKDF2 all release the GIL, so these threads hash in parallel
+# without blocking the event loop or the single thread ASGI runs sync views in.
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHING_THREADS, thread_name_prefix="password-hash")
+
+
+def make_passwords(raw_passwords):
+    """Hash many passwords on the hashing pool, in order; None gives an unusable password"""
+    return list(_executor.map(hashers.make_password, raw_passwords))
+
+
+async def run_hasher(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+async def acheck_password(user, raw_password):
+    """
+    Async ``user.check_password`` that hashes on the hashing pool.
+
+    When the stored hash uses an older algorithm or cost, it is replaced
+    with one from the preferred hasher, as Django does on a sync login.
+    """
+    is_correct, must_update = await run_hasher(hashers.verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = await run_hasher(hashers.make_password, raw_password)
+        await user.asave(update_fields=["password"])
+    return is_correct
@@ -0,0 +1,45 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    """
+    A function view referred to by dotted path and imported on first dispatch.
+
+    Reversing URLs never imports the view: only ``__module__``,
+    ``__name__`` and ``__qualname__`` are read then, and those come from
+    the path. Anything else Django asks of the view while dispatching,
+    such as ``csrf_exempt`` or whether it is a coroutine function, imports
+    it and is answered by the real view. Class-based views are not
+    supported.
+    """
+
+    def __init__(self, dotted_path):
+        self.dotted_path = dotted_path
+        self.__module__, self.__name__ = dotted_path.rsplit(".", 1)
+        self.__qualname__ = self.__name__
+        self.view = None
+
+    def load(self):
+        if self.view is None:
+            view = import_string(self.dotted_path)
+            if iscoroutinefunction(view):
+                markcoroutinefunction(self)
+            self.view = view
+        return self.view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.load()(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Only reached for attributes the proxy does not have itself.
+        if name.startswith("__") or name in ("view_class", "view_initkwargs"):
+            raise AttributeError(name)
+        view = self.load()
+        if name in self.__dict__:
+            # The coroutine marker set on the proxy by load().
+            return self.__dict__[name]
+        return getattr(view, name)
+
+    def __repr__(self):
+        return f"<LazyView {self.dotted_path}>"
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.template.loader import render_to_string
+
+from EveShieldApp import models
+
+# Dashboard counters that follow a report status, besides the total.
+COUNTED_STATUSES = (models.ReportStatus.PENDING, models.ReportStatus.REVIEWED)
+# Saves do not always commit in updated_at order, so polls look back this far.
+POLL_OVERLAP = timedelta(seconds=2)
+# Most rows one poll sends; anything older is left to a page reload.
+POLL_LIMIT = 100
+# How long EventSource waits before reconnecting, in milliseconds.
+RETRY_MS = 5000
+
+
+class Hub:
+    """
+    Fan-out of dashboard events to the live feeds open in this process.
+
+    Feeds subscribe from their event loop; ``publish`` may be called from
+    any thread. A feed more than LIVE_QUEUE_SIZE events behind drops the
+    rest and catches up on its next poll, which is also how feeds see saves
+    made by other worker processes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def subscribe(self):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(settings.LIVE_QUEUE_SIZE))
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            loop, queue = subscriber
+            try:
+                loop.call_soon_threadsafe(offer, queue, event)
+            except RuntimeError:
+                # The feed's event loop has closed.
+                self.unsubscribe(subscriber)
+
+
+def offer(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass
+
+
+hub = Hub()
+
+
+def report_event(report, created):
+    if not hasattr(report, "details_excerpt"):
+        report.details_excerpt = report.details[: models.REPORT_EXCERPT_LENGTH]
+    return (
+        "report",
+        {
+            "id": report.id,
+            "created": created,
+            "updated_at": report.updated_at.isoformat(),
+            "html": render_to_string("tracking/report_row.html", {"report": report}),
+        },
+    )
+
+
+def publish_report(report, created):
+    """
+    Send a saved report, and what it changes on the dashboard counters,
+    to the feeds open in this process once the save commits.
+
+    The counter deltas compare the status with the one the report was
+    loaded with (``GBVReport._loaded_status``).
+    """
+    if not hub.subscribers:
+        return
+
+    previous = None if created else getattr(report, "_loaded_status", report.status)
+    delta = {"total": 1} if created else {}
+    if previous != report.status:
+        if previous in COUNTED_STATUSES:
+            delta[previous] = -1
+        if report.status in COUNTED_STATUSES:
+            delta[report.status] = 1
+
+    events = [report_event(report, created)]
+    if delta:
+        events.append(("delta", delta))
+
+    def send():
+        for event in events:
+            hub.publish(event)
+
+    transaction.on_commit(send)
+
+
+async def counts():
+    return await models.GBVReport.objects.aaggregate(
+        total=Count("id"),
+        pending=Count("id", filter=Q(status=models.ReportStatus.PENDING)),
+        reviewed=Count("id", filter=Q(status=models.ReportStatus.REVIEWED)),
+    )
+
+
+def message(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def feed(since):
+    """
+    Server-sent events that keep an open dashboard current.
+
+    ``report`` carries a saved report's rendered table row, ``delta``
+    changes to the counters and ``counts`` their values, sent when a poll
+    finds saves this process did not publish. Report events carry the
+    report's updated_at as their id, so a reconnecting EventSource resumes
+    from the last one it saw (pass it as ``since``).
+    """
+    loop = asyncio.get_running_loop()
+    subscriber = hub.subscribe()
+    queue = subscriber[1]
+    # Reports already sent, by id, with the updated_at sent.
+    sent = {}
+    cursor = since
+    next_poll = loop.time()
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            try:
+                name, data = await asyncio.wait_for(queue.get(), max(0, next_poll - loop.time()))
+            except asyncio.TimeoutError:
+                found = 0
+                rows = models.GBVReport.objects.for_list().filter(updated_at__gte=cursor - POLL_OVERLAP)
+                async for report in rows.order_by("updated_at")[:POLL_LIMIT]:
+                    cursor = max(cursor, report.updated_at)
+                    if sent.get(report.id) == report.updated_at:
+                        continue
+                    sent[report.id] = report.updated_at
+                    found += 1
+                    name, data = report_event(report, report.created_at >= since)
+                    yield message(name, data, data["updated_at"])
+                if found:
+                    yield message("counts", await counts())
+                else:
+                    yield ": ping\n\n"
+                sent = {key: value for key, value in sent.items() if value >= cursor - POLL_OVERLAP}
+                next_poll = loop.time() + settings.LIVE_POLL_INTERVAL
+            else:
+                if name == "report":
+                    updated_at = datetime.fromisoformat(data["updated_at"])
+                    if sent.get(data["id"]) == updated_at:
+                        continue
+                    sent[data["id"]] = updated_at
+                    yield message(name, data, data["updated_at"])
+                else:
+                    yield message(name, data)
+    finally:
+        hub.unsubscribe(subscriber)
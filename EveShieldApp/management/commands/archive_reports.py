@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from EveShieldApp import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move reports resolved more than REPORT_ARCHIVE_AFTER_DAYS ago into the archive table. "
+        "Each batch commits on its own, so an interrupted run can simply be restarted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override REPORT_ARCHIVE_AFTER_DAYS")
+        parser.add_argument("--batch-size", type=int, default=archive.ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the reports that would move")
+
+    def handle(self, *args, **options):
+        cutoff = archive.archive_cutoff(options["days"])
+        if options["dry_run"]:
+            count = archive.archivable(cutoff).count()
+            self.stdout.write(self.style.SUCCESS(f"{count} reports resolved before {cutoff:%Y-%m-%d} would be archived"))
+            return
+
+        total = 0
+        while moved := archive.archive_batch(cutoff, options["batch_size"]):
+            total += moved
+            self.stdout.write(f"Archived {total} reports")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} reports resolved before {cutoff:%Y-%m-%d}"))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from EveShieldApp import backup
+
+
+class Command(BaseCommand):
+    help = (
+        "Snapshot the SQLite database with the online backup API and MEDIA_ROOT incrementally, "
+        "while the site keeps serving traffic"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dest", help="Backup directory (default: BACKUP_ROOT)")
+        parser.add_argument("--pages", type=int, default=backup.BACKUP_PAGES, help="Database pages copied per step")
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=backup.BACKUP_PAUSE,
+            help="Seconds the database is left unlocked between steps",
+        )
+        parser.add_argument("--skip-media", action="store_true", help="Only back up the database")
+
+    def handle(self, *args, **options):
+        try:
+            snapshot, manifest = backup.create_snapshot(
+                options["dest"], options["pages"], options["pause"], media=not options["skip_media"]
+            )
+        except backup.BackupError as exc:
+            raise CommandError(exc)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {snapshot}: database {filesizeformat(manifest['database']['size'])}, "
+                f"{len(manifest['media'])} media files ({manifest['media_copied']} new)"
+            )
+        )
@@ -0,0 +1,74 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+
+from EveShieldApp.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+def scrypt(work_factor):
+    return type(
+        "Scrypt",
+        (ScryptPasswordHasher,),
+        {"work_factor": work_factor, "maxmem": 2 * 128 * work_factor * settings.PASSWORD_SCRYPT_BLOCK_SIZE},
+    )()
+
+
+def argon2(time_cost, memory_cost):
+    return type("Argon2", (Argon2PasswordHasher,), {"time_cost": time_cost, "memory_cost": memory_cost})()
+
+
+# Label, hasher factory. Argon2 settings are the OWASP-recommended trade-offs.
+CANDIDATES = [
+    ("pbkdf2_sha256 1,000,000 iterations (Django default)", hashers.PBKDF2PasswordHasher),
+    ("scrypt n=2^13", lambda: scrypt(2**13)),
+    ("scrypt n=2^14", lambda: scrypt(2**14)),
+    ("scrypt n=2^15", lambda: scrypt(2**15)),
+    ("argon2id t=1 m=46 MiB", lambda: argon2(1, 47104)),
+    ("argon2id t=2 m=19 MiB", lambda: argon2(2, 19456)),
+    ("argon2id t=3 m=12 MiB", lambda: argon2(3, 12288)),
+]
+
+
+class Command(BaseCommand):
+    help = "Measure password verification latency and login throughput for candidate hasher costs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=settings.PASSWORD_HASHING_THREADS)
+        parser.add_argument("--seconds", type=float, default=2.0, help="Duration of each throughput run")
+
+    def handle(self, *args, **options):
+        threads, seconds = options["threads"], options["seconds"]
+        self.stdout.write(f"{'hasher':<52} {'verify ms':>10} {f'logins/s ({threads} threads)':>24}")
+        for label, factory in CANDIDATES:
+            try:
+                hasher = factory()
+                encoded = hasher.encode("correct horse battery", hasher.salt())
+            except ValueError as exc:
+                # Argon2 without argon2-cffi installed.
+                self.stdout.write(self.style.WARNING(f"{label:<52} skipped: {exc}"))
+                continue
+
+            samples = []
+            for _ in range(5):
+                start = time.perf_counter()
+                hasher.verify("correct horse battery", encoded)
+                samples.append((time.perf_counter() - start) * 1000)
+
+            deadline = time.perf_counter() + seconds
+
+            def worker():
+                count = 0
+                while time.perf_counter() < deadline:
+                    hasher.verify("correct horse battery", encoded)
+                    count += 1
+                return count
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                total = sum(pool.map(lambda _: worker(), range(threads)))
+            rate = total / (time.perf_counter() - start)
+            self.stdout.write(f"{label:<52} {statistics.median(samples):>10.1f} {rate:>24.1f}")
@@ -0,0 +1,167 @@
+import asyncio
+import importlib.util
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# The async public pages; each connection cycles through them.
+DEFAULT_PATHS = ["/lawyers/", "/mental-health/", "/resources/", "/resources/emergency-contacts/"]
+
+# Seconds a server gets to start answering, and a request to be answered.
+STARTUP_TIMEOUT = 30
+REQUEST_TIMEOUT = 30
+
+
+def wsgi_command(host, port, workers, threads):
+    # gunicorn's threaded worker: every request holds a thread until its queries return.
+    return [
+        sys.executable, "-m", "gunicorn", "EveShieldProject.wsgi:application",
+        "--bind", f"{host}:{port}", "--workers", str(workers), "--threads", str(threads),
+        "--backlog", "2048", "--log-level", "warning",
+    ]
+
+
+def asgi_command(host, port, workers, threads):
+    return [
+        sys.executable, "-m", "uvicorn", "EveShieldProject.asgi:application",
+        "--host", host, "--port", str(port), "--workers", str(workers),
+        "--backlog", "2048", "--log-level", "warning",
+    ]
+
+
+# Name: (module the server needs, command line factory).
+SERVERS = {
+    "wsgi": ("gunicorn", wsgi_command),
+    "asgi": ("uvicorn", asgi_command),
+}
+
+
+async def fetch(host, port, path):
+    """Status of one GET over a fresh connection"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        # The server closes the connection after the body.
+        await reader.read()
+    finally:
+        writer.close()
+    return int(status_line.split()[1])
+
+
+async def connection_loop(host, port, paths, offset, deadline, latencies, outcomes):
+    """One simulated visitor: requests the pages back to back until ``deadline``"""
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(fetch(host, port, path), REQUEST_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError) as error:
+            outcomes[type(error).__name__] += 1
+            continue
+        outcomes[status] += 1
+        if status == 200:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def load(host, port, paths, connections, duration):
+    latencies, outcomes = [], Counter()
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(
+        *(connection_loop(host, port, paths, i, deadline, latencies, outcomes) for i in range(connections))
+    )
+    return latencies, outcomes, time.perf_counter() - start
+
+
+async def wait_until_up(host, port, process):
+    deadline = time.perf_counter() + STARTUP_TIMEOUT
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"The server exited with status {process.returncode} before answering")
+        try:
+            await fetch(host, port, "/")
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise CommandError(f"The server did not answer within {STARTUP_TIMEOUT} seconds")
+
+
+def raise_open_file_limit(needed):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        if hard != resource.RLIM_INFINITY and hard < needed:
+            raise CommandError(f"{needed} connections need {needed} open files; the hard limit is {hard}")
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the site with gunicorn (WSGI) and then uvicorn (ASGI), hold the given number of simultaneous "
+        "connections against the async public pages on each and report throughput, latency and errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=1000, help="Simultaneous connections")
+        parser.add_argument("--duration", type=float, default=20, help="Seconds of load per server")
+        parser.add_argument("--workers", type=int, default=4, help="Worker processes per server")
+        parser.add_argument("--threads", type=int, default=8, help="Threads per gunicorn worker")
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help=f"Page to request, may be repeated (default: {', '.join(DEFAULT_PATHS)})",
+        )
+        parser.add_argument("--server", choices=list(SERVERS), action="append", dest="servers")
+
+    def handle(self, *args, **options):
+        servers = options["servers"] or list(SERVERS)
+        missing = [SERVERS[name][0] for name in servers if importlib.util.find_spec(SERVERS[name][0]) is None]
+        if missing:
+            raise CommandError(f"Install the servers to compare: pip install {' '.join(missing)}")
+        raise_open_file_limit(options["connections"] + 256)
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING("DEBUG is on: every query is logged, so both servers run slower"))
+
+        host, port = options["host"], options["port"]
+        paths = options["paths"] or DEFAULT_PATHS
+        self.stdout.write(
+            f"{options['connections']} connections for {options['duration']:g}s, {options['workers']} workers each"
+        )
+        self.stdout.write(f"{'server':<6} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for name in servers:
+            command = SERVERS[name][1](host, port, options["workers"], options["threads"])
+            process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=os.environ.copy())
+            try:
+                asyncio.run(wait_until_up(host, port, process))
+                latencies, outcomes, elapsed = asyncio.run(
+                    load(host, port, paths, options["connections"], options["duration"])
+                )
+            finally:
+                process.terminate()
+                process.wait()
+
+            errors = sum(count for outcome, count in outcomes.items() if outcome != 200)
+            if latencies:
+                p50 = statistics.median(latencies)
+                p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]
+            else:
+                p50 = p99 = float("nan")
+            self.stdout.write(
+                f"{name:<6} {len(latencies):>9} {len(latencies) / elapsed:>8.0f} {p50:>8.1f} {p99:>8.1f} {errors:>7}"
+            )
+            if errors:
+                details = ", ".join(f"{outcome}: {count}" for outcome, count in outcomes.items() if outcome != 200)
+                self.stdout.write(f"       {details}")
@@ -0,0 +1,129 @@
+import html
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.template import engines
+from django.test import RequestFactory
+from django.utils import timezone
+
+from EveShieldApp import models
+
+
+def sample_providers(model, count):
+    """Unsaved directory rows shaped like ``for_directory()`` results, for an empty database"""
+    county = models.County(name="Nairobi")
+    fields = {field.name for field in model._meta.fields}
+    rows = []
+    for i in range(count):
+        values = {
+            "id": i + 1,
+            "name": f"Sample Provider {i + 1}",
+            "phone": "+254700000000",
+            "whatsapp": "254700000000",
+            "email": f"provider{i + 1}@example.com",
+            "specialization": "Gender-based violence & family law",
+            "specialty": "Trauma counselling & family therapy",
+            "county": county,
+        }
+        row = model(**{key: value for key, value in values.items() if key in fields})
+        row.address_line = "Kenyatta Avenue, 3rd floor"
+        rows.append(row)
+    return rows
+
+
+def sample_articles(count):
+    return [
+        models.ResourceArticle(
+            id=i + 1,
+            title=f"Know your rights, part {i + 1}",
+            slug=f"know-your-rights-{i + 1}",
+            category=models.ResourceArticle._meta.get_field("category").choices[0][0],
+            excerpt="What the law says, where to get help and what to expect when you report.",
+            created_at=timezone.now(),
+        )
+        for i in range(count)
+    ]
+
+
+def directory_context(model, per_page):
+    rows = list(model.objects.filter(is_active=True).for_directory()[:per_page]) or sample_providers(model, per_page)
+    return {
+        "page_obj": Paginator(rows, per_page).get_page(1),
+        "counties": list(models.County.objects.values_list("name", flat=True)),
+        "county_filter": "",
+        "search_query": "",
+    }
+
+
+def article_list_context(per_page):
+    rows = list(models.ResourceArticle.objects.filter(is_published=True).for_list()[:per_page]) or sample_articles(
+        per_page
+    )
+    return {
+        "page_obj": Paginator(rows, per_page).get_page(1),
+        "category_filter": "",
+        "search_query": "",
+        "categories": models.ResourceArticle._meta.get_field("category").choices,
+    }
+
+
+# Template name without extension, context factory; the same page sizes as the views.
+PAGES = [
+    ("resources/lawyers/directory", lambda: directory_context(models.Lawyer, 12)),
+    ("resources/mental_health/directory", lambda: directory_context(models.Therapist, 12)),
+    ("resources/articles/list", lambda: article_list_context(10)),
+]
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize(page):
+    """Page text without the whitespace and entity spellings (&#x27; vs &#39;) the engines differ on"""
+    return WHITESPACE_RE.sub(" ", html.unescape(page)).strip()
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the pages that have Jinja2 twins with both engines on the same context, report the "
+        "median render time of each and check that the two render the same HTML"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=300, help="Renders per template")
+
+    def handle(self, *args, **options):
+        if not settings.JINJA2_TEMPLATES:
+            raise CommandError("The Jinja2 engine is not configured: install jinja2 (settings.JINJA2_TEMPLATES)")
+        django_engine, jinja2_engine = engines["django"], engines["jinja2"]
+
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+
+        self.stdout.write(f"{'page':<36} {'django ms':>10} {'jinja2 ms':>10} {'speed-up':>9}")
+        mismatched = []
+        for name, make_context in PAGES:
+            context = make_context()
+            timings, rendered = [], []
+            for engine, template_name in ((django_engine, f"{name}.html"), (jinja2_engine, f"{name}.jinja")):
+                template = engine.get_template(template_name)
+                rendered.append(template.render(context, request))
+                samples = []
+                for _ in range(options["iterations"]):
+                    start = time.perf_counter()
+                    template.render(context, request)
+                    samples.append((time.perf_counter() - start) * 1000)
+                timings.append(statistics.median(samples))
+
+            self.stdout.write(
+                f"{name:<36} {timings[0]:>10.3f} {timings[1]:>10.3f} {timings[0] / timings[1]:>8.1f}x"
+            )
+            if normalize(rendered[0]) != normalize(rendered[1]):
+                mismatched.append(name)
+
+        if mismatched:
+            raise CommandError(f"The twins render different HTML: {', '.join(mismatched)}")
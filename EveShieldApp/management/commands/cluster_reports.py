@@ -0,0 +1,53 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from EveShieldApp import dedup, minhash, models
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute MinHash signatures for reports and compare the reports sharing each LSH band across worker "
+        "processes, then list clusters of likely duplicates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-sign every report instead of only unsigned ones",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--threshold", type=float, default=dedup.DUPLICATE_THRESHOLD)
+
+    def handle(self, *args, **options):
+        reports_qs = models.GBVReport.objects.order_by("id")
+        if not options["all"]:
+            reports_qs = reports_qs.filter(minhash__isnull=True)
+
+        signed, last_id = 0, 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            # Keyset batches: the rows are rewritten between reads.
+            while batch := list(reports_qs.filter(id__gt=last_id).values_list("id", "details")[: options["batch_size"]]):
+                signed += self.sign_batch(pool, batch, options["workers"])
+                last_id = batch[-1][0]
+        self.stdout.write(self.style.SUCCESS(f"Signed {signed} reports"))
+
+        groups = dedup.clusters(options["threshold"], options["workers"])
+        duplicates = sum(len(group) - 1 for group in groups)
+        self.stdout.write(self.style.SUCCESS(f"{len(groups)} clusters covering {duplicates} likely duplicates"))
+        for group in groups:
+            self.stdout.write("  " + ", ".join(f"#{report_id}" for report_id in group))
+
+    def sign_batch(self, pool, batch, workers):
+        report_ids, texts = zip(*batch)
+        chunksize = max(1, len(texts) // (4 * workers))
+        signatures = dict(zip(report_ids, pool.map(minhash.signature, texts, chunksize=chunksize)))
+        models.GBVReport.objects.bulk_update(
+            [models.GBVReport(id=report_id, minhash=packed) for report_id, packed in signatures.items()],
+            ["minhash"],
+        )
+        dedup.index_reports(signatures)
+        return len(signatures)
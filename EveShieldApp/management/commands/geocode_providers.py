@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from EveShieldApp import geo, models
+
+
+class Command(BaseCommand):
+    help = "Geocode lawyers and therapists from the offline county/town gazetteer and rebuild their geohashes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-geocode every row, replacing existing coordinates",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in (models.Lawyer, models.Therapist):
+            providers_qs = model.objects.order_by("id")
+            if not options["all"]:
+                providers_qs = providers_qs.filter(geohash="")
+
+            batch, located, missing = [], 0, []
+            for provider in providers_qs.iterator(chunk_size=options["batch_size"]):
+                if options["all"]:
+                    provider.latitude = provider.longitude = None
+                geo.geocode(provider)
+                if provider.geohash:
+                    located += 1
+                    batch.append(provider)
+                else:
+                    missing.append(str(provider))
+                if len(batch) >= options["batch_size"]:
+                    model.objects.bulk_update(batch, ["latitude", "longitude", "geohash"])
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, ["latitude", "longitude", "geohash"])
+
+            name = model._meta.verbose_name_plural
+            self.stdout.write(self.style.SUCCESS(f"{name}: geocoded {located}"))
+            for entry in missing:
+                self.stdout.write(self.style.WARNING(f"  no gazetteer match: {entry}"))
@@ -0,0 +1,127 @@
+import csv
+
+from django.contrib.auth.models import User
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
+from django.utils.crypto import get_random_string
+
+from EveShieldApp import accounts, gazetteer, hashers, models
+
+REQUIRED_COLUMNS = {"username", "email"}
+GENERATED_PASSWORD_LENGTH = 16
+
+
+class Command(BaseCommand):
+    help = (
+        "Create accounts in bulk for a partner organisation from a CSV with the columns "
+        "username, email and optionally first_name, last_name, phone, county, password"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--staff", action="store_true", help="Give the imported accounts staff access")
+        parser.add_argument(
+            "--credentials",
+            metavar="PATH",
+            help="Generate passwords for rows without one and write them to this CSV; "
+            "without it those accounts get an unusable password",
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Import the valid rows even if some rows are invalid",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+
+    def handle(self, *args, **options):
+        with open(options["csv_path"], newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            missing = REQUIRED_COLUMNS - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(f"Missing columns: {', '.join(sorted(missing))}")
+            rows = [{key: (value or "").strip() for key, value in row.items() if key} for row in reader]
+
+        existing = set(
+            User.objects.filter(username__in=[row["username"] for row in rows]).values_list("username", flat=True)
+        )
+        # Addresses compare case-insensitively, as mail servers treat them.
+        taken_emails = set(
+            User.objects.annotate(address=Lower("email"))
+            .filter(address__in=[row["email"].lower() for row in rows])
+            .values_list("address", flat=True)
+        )
+        counties = {county.name: county for county in models.County.objects.all()}
+
+        users, profile_fields, passwords, generated, errors = [], [], [], [], []
+        for line, row in enumerate(rows, start=2):
+            user = User(
+                username=row["username"],
+                email=row["email"],
+                first_name=row.get("first_name", ""),
+                last_name=row.get("last_name", ""),
+                is_staff=options["staff"],
+            )
+            problems = []
+            try:
+                # The model's own validators (UnicodeUsernameValidator, field
+                # lengths, email syntax); uniqueness is checked against the
+                # sets above instead of with a query per row.
+                user.full_clean(exclude=["password"], validate_unique=False)
+            except ValidationError as exc:
+                problems.extend(
+                    f"{field}: {message}" for field, messages in exc.message_dict.items() for message in messages
+                )
+            if user.username in existing:
+                problems.append("username already exists")
+            if not user.email:
+                problems.append("missing email")
+            elif user.email.lower() in taken_emails:
+                problems.append("email already in use")
+
+            county = None
+            if row.get("county"):
+                place = gazetteer.locate(row["county"])
+                county = counties.get(place[0]) if place else None
+                if county is None:
+                    problems.append(f"unknown county {row['county']!r}")
+
+            password = row.get("password") or None
+            if password:
+                try:
+                    validate_password(password, user)
+                except ValidationError as exc:
+                    problems.extend(exc.messages)
+
+            if problems:
+                errors.append(f"line {line} ({user.username or '?'}): {'; '.join(problems)}")
+                continue
+            if not password and options["credentials"]:
+                password = get_random_string(GENERATED_PASSWORD_LENGTH)
+                generated.append((user.username, password))
+            existing.add(user.username)
+            taken_emails.add(user.email.lower())
+            users.append(user)
+            profile_fields.append({"phone": row.get("phone", ""), "county": county})
+            passwords.append(password)
+
+        for error in errors:
+            self.stderr.write(self.style.WARNING(error))
+        if errors and not options["skip_invalid"]:
+            raise CommandError(f"{len(errors)} invalid rows; nothing imported (use --skip-invalid to import the rest)")
+        skipped = f", {len(errors)} invalid rows skipped" if errors else ""
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"{len(users)} accounts would be created{skipped}"))
+            return
+
+        for user, encoded in zip(users, hashers.make_passwords(passwords)):
+            user.password = encoded
+        accounts.bulk_register_users(users, profile_fields)
+
+        if generated:
+            with open(options["credentials"], "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["username", "password"])
+                writer.writerows(generated)
+        self.stdout.write(self.style.SUCCESS(f"Created {len(users)} accounts{skipped}"))
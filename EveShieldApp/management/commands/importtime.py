@@ -0,0 +1,112 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter: import WSGI_APPLICATION as a server would and serve
+# one request, without django.test, which would pull unittest into the measurement.
+PROBE = """
+import importlib, json, os, sys, time
+start = time.perf_counter()
+os.environ["DJANGO_SETTINGS_MODULE"] = {settings_module!r}
+application = getattr(importlib.import_module({wsgi_module!r}), {wsgi_name!r})
+ready = time.perf_counter()
+environ = {{
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": {path!r},
+    "QUERY_STRING": "",
+    "SERVER_NAME": {host!r},
+    "SERVER_PORT": "80",
+    "HTTP_HOST": {host!r},
+    "wsgi.input": __import__("io").BytesIO(),
+    "wsgi.url_scheme": "http",
+}}
+statuses = []
+b"".join(application(environ, lambda status, headers, *args: statuses.append(status)))
+done = time.perf_counter()
+print(json.dumps({{
+    "setup": (ready - start) * 1000,
+    "first_response": (done - ready) * 1000,
+    "status": statuses[0],
+    "modules": len(sys.modules),
+}}))
+"""
+
+IMPORT_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def group_name(module, depth):
+    return ".".join(module.split(".")[:depth])
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot the site in a fresh interpreter under -X importtime, serve one request and report "
+        "the cold-start time and where import time goes; --max-ms fails when over budget"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Request to serve after booting")
+        parser.add_argument("--host", default="localhost", help="Host header; must be in ALLOWED_HOSTS")
+        parser.add_argument("--runs", type=int, default=3, help="Boots to run; the median is reported")
+        parser.add_argument("--depth", type=int, default=2, help="Dotted components to group modules by")
+        parser.add_argument("--top", type=int, default=20, help="Groups to list")
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            help="Exit with an error if the median time from interpreter start to first response exceeds this",
+        )
+
+    def handle(self, *args, **options):
+        if sys.flags.dont_write_bytecode or os.environ.get("PYTHONDONTWRITEBYTECODE"):
+            self.stderr.write(
+                self.style.WARNING("Bytecode caching is off, so the timings include compiling every module")
+            )
+
+        wsgi_module, wsgi_name = settings.WSGI_APPLICATION.rsplit(".", 1)
+        probe = PROBE.format(
+            settings_module=os.environ["DJANGO_SETTINGS_MODULE"],
+            wsgi_module=wsgi_module,
+            wsgi_name=wsgi_name,
+            path=options["path"],
+            host=options["host"],
+        )
+        runs, self_times = [], Counter()
+        for _ in range(options["runs"]):
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", probe],
+                capture_output=True,
+                text=True,
+                cwd=settings.BASE_DIR,
+            )
+            if result.returncode:
+                raise CommandError(f"Probe failed:\n{result.stderr[-2000:]}")
+            runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+            for line in result.stderr.splitlines():
+                match = IMPORT_LINE_RE.match(line)
+                if match:
+                    self_times[group_name(match[4], options["depth"])] += int(match[1])
+
+        setup = statistics.median(run["setup"] for run in runs)
+        first_response = statistics.median(run["first_response"] for run in runs)
+        total = statistics.median(run["setup"] + run["first_response"] for run in runs)
+        imported = sum(self_times.values()) / 1000 / len(runs)
+
+        self.stdout.write(f"{options['path']} -> {runs[0]['status']}, {runs[0]['modules']} modules loaded")
+        self.stdout.write(
+            f"setup {setup:.0f} ms + first response {first_response:.0f} ms = {total:.0f} ms "
+            f"(median of {len(runs)}; {imported:.0f} ms of it importing)"
+        )
+        self.stdout.write(f"\n{'self ms':>8}  {'share':>6}  module group")
+        for name, micros in self_times.most_common(options["top"]):
+            ms = micros / 1000 / len(runs)
+            self.stdout.write(f"{ms:>8.1f}  {ms / imported:>6.1%}  {name}")
+
+        if options["max_ms"] is not None and total > options["max_ms"]:
+            raise CommandError(f"Cold start took {total:.0f} ms, over the {options['max_ms']:.0f} ms budget")
@@ -0,0 +1,129 @@
+import gzip
+import re
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Pages a visitor typically lands on.
+PAGES = ["/", "/lawyers/", "/mental-health/", "/resources/", "/resources/emergency-contacts/", "/reports/submit/"]
+
+# Most bytes a first visit may transfer: the page and every asset it loads,
+# compressed as served. The icon font is over half of it.
+FIRST_VISIT_BUDGET = 200 * 1024
+# Most bytes of the page itself, which is sent on every visit while the
+# fingerprinted assets stay cached.
+HTML_BUDGET = 8 * 1024
+
+ASSET_RE = re.compile(r'<(?:link rel="stylesheet"|script)[^>]*?(?:href|src)="([^"]+)"')
+INLINE_STYLE_RE = re.compile(r"<style[\s>]")
+# Browsers that read a @font-face take its first format they support: woff2.
+FONT_RE = re.compile(r'url\("?([^")]+\.woff2)(?:\?[^")]*)?"?\)')
+
+
+@lru_cache
+def compressed_size(path):
+    """Bytes the static file storage serves for ``path``: its .br variant, or .gz without brotli"""
+    data = path.read_bytes()
+    if brotli is not None:
+        return len(brotli.compress(data))
+    return len(gzip.compress(data, 9))
+
+
+def static_file(url):
+    """The file behind a static URL: from STATIC_ROOT after collectstatic, else from the finders"""
+    name = urlsplit(url).path.removeprefix(urlsplit(urljoin("/", settings.STATIC_URL)).path)
+    collected = Path(settings.STATIC_ROOT) / name
+    if collected.is_file():
+        return collected
+    found = finders.find(name)
+    if found is None:
+        raise CommandError(f"Static file not found: {url}")
+    return Path(found)
+
+
+def request_host():
+    """A host name the site accepts, to request the pages with"""
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip(".")
+        if host and host != "*":
+            return host
+    return "localhost"
+
+
+def asset_weights(html, page_url):
+    """(url, raw bytes, bytes transferred) for each stylesheet, script and icon font a page loads"""
+    weights = []
+    for url in ASSET_RE.findall(html):
+        url = urljoin(page_url, url)
+        if urlsplit(url).netloc:
+            raise CommandError(f"{page_url} loads a third-party asset: {url}")
+        path = static_file(url)
+        weights.append((url, path.stat().st_size, compressed_size(path)))
+        if url.endswith(".css"):
+            for font in FONT_RE.findall(path.read_text()):
+                # Already compressed; served as is.
+                size = static_file(urljoin(url, font)).stat().st_size
+                weights.append((urljoin(url, font), size, size))
+    return weights
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what the key pages transfer on a first visit (page plus every stylesheet, script and font, "
+        "compressed as served) and on a repeat visit (the page alone), and fail if any is over budget"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-assets", action="store_true", help="List the assets of each page")
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=request_host(), HTTP_ACCEPT_ENCODING="br, gzip")
+        over = []
+        self.stdout.write(f"{'page':<32} {'html KB':>8} {'assets KB':>10} {'first visit KB':>15} {'raw KB':>8}")
+        for path in PAGES:
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f"{path} answered {response.status_code}")
+            if not response.has_header("Content-Encoding"):
+                over.append(f"{path} is sent uncompressed")
+            html_bytes = len(response.content)
+            html = response.content
+            if response.get("Content-Encoding") == "br":
+                html = brotli.decompress(html)
+            elif response.get("Content-Encoding") == "gzip":
+                html = gzip.decompress(html)
+            html = html.decode()
+            if INLINE_STYLE_RE.search(html):
+                over.append(f"{path} inlines a <style> block")
+
+            assets = asset_weights(html, path)
+            asset_bytes = sum(sent for _, _, sent in assets)
+            raw_bytes = len(html) + sum(raw for _, raw, _ in assets)
+            first_visit = html_bytes + asset_bytes
+            self.stdout.write(
+                f"{path:<32} {html_bytes / 1024:>8.1f} {asset_bytes / 1024:>10.1f} "
+                f"{first_visit / 1024:>15.1f} {raw_bytes / 1024:>8.1f}"
+            )
+            if options["verbose_assets"]:
+                for url, raw, sent in assets:
+                    self.stdout.write(f"    {url:<60} {raw / 1024:>8.1f} -> {sent / 1024:.1f} KB")
+            if html_bytes > HTML_BUDGET:
+                over.append(f"{path} HTML is {html_bytes / 1024:.1f} KB, budget {HTML_BUDGET / 1024:.0f} KB")
+            if first_visit > FIRST_VISIT_BUDGET:
+                over.append(
+                    f"{path} first visit is {first_visit / 1024:.1f} KB, budget {FIRST_VISIT_BUDGET / 1024:.0f} KB"
+                )
+
+        if over:
+            raise CommandError("Over budget:\n  " + "\n  ".join(over))
+        self.stdout.write(self.style.SUCCESS("Every page is within budget"))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from EveShieldApp import models, retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete reports resolved more than REPORT_RETENTION_DAYS ago, with their evidence files, "
+        "and remove evidence files no report refers to. Safe to run while the site is live"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Override REPORT_RETENTION_DAYS")
+        parser.add_argument("--batch-size", type=int, default=retention.PURGE_BATCH_SIZE)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches, to leave room for other writers",
+        )
+        parser.add_argument("--workers", type=int, default=8, help="Threads scanning upload directories")
+        parser.add_argument("--skip-orphans", action="store_true", help="Do not look for orphaned evidence files")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted, delete nothing")
+
+    def handle(self, *args, **options):
+        cutoff = retention.retention_cutoff(options["days"])
+        models_to_purge = (models.GBVReport, models.ArchivedReport)
+
+        if options["dry_run"]:
+            for model in models_to_purge:
+                count = retention.expired(model, cutoff).count()
+                self.stdout.write(f"{count} {model._meta.verbose_name_plural} resolved before {cutoff:%Y-%m-%d}")
+        else:
+            deleted = retention.purge(cutoff, options["batch_size"], options["pause"])
+            for model in models_to_purge:
+                self.stdout.write(self.style.SUCCESS(f"Deleted {deleted[model]} {model._meta.verbose_name_plural}"))
+
+        if options["skip_orphans"]:
+            return
+        orphans = retention.orphaned_files(options["workers"])
+        size = filesizeformat(sum(size for _, size in orphans))
+        if options["dry_run"]:
+            for name, _ in orphans:
+                self.stdout.write(f"  {name}")
+            self.stdout.write(f"{len(orphans)} orphaned evidence files ({size})")
+        else:
+            retention.delete_files(name for name, _ in orphans)
+            self.stdout.write(self.style.SUCCESS(f"Deleted {len(orphans)} orphaned evidence files ({size})"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from EveShieldApp import related
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed related-articles index for all published articles"
+
+    def handle(self, *args, **options):
+        count = related.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt related articles for {count} articles."))
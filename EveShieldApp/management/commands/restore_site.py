@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from EveShieldApp import backup
+
+
+class Command(BaseCommand):
+    help = "Verify a backup_site snapshot and restore the database and media files from it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("snapshot", nargs="?", help="Snapshot directory (default: the latest in BACKUP_ROOT)")
+        parser.add_argument("--verify-only", action="store_true", help="Check the snapshot, restore nothing")
+        parser.add_argument("--noinput", action="store_false", dest="interactive", help="Do not ask for confirmation")
+
+    def handle(self, *args, **options):
+        snapshot = options["snapshot"]
+        if snapshot is None:
+            available = backup.snapshots()
+            if not available:
+                raise CommandError("No snapshots found")
+            snapshot = available[-1]
+
+        if options["verify_only"]:
+            problems = backup.verify_snapshot(snapshot)
+            if problems:
+                raise CommandError(f"{snapshot} is not restorable: {'; '.join(problems)}")
+            self.stdout.write(self.style.SUCCESS(f"{snapshot} verified"))
+            return
+
+        if options["interactive"]:
+            answer = input(f"This replaces the database with {snapshot}. Type 'yes' to continue: ")
+            if answer != "yes":
+                raise CommandError("Restore cancelled")
+        try:
+            restored = backup.restore_snapshot(snapshot)
+        except backup.BackupError as exc:
+            raise CommandError(exc)
+        self.stdout.write(self.style.SUCCESS(f"Restored {snapshot} ({restored} media files rewritten)"))
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from EveShieldApp import notify
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued report notifications by email and SMS, retrying failures. Runs until stopped, "
+        "looking for due messages every NOTIFY_POLL_INTERVAL seconds, unless --once is given"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Send what is due now and exit")
+        parser.add_argument("--batch-size", type=int, default=settings.NOTIFY_BATCH_SIZE)
+        parser.add_argument(
+            "--senders",
+            type=int,
+            default=settings.NOTIFY_SENDERS,
+            help="Concurrent connections per channel",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            outcomes = asyncio.run(notify.deliver(options["batch_size"], options["senders"]))
+            if outcomes:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Sent {outcomes['sent']}, retrying {outcomes['retrying']}, failed {outcomes['failed']} "
+                        f"in {time.perf_counter() - started:.1f}s"
+                    )
+                )
+            if options["once"]:
+                return
+            time.sleep(settings.NOTIFY_POLL_INTERVAL)
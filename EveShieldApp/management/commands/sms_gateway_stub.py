@@ -0,0 +1,57 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a stand-in SMS gateway that prints the messages notify.HTTPSMSBackend posts to it, "
+        "for trying out notifications locally"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8090)
+        parser.add_argument(
+            "--reject",
+            action="append",
+            default=[],
+            metavar="NUMBER",
+            help="Answer messages to this number with an error, to exercise retries (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        command, rejected = self, set(options["reject"])
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, as the backend reuses its connection.
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                messages = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["messages"]
+                results = []
+                for message in messages:
+                    if message["to"] in rejected:
+                        results.append({"error": "Rejected by sms_gateway_stub"})
+                        command.stdout.write(command.style.WARNING(f"Rejected SMS to {message['to']}"))
+                    else:
+                        results.append(None)
+                        command.stdout.write(f"SMS to {message['to']}: {message['text']}")
+                body = json.dumps({"results": results}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("localhost", options["port"]), Handler)
+        self.stdout.write(f"SMS gateway stub listening on http://localhost:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,123 @@
+import base64
+import hashlib
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOTSTRAP = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist"
+POPPER = "https://cdn.jsdelivr.net/npm/@popperjs/core@2.11.8/dist/umd"
+BOOTSTRAP_ICONS = "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font"
+
+# (url, destination under static/vendor/, sha384 SRI digest). The files are
+# committed; every copy on disk or downloaded must match its digest. Source
+# maps are included because collectstatic fingerprints the files they name.
+VENDOR_ASSETS = [
+    (
+        f"{BOOTSTRAP}/css/bootstrap.min.css",
+        "bootstrap/css/bootstrap.min.css",
+        "T3c6CoIi6uLrA9TneNEoa7RxnatzjcDSCmG1MXxSR1GAsXEV/Dwwykc2MPK8M2HN",
+    ),
+    (
+        f"{BOOTSTRAP}/css/bootstrap.min.css.map",
+        "bootstrap/css/bootstrap.min.css.map",
+        "jAA88rDTBmbYnuwk1/CXgKMtmYEZkaG6m1nP9nnxxQVv0mBhDBuzqN4u/niuqzcy",
+    ),
+    (
+        f"{BOOTSTRAP}/js/bootstrap.min.js",
+        "bootstrap/js/bootstrap.min.js",
+        "BBtl+eGJRgqQAUMxJ7pMwbEyER4l1g+O15P+16Ep7Q9Q+zqX6gSbd85u4mG4QzX+",
+    ),
+    (
+        f"{BOOTSTRAP}/js/bootstrap.min.js.map",
+        "bootstrap/js/bootstrap.min.js.map",
+        "WkWSM9BAYln60PzSJpSwoRCKFhFilYSG0Lpf8I2hZQBZY3EqeInrxyGjaMuypGo2",
+    ),
+    (
+        f"{POPPER}/popper.min.js",
+        "popper/popper.min.js",
+        "rn0XrCNfhQuw2/tzfv4cvBHjPnljfEYSGlYLk2VmCk0ts82JdJvQ72xx/nV/XJcB",
+    ),
+    (
+        f"{POPPER}/popper.min.js.map",
+        "popper/popper.min.js.map",
+        "vLnvGFDDz9GdFhZHrhBowk9+z3Z8m4PQbqJdXTiFMoVDbFp3zZwbZfXgObLTImHH",
+    ),
+    (
+        f"{BOOTSTRAP_ICONS}/bootstrap-icons.min.css",
+        "bootstrap-icons/bootstrap-icons.min.css",
+        "XGjxtQfXaH2tnPFa9x+ruJTuLE3Aa6LhHSWRr1XeTyhezb4abCG4ccI5AkVDxqC+",
+    ),
+    (
+        f"{BOOTSTRAP_ICONS}/fonts/bootstrap-icons.woff2",
+        "bootstrap-icons/fonts/bootstrap-icons.woff2",
+        "QV+/zNG6sFIQ/qAWRxaR4sjpF37wr046d3pTS5QlogmJfbmyeiWip4YIIGmdK4pa",
+    ),
+    (
+        f"{BOOTSTRAP_ICONS}/fonts/bootstrap-icons.woff",
+        "bootstrap-icons/fonts/bootstrap-icons.woff",
+        "jiOBsoZ7OEMAq7BXRR05+D5H/5Lna7TAlXVGHhkfH68p5P1eKJTeI4KCIOfBzG/O",
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the vendored Bootstrap, Popper and Bootstrap Icons files in static/vendor/ against their pinned "
+        "digests, downloading any that are missing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-download every asset, even those already present",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only check the files on disk; never download",
+        )
+
+    def handle(self, *args, **options):
+        vendor_dir = Path(settings.STATICFILES_DIRS[0]) / "vendor"
+
+        problems = []
+        for url, dest, integrity in VENDOR_ASSETS:
+            target = vendor_dir / dest
+            if target.exists() and not options["force"]:
+                if self.sri_digest(target.read_bytes()) != integrity:
+                    problems.append(f"{target} does not match its pinned digest")
+                continue
+            if options["check"]:
+                problems.append(f"{target} is missing")
+                continue
+            data = self.fetch(url)
+            if self.sri_digest(data) != integrity:
+                raise CommandError(f"Integrity check failed for {url}")
+            self.write(target, data)
+
+        if problems:
+            raise CommandError("\n".join(problems))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Vendored assets in {vendor_dir} match their pins. Run collectstatic to fingerprint and compress them."
+            )
+        )
+
+    def fetch(self, url):
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                return response.read()
+        except OSError as exc:
+            raise CommandError(f"Could not download {url}: {exc}") from exc
+
+    def write(self, target, data):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        self.stdout.write(f"  {target} ({len(data)} bytes)")
+
+    @staticmethod
+    def sri_digest(data):
+        return base64.b64encode(hashlib.sha384(data).digest()).decode("ascii")
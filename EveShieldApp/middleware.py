@@ -0,0 +1,187 @@
+import random
+import sys
+import threading
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+from django.utils.regex_helper import _lazy_re_compile
+
+from EveShieldApp import models, profiling
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip still works
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with brotli when the browser accepts it, falling back
+    to Django's gzip handling otherwise and for pages a BREACH attack could
+    target. Streaming responses are compressed chunk by chunk so they are
+    never buffered in memory.
+    """
+
+    brotli_quality = 5
+
+    @staticmethod
+    def breach_exposed(request, response):
+        """
+        Whether the body may hold a secret beside reflected input: a CSRF
+        token (Django sets the cookie again whenever one is rendered) or
+        anything shown to a signed-in user. Such responses get Django's
+        gzip, which pads each one with a random number of bytes against
+        BREACH; brotli has no header field to carry that padding.
+        """
+        if settings.CSRF_COOKIE_NAME in response.cookies:
+            return True
+        user = getattr(request, "user", None)
+        return user is not None and user.is_authenticated
+
+    def process_response(self, request, response):
+        # Byte ranges refer to the uncompressed file, and compressing it
+        # would also stop the server from sending it with sendfile().
+        if response.has_header("Accept-Ranges"):
+            return response
+
+        ae = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if brotli is None or not re_accepts_brotli.search(ae) or self.breach_exposed(request, response):
+            return super().process_response(request, response)
+
+        # It's not worth attempting to compress really short responses.
+        if not response.streaming and len(response.content) < 200:
+            return response
+
+        if response.has_header("Content-Encoding"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if response.streaming:
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            if response.is_async:
+                original_iterator = response.streaming_content
+
+                async def brotli_wrapper():
+                    async for chunk in original_iterator:
+                        yield compressor.process(chunk) + compressor.flush()
+                    yield compressor.finish()
+
+                response.streaming_content = brotli_wrapper()
+            else:
+                response.streaming_content = self.compress_sequence(
+                    compressor, response.streaming_content
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = brotli.compress(response.content, quality=self.brotli_quality)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+
+        return response
+
+    @staticmethod
+    def compress_sequence(compressor, sequence):
+        for chunk in sequence:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+def get_profile(request):
+    if not request.user.is_authenticated:
+        return None
+    return models.UserProfile.objects.for_user(request.user)
+
+
+class ProfileMiddleware:
+    """
+    Attach ``request.profile``, the signed-in user's cached UserProfile.
+
+    It is lazy, so requests that never touch it cost nothing. Must come
+    after AuthenticationMiddleware.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request))
+        return self.get_response(request)
+
+
+class SamplingProfilerMiddleware:
+    """
+    Profile one request in PROFILING_SAMPLE_RATE, and any request from a
+    staff user that sends an ``X-Profile`` header, with
+    EveShieldApp.profiling.Sampler, and store the stacks per view.
+
+    Other requests cost a random draw, or nothing when the rate is 0.
+    Must come after AuthenticationMiddleware.
+
+    Under WSGI an async view runs on a separate event loop thread, which is
+    not sampled; the request shows up as waiting in async_to_sync. Run
+    async views under ASGI to profile them.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_INTERVAL
+        self.is_async = iscoroutinefunction(self.get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def drawn(self):
+        return self.sample_rate and random.random() * self.sample_rate < 1
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not (self.drawn() or ("HTTP_X_PROFILE" in request.META and request.user.is_staff)):
+            return self.get_response(request)
+
+        sampler = profiling.Sampler(sys._getframe(), self.interval)
+        sampler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        profiling.record(request, response, sampler)
+        return response
+
+    async def __acall__(self, request):
+        if not (self.drawn() or ("HTTP_X_PROFILE" in request.META and (await request.auser()).is_staff)):
+            return await self.get_response(request)
+
+        sampler = profiling.Sampler(sys._getframe(), self.interval)
+        # Sync views and ORM calls run in this request's sync_to_async thread.
+        sampler.follow(await sync_to_async(threading.get_ident)())
+        sampler.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            sampler.stop()
+        await sync_to_async(profiling.record)(request, response, sampler)
+        return response
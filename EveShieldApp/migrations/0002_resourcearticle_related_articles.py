@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resourcearticle',
+            name='related_articles',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Precomputed related links (see EveShieldApp.related)'),
+        ),
+    ]
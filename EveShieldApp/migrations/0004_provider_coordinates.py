@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-19 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0003_resourcearticle_rendered_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lawyer',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Leave blank to geocode from the county/address', null=True),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='therapist',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='therapist',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Leave blank to geocode from the county/address', null=True),
+        ),
+        migrations.AddField(
+            model_name='therapist',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,242 @@
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+PROVIDER_MODELS = ('Lawyer', 'Therapist')
+
+# A frozen copy of the EveShieldApp.gazetteer data and matching as of this
+# migration, so later changes to the live module cannot change what it does.
+# (code, name, latitude, longitude) of the county headquarters.
+COUNTIES = [
+    (1, 'Mombasa', -4.0435, 39.6682),
+    (2, 'Kwale', -4.1737, 39.4521),
+    (3, 'Kilifi', -3.5107, 39.9093),
+    (4, 'Tana River', -1.4833, 40.0333),
+    (5, 'Lamu', -2.2717, 40.902),
+    (6, 'Taita-Taveta', -3.3961, 38.5561),
+    (7, 'Garissa', -0.4536, 39.6401),
+    (8, 'Wajir', 1.7471, 40.0573),
+    (9, 'Mandera', 3.9366, 41.867),
+    (10, 'Marsabit', 2.3346, 37.9899),
+    (11, 'Isiolo', 0.3546, 37.5822),
+    (12, 'Meru', 0.0463, 37.6559),
+    (13, 'Tharaka-Nithi', -0.3333, 37.65),
+    (14, 'Embu', -0.531, 37.4506),
+    (15, 'Kitui', -1.3671, 38.0106),
+    (16, 'Machakos', -1.5177, 37.2634),
+    (17, 'Makueni', -1.78, 37.63),
+    (18, 'Nyandarua', -0.27, 36.38),
+    (19, 'Nyeri', -0.4201, 36.9476),
+    (20, 'Kirinyaga', -0.4989, 37.2803),
+    (21, "Murang'a", -0.721, 37.1526),
+    (22, 'Kiambu', -1.1714, 36.8356),
+    (23, 'Turkana', 3.1191, 35.5973),
+    (24, 'West Pokot', 1.2389, 35.1119),
+    (25, 'Samburu', 1.0968, 36.698),
+    (26, 'Trans Nzoia', 1.0157, 35.0062),
+    (27, 'Uasin Gishu', 0.5143, 35.2698),
+    (28, 'Elgeyo-Marakwet', 0.6703, 35.5081),
+    (29, 'Nandi', 0.2036, 35.1025),
+    (30, 'Baringo', 0.4919, 35.743),
+    (31, 'Laikipia', 0.2725, 36.5383),
+    (32, 'Nakuru', -0.3031, 36.08),
+    (33, 'Narok', -1.0783, 35.8601),
+    (34, 'Kajiado', -1.8524, 36.7768),
+    (35, 'Kericho', -0.3677, 35.2831),
+    (36, 'Bomet', -0.7813, 35.3416),
+    (37, 'Kakamega', 0.2827, 34.7519),
+    (38, 'Vihiga', 0.076, 34.7229),
+    (39, 'Bungoma', 0.5635, 34.5606),
+    (40, 'Busia', 0.4608, 34.1115),
+    (41, 'Siaya', 0.0607, 34.2881),
+    (42, 'Kisumu', -0.0917, 34.768),
+    (43, 'Homa Bay', -0.5273, 34.4571),
+    (44, 'Migori', -1.0634, 34.4731),
+    (45, 'Kisii', -0.6817, 34.7667),
+    (46, 'Nyamira', -0.5633, 34.9358),
+    (47, 'Nairobi', -1.2921, 36.8219),
+]
+
+# Towns people commonly give instead of a county: name -> county.
+TOWNS = {
+    'Thika': 'Kiambu',
+    'Ruiru': 'Kiambu',
+    'Kikuyu': 'Kiambu',
+    'Limuru': 'Kiambu',
+    'Eldoret': 'Uasin Gishu',
+    'Kitale': 'Trans Nzoia',
+    'Malindi': 'Kilifi',
+    'Watamu': 'Kilifi',
+    'Mtwapa': 'Kilifi',
+    'Naivasha': 'Nakuru',
+    'Nanyuki': 'Laikipia',
+    'Nyahururu': 'Laikipia',
+    'Voi': 'Taita-Taveta',
+    'Lodwar': 'Turkana',
+    'Kakuma': 'Turkana',
+    'Maralal': 'Samburu',
+    'Kapenguria': 'West Pokot',
+    'Iten': 'Elgeyo-Marakwet',
+    'Kapsabet': 'Nandi',
+    'Kabarnet': 'Baringo',
+    'Kerugoya': 'Kirinyaga',
+    'Chuka': 'Tharaka-Nithi',
+    'Ol Kalou': 'Nyandarua',
+    'Wote': 'Makueni',
+    'Hola': 'Tana River',
+    'Ukunda': 'Kwale',
+    'Diani': 'Kwale',
+    'Athi River': 'Machakos',
+    'Kitengela': 'Kajiado',
+    'Ngong': 'Kajiado',
+    'Webuye': 'Bungoma',
+    'Malaba': 'Busia',
+    'Bondo': 'Siaya',
+}
+
+COUNTY_ALIASES = {
+    'Nairobi City': 'Nairobi',
+    'Taita Taveta': 'Taita-Taveta',
+    'Taita': 'Taita-Taveta',
+    'Tharaka Nithi': 'Tharaka-Nithi',
+    'Tharaka': 'Tharaka-Nithi',
+    'Elgeyo Marakwet': 'Elgeyo-Marakwet',
+    'Keiyo Marakwet': 'Elgeyo-Marakwet',
+    'Muranga': "Murang'a",
+    'Homabay': 'Homa Bay',
+    'Transnzoia': 'Trans Nzoia',
+    'Uasingishu': 'Uasin Gishu',
+}
+
+
+def normalize(text):
+    text = re.sub(r"[-'’`]", ' ', (text or '').lower())
+    text = re.sub(r'[^a-z ]+', ' ', text)
+    return ' '.join(text.split())
+
+
+def county_lookup():
+    """Normalized county, alias and town names -> county name, and a pattern matching them"""
+    names = {normalize(name): name for _code, name, _lat, _lon in COUNTIES}
+    names.update((normalize(alias), name) for alias, name in COUNTY_ALIASES.items())
+    names.update((normalize(town), county) for town, county in TOWNS.items())
+    # Longer names first so "homa bay" wins over a shorter partial match.
+    keys = sorted(names, key=len, reverse=True)
+    return names, re.compile(r'\b(' + '|'.join(re.escape(key) for key in keys) + r')\b')
+
+
+def seed_counties(apps, schema_editor):
+    County = apps.get_model('EveShieldApp', 'County')
+    County.objects.bulk_create(
+        [
+            County(code=code, name=name, latitude=lat, longitude=lon)
+            for code, name, lat, lon in COUNTIES
+        ]
+    )
+
+
+def backfill_counties(apps, schema_editor):
+    County = apps.get_model('EveShieldApp', 'County')
+    county_ids = dict(County.objects.values_list('name', 'id'))
+    names, pattern = county_lookup()
+
+    def resolve(text):
+        match = pattern.search(normalize(text))
+        return county_ids[names[match.group(1)]] if match else None
+
+    for model_name in PROVIDER_MODELS:
+        model = apps.get_model('EveShieldApp', model_name)
+        for provider in model.objects.exclude(county='').iterator():
+            provider.county_ref_id = resolve(provider.county)
+            if provider.county_ref_id is None:
+                # Keep unmatched legacy text rather than dropping it.
+                provider.address = '\n'.join(filter(None, [provider.address, f'County: {provider.county}']))
+            provider.save(update_fields=['county_ref', 'address'])
+
+    UserProfile = apps.get_model('EveShieldApp', 'UserProfile')
+    for profile in UserProfile.objects.exclude(county__isnull=True).exclude(county='').iterator():
+        profile.county_ref_id = resolve(profile.county)
+        profile.save(update_fields=['county_ref'])
+
+    GBVReport = apps.get_model('EveShieldApp', 'GBVReport')
+    for report in GBVReport.objects.only('id', 'location').iterator():
+        county_id = resolve(report.location)
+        if county_id:
+            GBVReport.objects.filter(id=report.id).update(county_id=county_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0004_provider_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='County',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.PositiveSmallIntegerField(unique=True)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'verbose_name': 'County',
+                'verbose_name_plural': 'Counties',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(seed_counties, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='gbvreport',
+            name='county',
+            field=models.ForeignKey(blank=True, help_text='Matched from location on save', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reports', to='EveShieldApp.county'),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='county_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='EveShieldApp.county'),
+        ),
+        migrations.AddField(
+            model_name='therapist',
+            name='county_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='EveShieldApp.county'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='county_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='EveShieldApp.county'),
+        ),
+        migrations.RunPython(backfill_counties, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='lawyer',
+            options={'ordering': ['county__name', 'name'], 'verbose_name': 'Lawyer', 'verbose_name_plural': 'Lawyers'},
+        ),
+        migrations.AlterModelOptions(
+            name='therapist',
+            options={'ordering': ['county__name', 'name'], 'verbose_name': 'Therapist', 'verbose_name_plural': 'Therapists'},
+        ),
+        migrations.RemoveField(model_name='lawyer', name='county'),
+        migrations.RemoveField(model_name='therapist', name='county'),
+        migrations.RemoveField(model_name='userprofile', name='county'),
+        migrations.RenameField(model_name='lawyer', old_name='county_ref', new_name='county'),
+        migrations.RenameField(model_name='therapist', old_name='county_ref', new_name='county'),
+        migrations.RenameField(model_name='userprofile', old_name='county_ref', new_name='county'),
+        migrations.AlterField(
+            model_name='lawyer',
+            name='county',
+            field=models.ForeignKey(help_text='County where services are provided', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='lawyers', to='EveShieldApp.county'),
+        ),
+        migrations.AlterField(
+            model_name='therapist',
+            name='county',
+            field=models.ForeignKey(help_text='County where services are provided', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='therapists', to='EveShieldApp.county'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='county',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='user_profiles', to='EveShieldApp.county'),
+        ),
+    ]
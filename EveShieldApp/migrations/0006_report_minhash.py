@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 18:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0005_county'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gbvreport',
+            name='minhash',
+            field=models.BinaryField(help_text='MinHash signature of the details, for duplicate detection', null=True),
+        ),
+        migrations.CreateModel(
+            name='ReportBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_bands', to='EveShieldApp.gbvreport')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='EveShieldAp_band_a91a93_idx')],
+            },
+        ),
+    ]
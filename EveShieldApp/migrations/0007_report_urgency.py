@@ -0,0 +1,95 @@
+# Generated by Django 5.2 on 2026-10-19 18:02
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# A frozen copy of EveShieldApp.triage.urgency_score as of this migration,
+# so later changes to the live module cannot change what it does.
+CRISIS_KEYWORDS = ['suicide', 'self harm', 'hurt myself', 'end it', 'kill myself', 'danger', 'emergency']
+THREAT_KEYWORDS = [
+    'kill me',
+    'threatened to kill',
+    'knife',
+    'panga',
+    'gun',
+    'weapon',
+    'locked me',
+    'right now',
+    'tonight',
+    'still here',
+    'coming back',
+    'bleeding',
+    'unconscious',
+    'child',
+]
+VIOLENCE_WEIGHTS = {
+    'sexual': 35,
+    'physical': 35,
+    'emotional': 15,
+    'digital': 10,
+    'economic': 10,
+    'other': 15,
+}
+CRISIS_WEIGHT = 30
+THREAT_WEIGHT = 8
+MAX_THREAT_WEIGHT = 16
+EVIDENCE_WEIGHT = 5
+RECENCY_WEIGHTS = [
+    (timedelta(days=1), 15),
+    (timedelta(days=7), 10),
+    (timedelta(days=30), 5),
+]
+UNDATED_WEIGHT = 5
+MAX_URGENCY = 100
+
+
+def recency_weight(incident_date, submitted_at):
+    if incident_date is None:
+        return UNDATED_WEIGHT
+    age = timezone.localdate(submitted_at) - incident_date
+    for window, weight in RECENCY_WEIGHTS:
+        if age < window:
+            return weight
+    return 0
+
+
+def urgency_score(report):
+    details = (report.details or '').lower()
+    submitted_at = report.created_at or timezone.now()
+
+    score = VIOLENCE_WEIGHTS.get(report.type_of_violence, VIOLENCE_WEIGHTS['other'])
+    if any(keyword in details for keyword in CRISIS_KEYWORDS):
+        score += CRISIS_WEIGHT
+    score += min(sum(keyword in details for keyword in THREAT_KEYWORDS) * THREAT_WEIGHT, MAX_THREAT_WEIGHT)
+    score += recency_weight(report.incident_date, submitted_at)
+    if report.file_upload:
+        score += EVIDENCE_WEIGHT
+    return min(score, MAX_URGENCY)
+
+
+def score_existing_reports(apps, schema_editor):
+    GBVReport = apps.get_model('EveShieldApp', 'GBVReport')
+    for report in GBVReport.objects.defer('minhash', 'admin_notes').iterator():
+        GBVReport.objects.filter(id=report.id).update(urgency=urgency_score(report))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0006_report_minhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gbvreport',
+            name='urgency',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Triage score from 0 to 100, computed on save'),
+        ),
+        migrations.RunPython(score_existing_reports, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='gbvreport',
+            index=models.Index(fields=['status', '-urgency', 'created_at'], name='report_triage_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-19 18:20
+
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    UserProfile = apps.get_model('EveShieldApp', 'UserProfile')
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=user_id) for user_id in User.objects.filter(userprofile__isnull=True).values_list('id', flat=True)]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0007_report_urgency'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
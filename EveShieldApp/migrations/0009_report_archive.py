@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-19 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def stamp_resolved_reports(apps, schema_editor):
+    GBVReport = apps.get_model('EveShieldApp', 'GBVReport')
+    GBVReport.objects.filter(status='resolved').update(resolved_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0008_create_missing_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gbvreport',
+            name='resolved_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the report was last marked resolved', null=True),
+        ),
+        migrations.RunPython(stamp_resolved_reports, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ArchivedReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('year', models.PositiveSmallIntegerField(help_text='Year the report was submitted')),
+                ('type_of_violence', models.CharField(choices=[('physical', 'Physical Violence'), ('sexual', 'Sexual Violence'), ('emotional', 'Emotional/Psychological Violence'), ('economic', 'Economic Violence'), ('digital', 'Digital/Online Violence'), ('other', 'Other')], max_length=20)),
+                ('location', models.CharField(max_length=255)),
+                ('details', models.TextField()),
+                ('incident_date', models.DateField(blank=True, null=True)),
+                ('file_upload', models.FileField(blank=True, null=True, upload_to='reports/%Y/%m/%d/')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reviewed', 'Reviewed'), ('in_progress', 'In Progress'), ('resolved', 'Resolved')], max_length=20)),
+                ('urgency', models.PositiveSmallIntegerField(default=0)),
+                ('admin_notes', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('resolved_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('county', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reports', to='EveShieldApp.county')),
+            ],
+            options={
+                'verbose_name': 'Archived Report',
+                'verbose_name_plural': 'Archived Reports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['year', 'created_at'], name='archive_year_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0009_report_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivedreport',
+            index=models.Index(fields=['resolved_at'], name='archive_resolved_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0011_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gbvreport',
+            index=models.Index(fields=['updated_at'], name='report_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 19:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0013_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.TextField(unique=True)),
+                ('articles', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArticleVector',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tfidf', serialize=False, to='EveShieldApp.resourcearticle')),
+                ('terms', models.JSONField(default=dict)),
+                ('weights', models.JSONField(default=dict)),
+            ],
+        ),
+    ]
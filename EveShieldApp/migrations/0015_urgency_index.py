@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('EveShieldApp', '0014_related_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gbvreport',
+            index=models.Index(fields=['-urgency', 'created_at'], name='report_urgency_idx'),
+        ),
+    ]
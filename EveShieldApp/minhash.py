@@ -0,0 +1,68 @@
+import hashlib
+import random
+import re
+import struct
+import zlib
+
+# 64 permutations in 16 bands of 4 rows: pairs with Jaccard similarity
+# around (1/16) ** (1/4) = 0.5 or more share at least one band bucket.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE = struct.Struct(f"<{NUM_PERM}I")
+
+# Fixed seed: stored signatures must stay comparable across processes and deploys.
+_rng = random.Random(20260417)
+PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text):
+    """Word trigrams of ``text``; shorter texts are a single shingle"""
+    words = WORD_RE.findall((text or "").lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text):
+    """
+    MinHash signature of ``text`` packed into 256 bytes.
+
+    Returns None for text without any words.
+    """
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return _SIGNATURE.pack(
+        *(min((a * value + b) % _PRIME for value in hashes) & _MAX_HASH for a, b in PERMUTATIONS)
+    )
+
+
+def unpack(packed):
+    return _SIGNATURE.unpack(bytes(packed))
+
+
+def band_buckets(packed):
+    """One signed 64-bit bucket id per band, for the LSH index"""
+    packed = bytes(packed)
+    width = ROWS * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(packed[band * width : (band + 1) * width], digest_size=8).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two packed signatures"""
+    first, second = unpack(first), unpack(second)
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERM
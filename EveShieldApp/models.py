@@ -1,5 +1,63 @@
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
+from django.db.models.functions import Substr
+from django.utils import timezone
+
+from EveShieldApp import gazetteer, geo
+
+
+class CountyManager(models.Manager):
+    def resolve(self, text):
+        """Match legacy free text (county, town or alias) to a County, or None"""
+        place = gazetteer.locate(text)
+        if place is None:
+            return None
+        return self.filter(name=place[0]).first()
+
+
+class County(models.Model):
+    """Kenyan county reference table (see EveShieldApp.gazetteer)"""
+
+    code = models.PositiveSmallIntegerField(unique=True)
+    name = models.CharField(max_length=50, unique=True)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    objects = CountyManager()
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = "County"
+        verbose_name_plural = "Counties"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class UserProfileManager(models.Manager):
+    cache_timeout = 3600
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"user-profile:{user_id}"
+
+    def for_user(self, user):
+        """The user's profile with its county, read through the cache when every worker shares it"""
+        if not settings.SHARED_CACHE:
+            return self.load(user)
+        key = self.cache_key(user.pk)
+        profile = cache.get(key)
+        if profile is None:
+            profile = self.load(user)
+            cache.set(key, profile, self.cache_timeout)
+        return profile
+
+    def load(self, user):
+        # Profiles are created with the user; get_or_create only covers accounts
+        # made while the post_save signal was not connected (e.g. raw fixtures).
+        return self.select_related("county").get_or_create(user=user)[0]
 
 
 class UserProfile(models.Model):
@@ -7,14 +65,51 @@ class UserProfile(models.Model):
 
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     phone = models.CharField(max_length=20, blank=True, null=True)
-    county = models.CharField(max_length=100, blank=True, null=True)
+    county = models.ForeignKey(
+        County,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="user_profiles",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserProfileManager()
+
     def __str__(self) -> str:
         return f"{self.user.username}'s Profile"
 
 
+# Characters of long text columns that list pages show; the rest stays in the database.
+REPORT_EXCERPT_LENGTH = 120
+ADDRESS_LINE_LENGTH = 80
+
+
+class GBVReportQuerySet(models.QuerySet):
+    def for_list(self):
+        """Dashboard rows: summary columns plus the start of the details"""
+        return self.only(
+            "id", "type_of_violence", "location", "status", "urgency", "created_at", "updated_at"
+        ).annotate(details_excerpt=Substr("details", 1, REPORT_EXCERPT_LENGTH))
+
+
+class ProviderQuerySet(models.QuerySet):
+    def for_directory(self):
+        """Directory cards: the model's ``directory_fields`` and county name plus the start of the address"""
+        return (
+            self.select_related("county")
+            .only(*self.model.directory_fields, "county__name")
+            .annotate(address_line=Substr("address", 1, ADDRESS_LINE_LENGTH))
+        )
+
+
+class ResourceArticleQuerySet(models.QuerySet):
+    def for_list(self):
+        """Article cards, which show the stored excerpt instead of the body"""
+        return self.only("id", "title", "slug", "category", "excerpt", "created_at")
+
+
 class ViolenceType(models.TextChoices):
     """Types of gender-based violence"""
 
@@ -45,7 +140,20 @@ class GBVReport(models.Model):
         default=ViolenceType.OTHER,
     )
     location = models.CharField(max_length=255, help_text="County, town, or area")
+    county = models.ForeignKey(
+        County,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="reports",
+        help_text="Matched from location on save",
+    )
     details = models.TextField(help_text="Detailed description of the incident")
+    minhash = models.BinaryField(
+        null=True,
+        editable=False,
+        help_text="MinHash signature of the details, for duplicate detection",
+    )
     incident_date = models.DateField(
         null=True,
         blank=True,
@@ -64,6 +172,17 @@ class GBVReport(models.Model):
         choices=ReportStatus.choices,
         default=ReportStatus.PENDING,
     )
+    urgency = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Triage score from 0 to 100, computed on save",
+    )
+    resolved_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When the report was last marked resolved",
+    )
 
     # Admin notes (only visible to admins)
     admin_notes = models.TextField(
@@ -76,10 +195,28 @@ class GBVReport(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GBVReportQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "GBV Report"
         verbose_name_plural = "GBV Reports"
+        indexes = [
+            # Serves the triage queue: pending reports, most urgent and then oldest first.
+            models.Index(fields=["status", "-urgency", "created_at"], name="report_triage_idx"),
+            # Serves the dashboard sorted by urgency across every status, which
+            # report_triage_idx cannot order without a status to start from.
+            models.Index(fields=["-urgency", "created_at"], name="report_urgency_idx"),
+            # Serves the live dashboard feed's poll for recently saved reports.
+            models.Index(fields=["updated_at"], name="report_updated_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The live dashboard feed turns status changes into counter deltas.
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
 
     def __str__(self) -> str:
         return (
@@ -88,6 +225,61 @@ class GBVReport(models.Model):
         )
 
 
+class ArchivedReport(models.Model):
+    """
+    A resolved report moved out of the live table by ``manage.py archive_reports``.
+
+    Rows keep their original id, so report links still resolve, and are
+    grouped by submission year so each year's history can be scanned,
+    exported or dropped on its own.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    year = models.PositiveSmallIntegerField(help_text="Year the report was submitted")
+    type_of_violence = models.CharField(max_length=20, choices=ViolenceType.choices)
+    location = models.CharField(max_length=255)
+    county = models.ForeignKey(
+        County,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="archived_reports",
+    )
+    details = models.TextField()
+    incident_date = models.DateField(null=True, blank=True)
+    file_upload = models.FileField(upload_to="reports/%Y/%m/%d/", blank=True, null=True)
+    status = models.CharField(max_length=20, choices=ReportStatus.choices)
+    urgency = models.PositiveSmallIntegerField(default=0)
+    admin_notes = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    resolved_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Archived Report"
+        verbose_name_plural = "Archived Reports"
+        indexes = [
+            models.Index(fields=["year", "created_at"], name="archive_year_idx"),
+            models.Index(fields=["resolved_at"], name="archive_resolved_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Archived report #{self.id} ({self.year})"
+
+
+class ReportBand(models.Model):
+    """One LSH band bucket of a report's MinHash signature"""
+
+    report = models.ForeignKey(GBVReport, on_delete=models.CASCADE, related_name="lsh_bands")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "bucket"])]
+
+
 class Lawyer(models.Model):
     """Legal aid directory - lawyers and firms assisting GBV victims"""
 
@@ -100,21 +292,41 @@ class Lawyer(models.Model):
         help_text="WhatsApp number (optional)",
     )
     email = models.EmailField(blank=True, null=True, help_text="Email address")
-    county = models.CharField(max_length=100, help_text="County where services are provided")
+    county = models.ForeignKey(
+        County,
+        on_delete=models.PROTECT,
+        null=True,
+        related_name="lawyers",
+        help_text="County where services are provided",
+    )
     specialization = models.CharField(
         max_length=255,
         help_text="Specialization areas (e.g., GBV cases, family law, criminal law)",
     )
     address = models.TextField(blank=True, null=True, help_text="Physical address (optional)")
+    latitude = models.FloatField(null=True, blank=True, help_text="Leave blank to geocode from the county/address")
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, editable=False, db_index=True)
     is_active = models.BooleanField(default=True, help_text="Is this lawyer currently available?")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    directory_fields = ("id", "name", "phone", "whatsapp", "email", "specialization")
+
+    objects = ProviderQuerySet.as_manager()
+
     class Meta:
-        ordering = ["county", "name"]
+        ordering = ["county__name", "name"]
         verbose_name = "Lawyer"
         verbose_name_plural = "Lawyers"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # geo.geocode() looks the coordinates up again when the county or address changes.
+        instance._loaded_location = geo.location(instance)
+        return instance
+
     def __str__(self) -> str:
         return f"{self.name} - {self.county}"
 
@@ -131,12 +343,21 @@ class Therapist(models.Model):
     )
     phone = models.CharField(max_length=20, help_text="Phone number")
     email = models.EmailField(blank=True, null=True, help_text="Email address (optional)")
-    county = models.CharField(max_length=100, help_text="County where services are provided")
+    county = models.ForeignKey(
+        County,
+        on_delete=models.PROTECT,
+        null=True,
+        related_name="therapists",
+        help_text="County where services are provided",
+    )
     address = models.TextField(
         blank=True,
         null=True,
         help_text="Physical address or clinic name (optional)",
     )
+    latitude = models.FloatField(null=True, blank=True, help_text="Leave blank to geocode from the county/address")
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, editable=False, db_index=True)
     qualifications = models.CharField(
         max_length=255,
         blank=True,
@@ -147,11 +368,22 @@ class Therapist(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    directory_fields = ("id", "name", "specialty", "phone", "email")
+
+    objects = ProviderQuerySet.as_manager()
+
     class Meta:
-        ordering = ["county", "name"]
+        ordering = ["county__name", "name"]
         verbose_name = "Therapist"
         verbose_name_plural = "Therapists"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # geo.geocode() looks the coordinates up again when the county or address changes.
+        instance._loaded_location = geo.location(instance)
+        return instance
+
     def __str__(self) -> str:
         return f"{self.name} - {self.county}"
 
@@ -175,9 +407,24 @@ class ResourceArticle(models.Model):
         default="other",
     )
     is_published = models.BooleanField(default=True)
+
+    # Rendered on save by EveShieldApp.rendering
+    rendered_content = models.TextField(blank=True, editable=False)
+    excerpt = models.TextField(blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=1, editable=False, help_text="Minutes")
+
+    related_articles = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Precomputed related links (see EveShieldApp.related)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ResourceArticleQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Resource Article"
@@ -185,3 +432,106 @@ class ResourceArticle(models.Model):
 
     def __str__(self) -> str:
         return self.title
+
+
+class ArticleTerm(models.Model):
+    """
+    How many published articles use a term: the document frequencies of
+    the related-articles TF-IDF, kept current on every article save (see
+    EveShieldApp.related).
+    """
+
+    term = models.TextField(unique=True)
+    articles = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return self.term
+
+
+class ArticleVector(models.Model):
+    """
+    A published article's term counts and TF-IDF weights, stored so a save
+    tokenizes only the saved article (see EveShieldApp.related).
+    """
+
+    article = models.OneToOneField(ResourceArticle, on_delete=models.CASCADE, primary_key=True, related_name="tfidf")
+    terms = models.JSONField(default=dict)
+    weights = models.JSONField(default=dict)
+
+    def __str__(self) -> str:
+        return str(self.article)
+
+
+class RequestProfile(models.Model):
+    """
+    The sampled stacks of one request, recorded by the sampling profiler
+    middleware (see EveShieldApp.profiling).
+
+    ``stacks`` is in the collapsed format flamegraph.pl and speedscope
+    read: one ``frame;frame;...;frame microseconds`` line per distinct
+    stack, outermost frame first.
+    """
+
+    view_name = models.CharField(max_length=200, help_text="Namespaced URL name, e.g. eveshield:reports:admin_dashboard")
+    path = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    duration = models.FloatField(help_text="Milliseconds")
+    stacks = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["view_name", "-created_at"], name="profile_view_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.duration:.0f} ms)"
+
+
+class NotificationChannel(models.TextChoices):
+    EMAIL = "email", "Email"
+    SMS = "sms", "SMS"
+
+
+class NotificationStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+class Notification(models.Model):
+    """
+    A message telling a lawyer or counsellor about a new report, queued
+    when the report is submitted (see EveShieldApp.notify) and delivered
+    by ``manage.py send_notifications``.
+
+    Messages name the type of violence and the county only; the report
+    itself stays with staff.
+    """
+
+    report = models.ForeignKey(GBVReport, on_delete=models.CASCADE, related_name="notifications")
+    channel = models.CharField(max_length=10, choices=NotificationChannel.choices)
+    recipient = models.CharField(max_length=254, help_text="Email address or phone number")
+    recipient_name = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255, blank=True)
+    body = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        choices=NotificationStatus.choices,
+        default=NotificationStatus.QUEUED,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Serves the sender's poll for queued messages that are due.
+            models.Index(fields=["status", "next_attempt_at"], name="notification_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_channel_display()} to {self.recipient_name} about report #{self.report_id}"
@@ -0,0 +1,328 @@
+import asyncio
+import http.client
+import json
+import math
+import smtplib
+import sys
+from collections import Counter
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from EveShieldApp import models
+
+# How long a claimed batch is held before it may be claimed again, should the
+# sender die before recording the outcome.
+CLAIM_LEASE = timedelta(minutes=5)
+
+# Words in a lawyer's specialization or a counsellor's specialty that make
+# them a match for a report; GENERAL_TERMS match reports of any type.
+GENERAL_TERMS = ("gbv", "gender", "survivor", "domestic violence", "women")
+TERMS = {
+    models.ViolenceType.PHYSICAL: ("criminal", "protection order", "assault", "trauma"),
+    models.ViolenceType.SEXUAL: ("criminal", "sexual", "trauma", "ptsd"),
+    models.ViolenceType.EMOTIONAL: ("family", "trauma", "anxiety", "depression"),
+    models.ViolenceType.ECONOMIC: ("family law", "property", "legal aid"),
+    models.ViolenceType.DIGITAL: ("cyber", "digital", "online"),
+}
+
+# Provider model, field describing the work they take on.
+PROVIDERS = ((models.Lawyer, "specialization"), (models.Therapist, "specialty"))
+
+
+def matching_providers(report):
+    """Active lawyers and counsellors in the report's county whose work covers its type of violence"""
+    terms = GENERAL_TERMS + TERMS.get(report.type_of_violence, ())
+    for model, field in PROVIDERS:
+        covers = reduce(or_, (Q(**{f"{field}__icontains": term}) for term in terms))
+        yield from (
+            model.objects.filter(covers, is_active=True, county_id=report.county_id)
+            .only("id", "name", "phone", "email")
+            .order_by("name")[: settings.NOTIFY_MAX_RECIPIENTS]
+        )
+
+
+def compose(report):
+    """Subject and text of the message about ``report``, which leaves out everything the reporter wrote"""
+    if report.type_of_violence == models.ViolenceType.OTHER:
+        kind = "gender-based violence"
+    else:
+        kind = report.get_type_of_violence_display().lower()
+    county = report.county.name
+    return (
+        f"New report in {county} County",
+        f"EveShield has received a new report of {kind} in {county} County (reference #{report.id}). "
+        "Our staff may contact you to arrange support for the survivor. Please do not reply to this message.",
+    )
+
+
+def queue_report(report):
+    """
+    Queue a message about a new report to every matching provider: by
+    email where they have an address, otherwise by SMS.
+
+    Nothing is sent here, so submitting a report never waits on a mail
+    server or SMS gateway. Reports without a county match nobody. Returns
+    the queued Notifications.
+    """
+    if report.county_id is None:
+        return []
+    subject, body = compose(report)
+    notifications = []
+    recipients = set()
+    for provider in matching_providers(report):
+        if provider.email:
+            channel, recipient = models.NotificationChannel.EMAIL, provider.email
+        elif provider.phone:
+            channel, recipient = models.NotificationChannel.SMS, provider.phone
+        else:
+            continue
+        if recipient in recipients:
+            continue
+        recipients.add(recipient)
+        notifications.append(
+            models.Notification(
+                report=report,
+                channel=channel,
+                recipient=recipient,
+                recipient_name=provider.name,
+                subject=subject,
+                body=body,
+            )
+        )
+    return models.Notification.objects.bulk_create(notifications)
+
+
+class ConsoleSMSBackend:
+    """Writes messages to stdout instead of sending them, like Django's console email backend"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        for to, text in messages:
+            self.stream.write(f"SMS to {to}: {text}\n")
+        self.stream.flush()
+        return [None] * len(messages)
+
+
+# Messages "sent" through LocmemSMSBackend, as (to, text) pairs.
+outbox = []
+
+
+class LocmemSMSBackend(ConsoleSMSBackend):
+    """Keeps messages in ``notify.outbox``, for tests"""
+
+    def send_messages(self, messages):
+        outbox.extend(messages)
+        return [None] * len(messages)
+
+
+class HTTPSMSBackend:
+    """
+    Posts messages in batches to the SMS gateway at SMS_GATEWAY_URL over
+    one kept-alive connection.
+
+    The request body is ``{"messages": [{"to": ..., "text": ...}, ...]}``
+    and the gateway answers with a ``results`` list holding, per message,
+    ``null`` if it was accepted or ``{"error": ...}`` if not.
+    ``manage.py sms_gateway_stub`` speaks the same protocol.
+    """
+
+    def __init__(self, url=None, token=None, timeout=10):
+        parts = urlsplit(url or settings.SMS_GATEWAY_URL)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.netloc
+        self.path = parts.path or "/"
+        self.token = settings.SMS_GATEWAY_TOKEN if token is None else token
+        self.timeout = timeout
+        self.connection = None
+
+    def open(self):
+        if self.connection is None:
+            self.connection = self.connection_class(self.host, timeout=self.timeout)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def send_messages(self, messages):
+        """One error message, or None, per (to, text) pair; raises if the gateway could not be reached"""
+        self.open()
+        body = json.dumps({"messages": [{"to": to, "text": text} for to, text in messages]})
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            self.connection.request("POST", self.path, body, headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.status != 200:
+            raise http.client.HTTPException(f"SMS gateway answered {response.status}")
+        return [result and result.get("error") for result in json.loads(payload)["results"]]
+
+
+def get_sms_backend():
+    return import_string(settings.SMS_BACKEND)()
+
+
+def describe(error):
+    return f"{type(error).__name__}: {error}"
+
+
+def send_email(connection, batch):
+    errors = []
+    for notification in batch:
+        message = EmailMessage(
+            notification.subject,
+            notification.body,
+            settings.NOTIFY_FROM_EMAIL,
+            [notification.recipient],
+            connection=connection,
+        )
+        try:
+            # Opened here: send_messages() closes a connection it had to open
+            # itself once it is done, which would cost a handshake per message.
+            connection.open()
+            connection.send_messages([message])
+        except smtplib.SMTPRecipientsRefused as error:
+            # smtplib resets the session, so the connection stays usable.
+            errors.append(describe(error))
+        except (smtplib.SMTPException, OSError) as error:
+            errors.append(describe(error))
+            connection.close()
+        else:
+            errors.append(None)
+    return errors
+
+
+def send_sms(backend, batch):
+    try:
+        return backend.send_messages([(notification.recipient, notification.body) for notification in batch])
+    except (OSError, http.client.HTTPException, ValueError, KeyError) as error:
+        # The gateway could not be reached or made no sense: retry the batch.
+        return [describe(error)] * len(batch)
+
+
+# Channel: (connection factory, function sending a batch over a connection).
+CHANNELS = {
+    models.NotificationChannel.EMAIL: (get_connection, send_email),
+    models.NotificationChannel.SMS: (get_sms_backend, send_sms),
+}
+
+
+def claim(batch_size):
+    """Up to ``batch_size`` due notifications, held for this sender for CLAIM_LEASE"""
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            models.Notification.objects.select_for_update(skip_locked=True)
+            .filter(status=models.NotificationStatus.QUEUED, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        models.Notification.objects.filter(id__in=[notification.id for notification in batch]).update(
+            next_attempt_at=now + CLAIM_LEASE
+        )
+    return batch
+
+
+def record(batch, errors):
+    """
+    Mark the sent notifications and reschedule the failed ones, waiting
+    NOTIFY_RETRY_DELAY seconds and twice as long after each further
+    failure, until NOTIFY_MAX_ATTEMPTS. Returns a Counter of outcomes.
+    """
+    now = timezone.now()
+    outcomes = Counter()
+    for notification, error in zip(batch, errors):
+        notification.attempts += 1
+        notification.last_error = error or ""
+        if error is None:
+            notification.status = models.NotificationStatus.SENT
+            notification.sent_at = now
+            outcomes["sent"] += 1
+        elif notification.attempts >= settings.NOTIFY_MAX_ATTEMPTS:
+            notification.status = models.NotificationStatus.FAILED
+            outcomes["failed"] += 1
+        else:
+            delay = settings.NOTIFY_RETRY_DELAY * 2 ** (notification.attempts - 1)
+            notification.next_attempt_at = now + timedelta(seconds=delay)
+            outcomes["retrying"] += 1
+    models.Notification.objects.bulk_update(batch, ["status", "attempts", "last_error", "sent_at", "next_attempt_at"])
+    return outcomes
+
+
+async def sender(queue, connect, send, outcomes):
+    """Send the batches put on ``queue`` over one connection until it yields None"""
+    connection = connect()
+    try:
+        while (batch := await queue.get()) is not None:
+            errors = await asyncio.to_thread(send, connection, batch)
+            outcomes.update(await sync_to_async(record)(batch, errors))
+    finally:
+        await asyncio.to_thread(connection.close)
+
+
+async def dispatch(queues, batch_size, senders):
+    """Claim due notifications and split each batch between the senders' queues, then stop the senders"""
+    while batch := await sync_to_async(claim)(batch_size):
+        for channel, queue in queues.items():
+            pending = [notification for notification in batch if notification.channel == channel]
+            size = math.ceil(len(pending) / senders)
+            for start in range(0, len(pending), size or 1):
+                await queue.put(pending[start : start + size])
+    for queue in queues.values():
+        for _ in range(senders):
+            await queue.put(None)
+
+
+async def deliver(batch_size=None, senders=None):
+    """
+    Send every notification that is due and return a Counter of outcomes:
+    ``sent``, ``retrying`` and ``failed``.
+
+    Each channel gets a pool of ``senders`` tasks, each keeping its own
+    SMTP connection or SMS gateway session open from batch to batch and
+    sending in a worker thread. Notifications are claimed ``batch_size``
+    at a time and a claimed batch is split between a channel's senders;
+    the next batch is claimed while that one is being sent. If any task
+    fails the others are cancelled and the error is raised.
+    """
+    batch_size = batch_size or settings.NOTIFY_BATCH_SIZE
+    senders = senders or settings.NOTIFY_SENDERS
+    queues = {channel: asyncio.Queue(senders) for channel in CHANNELS}
+    outcomes = Counter()
+    tasks = [
+        asyncio.create_task(sender(queues[channel], connect, send, outcomes))
+        for channel, (connect, send) in CHANNELS.items()
+        for _ in range(senders)
+    ]
+    tasks.append(asyncio.create_task(dispatch(queues, batch_size, senders)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # Without this, dispatch() would wait forever on the queue of a
+        # channel whose senders have died.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return outcomes
@@ -0,0 +1,165 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from asgiref.current_thread_executor import CurrentThreadExecutor
+from asgiref.sync import SyncToAsync
+from django.conf import settings
+
+from EveShieldApp import models
+
+# sync_to_async runs its function under this frame in the worker thread.
+THREAD_HANDLER = SyncToAsync.thread_handler.__code__
+# A sync_to_async worker that calls back into async code waits for the event
+# loop in here; that time is sampled on the loop instead.
+RUN_UNTIL_FUTURE = CurrentThreadExecutor.run_until_future.__code__
+
+_labels = {}
+
+
+def label(code):
+    """``module:qualname`` for a code object, e.g. ``django.db.models.query:QuerySet.__iter__``"""
+    try:
+        return _labels[code]
+    except KeyError:
+        pass
+    filename = code.co_filename
+    for root in sorted((path for path in sys.path if path), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1 :].removesuffix(".py").replace(os.sep, ".")
+            break
+    # co_qualname is new in Python 3.11; earlier versions only have the bare name.
+    name = getattr(code, "co_qualname", code.co_name)
+    # ";" separates frames and the last space the count in the collapsed format.
+    result = _labels[code] = f"{filename}:{name}".replace(";", ",").replace(" ", "_")
+    return result
+
+
+class Sampler:
+    """
+    Sample one request's Python stacks from a background thread.
+
+    Every ``interval`` seconds the stacks of the request's threads are
+    read with ``sys._current_frames()``, cut down to the part below
+    ``marker`` and counted, each weighted by the microseconds since the
+    previous sample. ``marker`` is the profiling middleware's own frame:
+    on an event loop shared by many requests only stacks running through
+    it belong to this one. Threads passed to ``follow``, the request's
+    sync_to_async worker under ASGI, are counted while they run
+    sync_to_async work, except while that work waits on the event loop.
+
+    While the request's thread runs Python code it only hands the GIL over
+    every switch interval (``sys.getswitchinterval()``, 5 ms by default),
+    so samples can be further apart than ``interval``. The process-wide
+    switch interval is left alone; the weights keep the totals right.
+    """
+
+    def __init__(self, marker, interval):
+        self.marker = marker
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.followed = set()
+        self.counts = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="request-sampler", daemon=True)
+
+    def follow(self, thread_id):
+        self.followed.add(thread_id)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def stop(self):
+        self.duration = (time.perf_counter() - self.started) * 1000
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        last = self.started
+        while not self.stopped.wait(self.interval):
+            frames = sys._current_frames()
+            if self.stopped.is_set():
+                break
+            now = time.perf_counter()
+            weight = round((now - last) * 1_000_000)
+            last = now
+            stack = self.stack(frames.get(self.thread_id), self.marker)
+            if stack:
+                self.counts[stack] += weight
+            for thread_id in self.followed:
+                stack = self.stack(frames.get(thread_id), THREAD_HANDLER)
+                if stack and not (len(stack) > 1 and stack[-2] is RUN_UNTIL_FUTURE):
+                    self.counts[stack] += weight
+
+    @staticmethod
+    def stack(frame, root):
+        """Code objects from ``root`` (a frame or a code object) down to ``frame``, or None if it is not on the stack"""
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            if frame is root or frame.f_code is root:
+                codes.reverse()
+                return tuple(codes)
+            frame = frame.f_back
+        return None
+
+    def collapsed(self):
+        """The samples in the collapsed stack format flamegraph.pl and speedscope read"""
+        return "\n".join(
+            f"{';'.join(label(code) for code in stack)} {weight}" for stack, weight in self.counts.most_common()
+        )
+
+
+def parse(stacks):
+    for line in stacks.splitlines():
+        frames, _, weight = line.rpartition(" ")
+        yield frames, int(weight)
+
+
+def merge(profiles):
+    """One collapsed stack text with the samples of several profiles added up"""
+    counts = Counter()
+    for profile in profiles:
+        for frames, weight in parse(profile):
+            counts[frames] += weight
+    return "\n".join(f"{frames} {weight}" for frames, weight in counts.most_common())
+
+
+def top_functions(profiles):
+    """
+    Self and total sampled microseconds per function across ``profiles``.
+
+    Self time is spent in the function itself, the last frame of a
+    stack; total time includes what it called. Returns two Counters.
+    """
+    self_time, total_time = Counter(), Counter()
+    for profile in profiles:
+        for frames, weight in parse(profile):
+            frames = frames.split(";")
+            self_time[frames[-1]] += weight
+            for name in set(frames):
+                total_time[name] += weight
+    return self_time, total_time
+
+
+def record(request, response, sampler):
+    """Store a sampled request's profile and drop the oldest beyond PROFILING_KEEP for its view"""
+    match = request.resolver_match
+    if match is None or not sampler.counts:
+        return None
+    profile = models.RequestProfile.objects.create(
+        view_name=match.view_name,
+        path=request.path[:255],
+        method=request.method,
+        status_code=response.status_code,
+        duration=sampler.duration,
+        stacks=sampler.collapsed(),
+    )
+    stale = models.RequestProfile.objects.filter(view_name=match.view_name).values_list("id", flat=True)[
+        settings.PROFILING_KEEP :
+    ]
+    models.RequestProfile.objects.filter(id__in=list(stale)).delete()
+    return profile
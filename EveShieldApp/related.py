@@ -0,0 +1,228 @@
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.html import strip_tags
+
+from EveShieldApp import models
+
+RELATED_LIMIT = 3
+
+# Added to the TF-IDF cosine so same-category articles win close calls.
+CATEGORY_BONUS = 0.2
+
+# Title words describe the article better than body words.
+TITLE_WEIGHT = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """
+    a about after all also an and any are as at be been before but by can could do does for from
+    had has have how if in into is it its may more most must no not of on or other our out over
+    should so some such than that the their them then there these they this those through to
+    under up was we were what when where which while who will with would you your
+    """.split()
+)
+
+
+def tokenize(text):
+    return [
+        token
+        for token in TOKEN_RE.findall(strip_tags(text).lower())
+        if len(token) > 2 and token not in STOPWORDS
+    ]
+
+
+def term_counts(article):
+    counts = Counter(tokenize(article["content"]))
+    for token in tokenize(article["title"]):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+
+def weigh(terms, document_frequency, total):
+    """The L2-normalised TF-IDF vector of one article's term counts"""
+    vector = {
+        term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+        for term, count in terms.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+def similarity(article, other, vectors):
+    vector, other_vector = vectors[article["id"]], vectors[other["id"]]
+    if len(other_vector) < len(vector):
+        vector, other_vector = other_vector, vector
+    score = sum(weight * other_vector.get(term, 0.0) for term, weight in vector.items())
+    if article["category"] == other["category"]:
+        score += CATEGORY_BONUS
+    return round(score, 4)
+
+
+def entry(article, score):
+    return {"id": article["id"], "slug": article["slug"], "title": article["title"], "score": score}
+
+
+def rank(article, corpus, vectors):
+    """Top related entries for one article, best first"""
+    scored = [
+        entry(other, similarity(article, other, vectors))
+        for other in corpus
+        if other["id"] != article["id"]
+    ]
+    scored = [item for item in scored if item["score"] > 0]
+    scored.sort(key=lambda item: (-item["score"], item["id"]))
+    return scored[:RELATED_LIMIT]
+
+
+def load_corpus():
+    return list(
+        models.ResourceArticle.objects.filter(is_published=True).values(
+            "id", "slug", "title", "content", "category", "related_articles"
+        )
+    )
+
+
+def load_index():
+    """Published articles with their stored TF-IDF weights, leaving the bodies in the database"""
+    return list(
+        models.ResourceArticle.objects.filter(is_published=True).values(
+            "id", "slug", "title", "category", "related_articles", weights=F("tfidf__weights")
+        )
+    )
+
+
+def save_related(updates):
+    for article_id, related in updates.items():
+        models.ResourceArticle.objects.filter(id=article_id).update(related_articles=related)
+
+
+def count_documents(added=(), removed=()):
+    """Apply one article's change of vocabulary to the ArticleTerm document frequencies"""
+    terms = models.ArticleTerm.objects
+    if removed:
+        terms.filter(term__in=removed).update(articles=F("articles") - 1)
+        terms.filter(term__in=removed, articles=0).delete()
+    if added:
+        terms.filter(term__in=added).update(articles=F("articles") + 1)
+        known = set(terms.filter(term__in=added).values_list("term", flat=True))
+        terms.bulk_create([models.ArticleTerm(term=term, articles=1) for term in added if term not in known])
+
+
+@transaction.atomic
+def rebuild_all():
+    """Recompute the related-articles index, stored vectors and document frequencies included, from scratch"""
+    corpus = load_corpus()
+    counts = {article["id"]: term_counts(article) for article in corpus}
+    document_frequency = Counter()
+    for terms in counts.values():
+        document_frequency.update(terms.keys())
+    vectors = {article_id: weigh(terms, document_frequency, len(corpus)) for article_id, terms in counts.items()}
+
+    save_related({article["id"]: rank(article, corpus, vectors) for article in corpus})
+    models.ResourceArticle.objects.filter(is_published=False).exclude(related_articles=[]).update(
+        related_articles=[]
+    )
+    models.ArticleVector.objects.all().delete()
+    models.ArticleVector.objects.bulk_create(
+        models.ArticleVector(article_id=article_id, terms=terms, weights=vectors[article_id])
+        for article_id, terms in counts.items()
+    )
+    models.ArticleTerm.objects.all().delete()
+    models.ArticleTerm.objects.bulk_create(
+        models.ArticleTerm(term=term, articles=articles) for term, articles in document_frequency.items()
+    )
+    return len(corpus)
+
+
+def forget_article(article_id):
+    """Take an article about to be deleted out of the document frequencies, before its ArticleVector goes"""
+    terms = models.ArticleVector.objects.filter(article_id=article_id).values_list("terms", flat=True).first()
+    count_documents(removed=list(terms or ()))
+
+
+@transaction.atomic
+def refresh_article(article_id):
+    """
+    Incrementally update the index after one article was saved or deleted.
+
+    Only the changed article is tokenized: its term counts are compared
+    with those in its ArticleVector to move the ArticleTerm document
+    frequencies, and its weights are computed against them. Other articles
+    keep the weights stored when they were last indexed.
+
+    The changed article gets a fresh ranking; every other list is only
+    rewritten when the change moves the article into, out of, or within it.
+    Stored weights and the scores of untouched lists drift slightly as IDF
+    shifts, which ``manage.py rebuild_related_articles`` corrects.
+    """
+    if not models.ArticleTerm.objects.exists():
+        # Nothing indexed yet (a new install, or articles from before the
+        # term counts were stored): build it all once.
+        rebuild_all()
+        return
+
+    row = (
+        models.ResourceArticle.objects.filter(id=article_id)
+        .values("title", "content", "is_published", stored=F("tfidf__terms"))
+        .first()
+    )
+    # A deleted article left the document frequencies in forget_article().
+    stored = (row and row["stored"]) or {}
+    terms = term_counts(row) if row and row["is_published"] else Counter()
+    count_documents(
+        added=[term for term in terms if term not in stored],
+        removed=[term for term in stored if term not in terms],
+    )
+
+    corpus = load_index()
+    vectors = {article["id"]: article["weights"] or {} for article in corpus}
+    changed = next((article for article in corpus if article["id"] == article_id), None)
+
+    updates = {}
+    if changed is not None:
+        document_frequency = Counter(
+            dict(models.ArticleTerm.objects.filter(term__in=list(terms)).values_list("term", "articles"))
+        )
+        vectors[article_id] = weigh(terms, document_frequency, len(corpus))
+        models.ArticleVector.objects.update_or_create(
+            article_id=article_id, defaults={"terms": terms, "weights": vectors[article_id]}
+        )
+        updates[article_id] = rank(changed, corpus, vectors)
+    elif row:
+        models.ResourceArticle.objects.filter(id=article_id).update(related_articles=[])
+        models.ArticleVector.objects.filter(article_id=article_id).delete()
+
+    for other in corpus:
+        if other["id"] == article_id:
+            continue
+        current = other["related_articles"] or []
+        previous = next((item for item in current if item["id"] == article_id), None)
+        if changed is None:
+            if previous is not None:
+                updates[other["id"]] = rank(other, corpus, vectors)
+            continue
+
+        score = similarity(other, changed, vectors)
+        if previous is not None:
+            if score <= 0 or (score < previous["score"] and len(current) == RELATED_LIMIT):
+                # An unlisted article may now outrank it.
+                updates[other["id"]] = rank(other, corpus, vectors)
+                continue
+            candidates = [item for item in current if item["id"] != article_id]
+            candidates.append(entry(changed, score))
+        elif score > 0 and (
+            len(current) < RELATED_LIMIT or score > min(item["score"] for item in current)
+        ):
+            candidates = current + [entry(changed, score)]
+        else:
+            continue
+        candidates.sort(key=lambda item: (-item["score"], item["id"]))
+        if candidates[:RELATED_LIMIT] != current:
+            updates[other["id"]] = candidates[:RELATED_LIMIT]
+
+    save_related(updates)
@@ -0,0 +1,129 @@
+import math
+import re
+from html import escape, unescape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.utils.html import linebreaks, strip_tags
+from django.utils.text import Truncator
+
+WORDS_PER_MINUTE = 200
+EXCERPT_WORDS = 25
+
+ALLOWED_TAGS = frozenset(
+    """
+    a b blockquote br code em h2 h3 h4 h5 h6 hr i li ol p pre span strong
+    table tbody td th thead tr u ul
+    """.split()
+)
+VOID_TAGS = frozenset(["br", "hr"])
+BLOCK_TAGS = frozenset(["blockquote", "h2", "h3", "h4", "h5", "h6", "ol", "p", "pre", "table", "ul"])
+ALLOWED_ATTRIBUTES = {"a": frozenset(["href", "title"])}
+ALLOWED_SCHEMES = frozenset(["", "http", "https", "mailto", "tel"])
+
+# Browsers drop control characters and spaces around a URL, and tabs and
+# newlines anywhere in it, before reading its scheme.
+URL_PADDING = "".join(map(chr, range(0x21)))
+URL_IGNORED = dict.fromkeys(map(ord, "\t\n\r"))
+
+# Elements whose text must never reach the page.
+DROPPED_CONTENT_TAGS = frozenset(["script", "style", "iframe", "object", "template"])
+
+BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+
+class ArticleSanitizer(HTMLParser):
+    """Whitelist sanitizer that also balances unclosed tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self.dropping = 0
+        self.has_blocks = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+        rendered = "".join(
+            f' {name}="{escape(value, quote=True)}"'
+            for name, value in attrs
+            if name in allowed and value is not None and self.safe_value(name, value)
+        )
+        if tag == "a":
+            rendered += ' rel="noopener nofollow"'
+        self.output.append(f"<{tag}{rendered}>")
+        self.has_blocks = self.has_blocks or tag in BLOCK_TAGS
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        while self.open_tags:
+            current = self.open_tags.pop()
+            self.output.append(f"</{current}>")
+            if current == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.output.append(escape(data, quote=False))
+
+    @staticmethod
+    def safe_value(name, value):
+        if name != "href":
+            return True
+        try:
+            scheme = urlsplit(value.strip(URL_PADDING).translate(URL_IGNORED)).scheme
+        except ValueError:
+            # Malformed, e.g. an unclosed IPv6 host.
+            return False
+        return scheme.lower() in ALLOWED_SCHEMES
+
+    def result(self):
+        self.close()
+        while self.open_tags:
+            self.output.append(f"</{self.open_tags.pop()}>")
+        return "".join(self.output)
+
+
+def sanitize_html(content):
+    """Sanitize article HTML; plain-text articles get paragraphs and line breaks"""
+    sanitizer = ArticleSanitizer()
+    sanitizer.feed(BOLD_RE.sub(r"<strong>\1</strong>", content or ""))
+    html = sanitizer.result()
+    if not sanitizer.has_blocks:
+        html = linebreaks(html.strip())
+    return html
+
+
+def render_content(content):
+    """Rendered body plus list-page metadata for a piece of article content"""
+    html = sanitize_html(content)
+    text = " ".join(unescape(strip_tags(html)).split())
+    word_count = len(text.split())
+    return {
+        "rendered_content": html,
+        "excerpt": Truncator(text).words(EXCERPT_WORDS),
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+    }
+
+
+def render_article(article):
+    for field, value in render_content(article.content).items():
+        setattr(article, field, value)
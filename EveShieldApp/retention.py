@@ -0,0 +1,123 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from EveShieldApp import models
+
+PURGE_BATCH_SIZE = 200
+
+# Evidence is written to disk before its report row commits, so files younger
+# than this are never treated as orphans.
+ORPHAN_GRACE_PERIOD = timedelta(hours=1)
+
+# Prefix of the GBVReport/ArchivedReport ``file_upload`` upload_to.
+EVIDENCE_DIR = "reports"
+
+
+def retention_cutoff(days=None):
+    if days is None:
+        days = settings.REPORT_RETENTION_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def expired(model, cutoff):
+    """Reports in ``model`` (live or archived) resolved before ``cutoff``"""
+    return model.objects.filter(status=models.ReportStatus.RESOLVED, resolved_at__lt=cutoff)
+
+
+def delete_files(names):
+    for name in names:
+        default_storage.delete(name)
+
+
+def purge_batch(model, cutoff, batch_size=PURGE_BATCH_SIZE):
+    """
+    Delete up to ``batch_size`` expired reports and then their evidence files.
+
+    The transaction only covers the row delete, so it holds the write lock
+    briefly; it takes it up front (see the DATABASES transaction_mode). Files are removed after the commit; if that step is interrupted,
+    the files are picked up later as orphans. Returns the number of reports
+    deleted.
+    """
+    with transaction.atomic():
+        rows = list(expired(model, cutoff).order_by("id").values_list("id", "file_upload")[:batch_size])
+        if not rows:
+            return 0
+        model.objects.filter(id__in=[report_id for report_id, _ in rows]).delete()
+    delete_files(name for _, name in rows if name)
+    return len(rows)
+
+
+def purge(cutoff, batch_size=PURGE_BATCH_SIZE, pause=0.0):
+    """Purge expired reports from the live and archive tables, ``pause`` seconds between batches"""
+    deleted = {}
+    for model in (models.GBVReport, models.ArchivedReport):
+        deleted[model] = 0
+        while moved := purge_batch(model, cutoff, batch_size):
+            deleted[model] += moved
+            time.sleep(pause)
+    return deleted
+
+
+def referenced_files():
+    """
+    Evidence files any live or archived report points to.
+
+    Both tables are read in one statement, so a report that
+    archive.archive_batch moves meanwhile is seen in one of them, never in
+    neither.
+    """
+    live, archived = (
+        model.objects.exclude(file_upload="").exclude(file_upload=None).order_by().values_list("file_upload", flat=True)
+        for model in (models.GBVReport, models.ArchivedReport)
+    )
+    return set(live.union(archived, all=True))
+
+
+def evidence_dirs():
+    """The dated ``reports/<year>/<month>/<day>`` upload directories, as storage names"""
+    root = default_storage.path(EVIDENCE_DIR)
+    if not os.path.isdir(root):
+        return []
+    return [
+        os.path.relpath(os.path.join(dirpath, name), default_storage.location).replace(os.sep, "/")
+        for dirpath, dirnames, _ in os.walk(root)
+        for name in dirnames
+        if os.path.relpath(os.path.join(dirpath, name), root).count(os.sep) == 2
+    ]
+
+
+def scan_dir(directory, referenced, before):
+    """Files in one upload directory not referenced by any report, as ``(name, size)``"""
+    orphans = []
+    with os.scandir(default_storage.path(directory)) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            name = f"{directory}/{entry.name}"
+            stat = entry.stat()
+            if name not in referenced and stat.st_mtime < before:
+                orphans.append((name, stat.st_size))
+    return orphans
+
+
+def orphaned_files(workers=8):
+    """
+    Evidence files no live or archived report points to, as ``(name, size)``.
+
+    The day directories are scanned in parallel; on a large upload tree the
+    walk is bound by filesystem latency rather than CPU.
+    """
+    before = time.time() - ORPHAN_GRACE_PERIOD.total_seconds()
+    # Read the references after the cutoff time, so any file old enough to be
+    # considered already had its row committed.
+    referenced = referenced_files()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        found = pool.map(lambda directory: scan_dir(directory, referenced, before), evidence_dirs())
+        return [orphan for orphans in found for orphan in orphans]
@@ -0,0 +1,113 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from EveShieldApp import dedup, geo, live, models, notify, related, rendering, triage
+
+
+@receiver(pre_save, sender=models.ResourceArticle)
+def render_article(sender, instance, raw=False, **kwargs):
+    """Sanitize the article body and compute its excerpt and reading time"""
+    if raw:
+        return
+    rendering.render_article(instance)
+
+
+@receiver(post_save, sender=models.ResourceArticle)
+@receiver(post_delete, sender=models.ResourceArticle)
+def refresh_related_articles(sender, instance, raw=False, **kwargs):
+    """Keep the related-articles index current when an article changes"""
+    if raw:
+        return
+    related.refresh_article(instance.id)
+
+
+@receiver(pre_delete, sender=models.ResourceArticle)
+def forget_article_terms(sender, instance, **kwargs):
+    """Drop a deleted article's terms from the related-articles document frequencies"""
+    related.forget_article(instance.id)
+
+
+@receiver(pre_save, sender=models.GBVReport)
+def match_report_county(sender, instance, raw=False, **kwargs):
+    """Link the report to a County parsed from its free-text location"""
+    if raw or instance.county_id is not None:
+        return
+    instance.county = models.County.objects.resolve(instance.location)
+
+
+@receiver(pre_save, sender=models.GBVReport)
+def score_report(sender, instance, raw=False, **kwargs):
+    """Recompute the triage urgency score"""
+    if raw:
+        return
+    instance.urgency = triage.urgency_score(instance)
+
+
+@receiver(pre_save, sender=models.GBVReport)
+def stamp_resolution(sender, instance, raw=False, **kwargs):
+    """Record when the report was resolved, which starts its archival clock"""
+    if raw:
+        return
+    if instance.status != models.ReportStatus.RESOLVED:
+        instance.resolved_at = None
+    elif instance.resolved_at is None:
+        instance.resolved_at = timezone.now()
+
+
+@receiver(pre_save, sender=models.GBVReport)
+def sign_report(sender, instance, raw=False, **kwargs):
+    """Recompute the MinHash signature of the report details"""
+    if raw:
+        return
+    instance._minhash_changed = dedup.sign_report(instance)
+
+
+@receiver(post_save, sender=models.GBVReport)
+def index_report(sender, instance, raw=False, **kwargs):
+    """Refresh the report's LSH bands when its signature changed"""
+    if raw or not getattr(instance, "_minhash_changed", False):
+        return
+    dedup.index_reports({instance.id: instance.minhash})
+    instance._minhash_changed = False
+
+
+@receiver(post_save, sender=models.GBVReport)
+def publish_report(sender, instance, created, raw=False, **kwargs):
+    """Push the saved report to the admin dashboards following the live feed"""
+    if raw:
+        return
+    live.publish_report(instance, created)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=models.GBVReport)
+def queue_notifications(sender, instance, created, raw=False, **kwargs):
+    """Queue messages to the lawyers and counsellors who can help with a new report"""
+    if created and not raw:
+        notify.queue_report(instance)
+
+
+@receiver(pre_save, sender=models.Lawyer)
+@receiver(pre_save, sender=models.Therapist)
+def geocode_provider(sender, instance, raw=False, **kwargs):
+    """Keep provider coordinates and the geohash proximity index current"""
+    if raw:
+        return
+    geo.geocode(instance)
+
+
+@receiver(post_save, sender=User)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """Every user gets a profile when the account is created"""
+    if created and not raw:
+        # accounts.register_user passes the signup form's profile fields along.
+        models.UserProfile.objects.create(user=instance, **getattr(instance, "_profile_fields", {}))
+
+
+@receiver(post_save, sender=models.UserProfile)
+@receiver(post_delete, sender=models.UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    cache.delete(models.UserProfile.objects.cache_key(instance.user_id))
@@ -0,0 +1,57 @@
+import functools
+import os
+
+from django.template import engines
+from django.template.defaultfilters import date as date_filter
+from django.templatetags.static import static
+from django.urls import get_script_prefix, reverse
+from django.utils.timezone import template_localtime
+
+
+@functools.lru_cache(maxsize=1024)
+def cached_reverse(script_prefix, viewname, args):
+    return reverse(viewname, args=args)
+
+
+def url(viewname, *args):
+    """
+    ``reverse(viewname, args=args)``, memoised.
+
+    A page reverses a couple of dozen URLs, almost all the same on every
+    request, and each ``reverse()`` costs several thread-local lookups.
+    The URLconf is fixed and has no translated patterns, so the script
+    prefix is all a result depends on besides its arguments.
+    """
+    return cached_reverse(get_script_prefix(), viewname, args)
+
+
+def date(value, arg=None):
+    """The Django ``date`` filter, in local time as Django templates show datetimes"""
+    return date_filter(template_localtime(value), arg)
+
+
+def environment(**options):
+    """Jinja2 environment with the ``static``, ``url`` and ``date`` helpers the Django templates use"""
+    from jinja2 import Environment
+
+    env = Environment(**options)
+    env.globals.update(static=static, url=url)
+    env.filters["date"] = date
+    return env
+
+
+def template_names(engine):
+    for directory in engine.template_dirs:
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                yield os.path.relpath(os.path.join(root, name), directory).replace(os.sep, "/")
+
+
+def precompile():
+    """Compile every template of every engine into its cache; returns how many were compiled"""
+    compiled = 0
+    for engine in engines.all():
+        for name in template_names(engine):
+            engine.get_template(name)
+            compiled += 1
+    return compiled
@@ -1,3 +1,1484 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from html import escape
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import aauthenticate, authenticate
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.timezone import now as timezone_now
+
+from EveShieldApp import (
+    api,
+    archive,
+    backup,
+    decorators,
+    dedup,
+    evidence,
+    geo,
+    hashers,
+    live,
+    minhash,
+    models,
+    notify,
+    profiling,
+    related,
+    rendering,
+    retention,
+    throttling,
+    triage,
+)
+from EveShieldApp.forms import UserRegistrationForm
+from EveShieldApp.views.chatbots import MENTAL_HEALTH_RESPONSES, get_chatbot_response
+
+
+# Pages render without a collectstatic manifest.
+PLAIN_STATIC = {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}
+
+
+class ByteRangeTests(SimpleTestCase):
+    def test_closed_range(self):
+        self.assertEqual(evidence.byte_range("bytes=0-99", 1000), (0, 100))
+
+    def test_open_range(self):
+        self.assertEqual(evidence.byte_range("bytes=900-", 1000), (900, 1000))
+
+    def test_suffix_range(self):
+        self.assertEqual(evidence.byte_range("bytes=-10", 1000), (990, 1000))
+        self.assertEqual(evidence.byte_range("bytes=-5000", 1000), (0, 1000))
+
+    def test_end_past_the_file_is_clamped(self):
+        self.assertEqual(evidence.byte_range("bytes=990-5000", 1000), (990, 1000))
+
+    def test_unsatisfiable(self):
+        for header in ("bytes=1000-", "bytes=5000-6000", "bytes=-0"):
+            with self.subTest(header=header):
+                start, stop = evidence.byte_range(header, 1000)
+                self.assertGreaterEqual(start, stop)
+
+    def test_ignored_headers_send_the_whole_file(self):
+        for header in (None, "", "bytes=5-1", "bytes=0-1,5-6", "items=0-5", "bytes=-"):
+            with self.subTest(header=header):
+                self.assertIsNone(evidence.byte_range(header, 1000))
+
+
+class EvidenceViewTests(TestCase):
+    # More than one BLOCK_SIZE, so streamed responses take several reads.
+    data = bytes(range(256)) * 1024
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root, EVIDENCE_SENDFILE=None)
+        cls.media_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_settings.disable()
+        shutil.rmtree(cls.media_root)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.report = models.GBVReport(type_of_violence="physical", location="Nairobi", details="Evidence attached")
+        self.report.file_upload.save("clip.mp4", ContentFile(self.data), save=True)
+        self.url = reverse("eveshield:reports:report_evidence", args=[self.report.id])
+        self.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+
+    def test_anonymous_and_non_staff_users_are_refused(self):
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        self.client.force_login(User.objects.create_user("member", password="pw"))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(response.streaming)
+
+    def test_media_is_not_served_publicly(self):
+        self.assertEqual(self.client.get(f"/media/{self.report.file_upload.name}").status_code, 404)
+
+    def test_whole_file(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.data)
+        self.assertEqual(response["Content-Length"], str(len(self.data)))
+        self.assertEqual(response["Content-Type"], "video/mp4")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("no-store", response["Cache-Control"])
+
+    def test_ranges(self):
+        self.client.force_login(self.staff)
+        size = len(self.data)
+        for header, start, stop in (
+            ("bytes=0-99", 0, 100),
+            ("bytes=1000-", 1000, size),
+            ("bytes=-10", size - 10, size),
+        ):
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_RANGE=header, HTTP_ACCEPT_ENCODING="br")
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response["Content-Range"], f"bytes {start}-{stop - 1}/{size}")
+                self.assertEqual(response["Content-Length"], str(stop - start))
+                self.assertEqual(b"".join(response.streaming_content), self.data[start:stop])
+
+    def test_unsatisfiable_range(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.data)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.data)}")
+
+    def test_stale_if_range_sends_the_whole_file(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE="Mon, 01 Jan 2001 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+
+    def test_active_content_is_downloaded(self):
+        self.report.file_upload.save("page.html", ContentFile(b"<script>alert(1)</script>"), save=True)
+        self.client.force_login(self.staff)
+        self.assertTrue(self.client.get(self.url)["Content-Disposition"].startswith("attachment;"))
+
+    @override_settings(EVIDENCE_SENDFILE="X-Accel-Redirect", EVIDENCE_ACCEL_PREFIX="/protected-media/")
+    def test_accel_redirect_handoff(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.report.file_upload.name}")
+        self.assertEqual(response.content, b"")
+
+    async def test_asgi_streams_in_blocks(self):
+        await self.async_client.aforce_login(self.staff)
+        response = await self.async_client.get(self.url, headers={"Range": "bytes=0-"})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= evidence.BLOCK_SIZE for chunk in chunks))
+        self.assertEqual(b"".join(chunks), self.data)
+
+
+class ThrottlingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_wait_time(self):
+        # Room left in the current window.
+        self.assertEqual(throttling.wait_time(0, 3, 5, 3600, 10), 0)
+        # Current window full: wait for it to end and for its share to slide out.
+        self.assertAlmostEqual(throttling.wait_time(0, 5, 5, 3600, 600), 3000 + 0.2 * 3600)
+        # Half of a full previous window still overlaps.
+        self.assertAlmostEqual(throttling.wait_time(10, 0, 5, 60, 30), 30 * 0.2)
+
+    def test_client_ip_without_trusted_proxies_ignores_forwarded_for(self):
+        request = self.factory.post("/", REMOTE_ADDR="203.0.113.5", HTTP_X_FORWARDED_FOR="198.51.100.1")
+        self.assertEqual(throttling.client_ip(request), "203.0.113.5")
+
+    @override_settings(TRUSTED_PROXIES=["127.0.0.1", "10.0.0.0/8"])
+    def test_client_ip_behind_trusted_proxies(self):
+        request = self.factory.post(
+            "/", REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="1.2.3.4, 198.51.100.7, 10.1.2.3"
+        )
+        # The client may prepend anything; the right-most untrusted hop is the one a proxy saw.
+        self.assertEqual(throttling.client_ip(request), "198.51.100.7")
+
+    @override_settings(THROTTLE_RATES={"report": ("5/hour", None)})
+    def test_clients_behind_a_proxy_get_their_own_limit(self):
+        with self.settings(TRUSTED_PROXIES=["127.0.0.1"]):
+            for client in ("198.51.100.1", "198.51.100.2"):
+                request = self.factory.post("/", REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR=client)
+                allowed = [throttling.consume(request, "report") == 0 for _ in range(6)]
+                self.assertEqual(allowed, [True] * 5 + [False])
+
+    @override_settings(THROTTLE_RATES={"report": ("5/hour", None)})
+    def test_concurrent_requests_cannot_exceed_the_limit(self):
+        request = self.factory.post("/", REMOTE_ADDR="203.0.113.9")
+        with ThreadPoolExecutor(16) as pool:
+            waits = list(pool.map(lambda _: throttling.consume(request, "report"), range(40)))
+        self.assertEqual(waits.count(0), 5)
+
+    @override_settings(THROTTLE_RATES={"report": ("2/minute", None)})
+    async def test_async_consume(self):
+        request = self.factory.post("/", REMOTE_ADDR="203.0.113.10")
+        waits = [await throttling.aconsume(request, "report") for _ in range(3)]
+        self.assertEqual(waits[:2], [0, 0])
+        self.assertGreater(waits[2], 0)
+
+    def test_refusals_by_a_busy_route_leave_the_client_quota_alone(self):
+        first = self.factory.post("/", REMOTE_ADDR="203.0.113.11")
+        second = self.factory.post("/", REMOTE_ADDR="203.0.113.12")
+        with self.settings(THROTTLE_RATES={"report": ("3/hour", "2/hour")}):
+            self.assertEqual([throttling.consume(first, "report") for _ in range(2)], [0, 0])
+            self.assertTrue(all(throttling.consume(second, "report") for _ in range(5)))
+        with self.settings(THROTTLE_RATES={"report": ("3/hour", None)}):
+            allowed = [throttling.consume(second, "report") == 0 for _ in range(4)]
+        self.assertEqual(allowed, [True, True, True, False])
+
+    async def test_async_refusals_by_a_busy_route_leave_the_client_quota_alone(self):
+        first = self.factory.post("/", REMOTE_ADDR="203.0.113.13")
+        second = self.factory.post("/", REMOTE_ADDR="203.0.113.14")
+        with self.settings(THROTTLE_RATES={"report": ("3/hour", "1/hour")}):
+            self.assertEqual(await throttling.aconsume(first, "report"), 0)
+            self.assertGreater(await throttling.aconsume(second, "report"), 0)
+            self.assertGreater(await throttling.aconsume(second, "report"), 0)
+        with self.settings(THROTTLE_RATES={"report": ("3/hour", None)}):
+            allowed = [await throttling.aconsume(second, "report") == 0 for _ in range(4)]
+        self.assertEqual(allowed, [True, True, True, False])
+
+
+@override_settings(
+    STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC},
+    THROTTLE_RATES={"report": ("5/hour", "20/minute")},
+)
+class FloodTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_a_flood_of_reports_stops_at_the_route_limit_without_writes(self):
+        data = {"type_of_violence": "physical", "location": "Nairobi", "details": "Flood"}
+        statuses = []
+        for client in range(100):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    reverse("eveshield:reports:submit_report"), data, REMOTE_ADDR=f"198.51.100.{client}"
+                )
+            statuses.append(response.status_code)
+            if response.status_code == 429:
+                # Refused before the form is saved: the SQLite writer never sees the flood.
+                self.assertFalse([query for query in queries if not query["sql"].startswith("SELECT")])
+                self.assertContains(response, "1195", status_code=429)
+        self.assertEqual((statuses.count(302), statuses.count(429)), (20, 80))
+        self.assertEqual(models.GBVReport.objects.count(), 20)
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("member", password="pw")
+        self.nairobi = models.County.objects.get(name="Nairobi")
+
+    def test_per_process_cache_is_not_used(self):
+        # Another worker's stale copy must not win over the database.
+        stale = models.UserProfile.objects.get(user=self.user)
+        cache.set(models.UserProfile.objects.cache_key(self.user.pk), stale)
+        models.UserProfile.objects.filter(user=self.user).update(county=self.nairobi)
+        self.assertEqual(models.UserProfile.objects.for_user(self.user).county, self.nairobi)
+
+    def test_sessions_are_not_cached_in_a_per_process_cache(self):
+        self.assertFalse(settings.SHARED_CACHE)
+        self.assertEqual(settings.SESSION_ENGINE, "django.contrib.sessions.backends.db")
+
+    @override_settings(SHARED_CACHE=True)
+    def test_shared_cache_is_read_through(self):
+        profile = models.UserProfile.objects.for_user(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(models.UserProfile.objects.for_user(self.user).pk, profile.pk)
+        profile.county = self.nairobi
+        profile.save()
+        self.assertEqual(models.UserProfile.objects.for_user(self.user).county, self.nairobi)
+
+
+@override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class CompressionTests(TestCase):
+    # Public pages and the share of their bytes brotli must save at least.
+    routes = {
+        "/": 0.6,
+        "/lawyers/": 0.6,
+        "/mental-health/": 0.6,
+        "/resources/": 0.6,
+        "/resources/emergency-contacts/": 0.6,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        nairobi = models.County.objects.get(name="Nairobi")
+        for i in range(12):
+            models.Lawyer.objects.create(
+                name=f"Lawyer {i}", phone="+254700000000", county=nairobi, specialization="GBV cases, Family Law"
+            )
+            models.Therapist.objects.create(
+                name=f"Counsellor {i}", phone="+254700000000", county=nairobi, specialty="Trauma counselling"
+            )
+
+    def test_bytes_saved_per_route(self):
+        for path, saving in self.routes.items():
+            with self.subTest(path=path):
+                plain = self.client.get(path)
+                compressed = self.client.get(path, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+                self.assertEqual(compressed["Content-Encoding"], "br")
+                self.assertLessEqual(len(compressed.content), len(plain.content) * (1 - saving))
+
+    def test_pages_with_a_csrf_token_get_padded_gzip(self):
+        lengths = set()
+        for _ in range(5):
+            response = self.client.get("/reports/submit/", HTTP_ACCEPT_ENCODING="gzip, br")
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            lengths.add(len(response.content))
+        # The random padding varies the length an attacker would measure.
+        self.assertGreater(len(lengths), 1)
+
+    def test_signed_in_pages_are_not_brotli_compressed(self):
+        self.client.force_login(User.objects.create_user("staff", password="pw", is_staff=True))
+        response = self.client.get("/reports/admin/dashboard/?search=abc", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+
+def selected_columns(queries, model):
+    """
+    What the query loading ``model`` rows selects: its own columns by name,
+    joined columns as ``table.column`` and annotations by alias.
+    """
+    table = model._meta.db_table
+    sql = next(query["sql"] for query in queries if query["sql"].startswith(f'SELECT "{table}".'))
+    columns = set()
+    # Split on the commas between columns, not those inside SUBSTR(...).
+    for item in re.split(r",\s(?![^()]*\))", sql[len("SELECT ") : sql.index(" FROM ")]):
+        alias = re.search(r' AS "(\w+)"$', item)
+        columns.add(alias[1] if alias else item.replace('"', "").removeprefix(f"{table}."))
+    return columns
+
+
+@override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class ListColumnTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        nairobi = models.County.objects.get(name="Nairobi")
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        models.GBVReport.objects.create(
+            type_of_violence="physical", location="Nairobi", details="x" * 5000, admin_notes="y" * 5000
+        )
+        models.Lawyer.objects.create(
+            name="Wanjiru Legal", phone="+254700000000", county=nairobi, address="z" * 500, specialization="GBV"
+        )
+        models.Therapist.objects.create(name="Amani Care", phone="+254700000001", county=nairobi, address="z" * 500)
+        models.ResourceArticle.objects.create(title="Your rights", slug="rights", content="w" * 5000, is_published=True)
+
+    def setUp(self):
+        # Directory pages are cached whole; the rows must come from the database.
+        cache.clear()
+
+    def columns(self, path, model):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(path).status_code, 200)
+        return selected_columns(queries, model)
+
+    def test_dashboard(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(
+            self.columns("/reports/admin/dashboard/", models.GBVReport),
+            {"id", "type_of_violence", "location", "status", "urgency", "created_at", "updated_at", "details_excerpt"},
+        )
+
+    def test_resource_list(self):
+        self.assertEqual(
+            self.columns("/resources/", models.ResourceArticle),
+            {"id", "title", "slug", "category", "excerpt", "created_at"},
+        )
+
+    def test_directories(self):
+        county = {"county_id", "EveShieldApp_county.id", "EveShieldApp_county.name", "address_line"}
+        self.assertEqual(
+            self.columns("/lawyers/", models.Lawyer),
+            {"id", "name", "phone", "whatsapp", "email", "specialization"} | county,
+        )
+        self.assertEqual(
+            self.columns("/mental-health/", models.Therapist), {"id", "name", "specialty", "phone", "email"} | county
+        )
+
+    def test_api_selects_the_requested_fields(self):
+        self.assertEqual(
+            self.columns("/api/v1/lawyers/?fields=name,county", models.Lawyer),
+            {"id", "name", "county__name", "is_active"},
+        )
+
+
+class BackupTests(SimpleTestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.database = self.root / "site.sqlite3"
+        connection = sqlite3.connect(self.database)
+        connection.execute("PRAGMA journal_mode=wal")
+        connection.execute("CREATE TABLE report (id INTEGER PRIMARY KEY, details TEXT)")
+        # About 8 MB, so the copy takes a few hundred steps.
+        connection.executemany("INSERT INTO report (details) VALUES (?)", [("x" * 2000,)] * 4000)
+        connection.commit()
+        connection.close()
+
+    def count(self, path):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM report").fetchone()[0]
+        finally:
+            connection.close()
+
+    def test_writers_are_not_blocked_by_a_backup(self):
+        writes, refused = [], []
+
+        def submit_between_steps(seconds):
+            # No busy timeout: the write fails at once if the copy holds a lock it needs.
+            writer = sqlite3.connect(self.database, timeout=0)
+            try:
+                writer.execute("INSERT INTO report (details) VALUES (?)", ("y" * 2000,))
+                writer.commit()
+                writes.append(seconds)
+            except sqlite3.OperationalError as error:
+                refused.append(str(error))
+            finally:
+                writer.close()
+
+        with mock.patch.object(backup, "time", mock.Mock(sleep=submit_between_steps)):
+            backup.copy_database(self.database, self.root / "copy.sqlite3", pages=16, pause=0)
+
+        self.assertEqual(refused, [])
+        # About 8 MB in 4 KB pages, 16 at a time.
+        self.assertGreater(len(writes), 100)
+        self.assertEqual(self.count(self.database), 4000 + len(writes))
+        # The copy is the database as of the start of the backup.
+        self.assertEqual(self.count(self.root / "copy.sqlite3"), 4000)
+
+    def test_identical_media_is_stored_once(self):
+        media = self.root / "media"
+        (media / "reports").mkdir(parents=True)
+        (media / "reports" / "clip.mp4").write_bytes(b"evidence")
+        (media / "reports" / "clip-again.mp4").write_bytes(b"evidence")
+        (media / "reports" / "photo.jpg").write_bytes(b"other evidence")
+        backups = self.root / "backups"
+        with mock.patch.object(backup, "database_path", return_value=str(self.database)), self.settings(
+            MEDIA_ROOT=media
+        ):
+            first, manifest = backup.create_snapshot(backups, pause=0)
+            self.assertEqual(manifest["media_copied"], 2)
+            self.assertEqual(
+                manifest["media"]["reports/clip.mp4"]["sha256"], manifest["media"]["reports/clip-again.mp4"]["sha256"]
+            )
+
+            # Unchanged files are not copied again, a copy of stored content neither.
+            (media / "reports" / "clip-copy.mp4").write_bytes(b"evidence")
+            second, manifest = backup.create_snapshot(backups, pause=0)
+            self.assertEqual(manifest["media_copied"], 0)
+            self.assertEqual(len(manifest["media"]), 4)
+
+            (media / "reports" / "photo.jpg").write_bytes(b"edited evidence")
+            third, manifest = backup.create_snapshot(backups, pause=0)
+            self.assertEqual(manifest["media_copied"], 1)
+
+        self.assertEqual(len([path for path in (backups / backup.OBJECTS_DIR).rglob("*") if path.is_file()]), 3)
+        self.assertEqual(backup.snapshots(backups), [first, second, third])
+        for snapshot in (first, second, third):
+            self.assertEqual(backup.verify_snapshot(snapshot), [])
+
+
+# Boot a server module in a fresh interpreter, as a server process would,
+# and report what it left loaded; with ``path``, after serving that request.
+BOOT_PROBE = """
+import gc, importlib, io, json, os, sys
+os.environ["DJANGO_SETTINGS_MODULE"] = "EveShieldProject.settings"
+from django.conf import settings
+settings.PRECOMPILE_TEMPLATES = True
+module = importlib.import_module(sys.argv[1])
+from django.template import engines
+from EveShieldApp import templating, validators
+django_engine, *other_engines = engines.all()
+state = {
+    "gc_enabled": gc.isenabled(),
+    "gc_frozen": gc.get_freeze_count(),
+    "password_lists": validators.load_password_list.cache_info().currsize,
+    "templates": sum(1 for engine in engines.all() for _ in templating.template_names(engine)),
+    "compiled": len(django_engine.engine.template_loaders[0].get_template_cache)
+    + sum(len(engine.env.cache) for engine in other_engines),
+    "booted": sorted(sys.modules),
+}
+if len(sys.argv) > 2:
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": sys.argv[2], "QUERY_STRING": "", "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80", "HTTP_HOST": "localhost", "wsgi.input": io.BytesIO(), "wsgi.url_scheme": "http",
+    }
+    statuses = []
+    b"".join(module.application(environ, lambda status, headers, *args: statuses.append(status)))
+    state.update(status=statuses[0], served=sorted(sys.modules))
+print(json.dumps(state))
+"""
+
+
+class ColdStartTests(SimpleTestCase):
+    def boot(self, module, *path):
+        result = subprocess.run(
+            [sys.executable, "-c", BOOT_PROBE, module, *path],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(result.stdout)
+
+    def app_modules(self, modules, prefix="EveShieldApp.views"):
+        return [module for module in modules if module == prefix or module.startswith(prefix + ".")]
+
+    def test_boot_loads_everything_up_front(self):
+        for module in ("EveShieldProject.wsgi", "EveShieldProject.asgi"):
+            with self.subTest(module=module):
+                state = self.boot(module)
+                self.assertTrue(state["gc_enabled"])
+                # Django alone leaves tens of thousands of objects behind.
+                self.assertGreater(state["gc_frozen"], 10000)
+                self.assertEqual(state["password_lists"], 1)
+                self.assertEqual(state["compiled"], state["templates"])
+                # LazyView imports no view, and so nothing only views need.
+                for prefix in ("EveShieldApp.views", "EveShieldApp.forms", "EveShieldApp.api", "EveShieldApp.backup"):
+                    self.assertEqual(self.app_modules(state["booted"], prefix), [])
+
+    def test_a_request_imports_only_its_view(self):
+        state = self.boot("EveShieldProject.wsgi", "/chatbot/legal/")
+        self.assertEqual(state["status"], "200 OK")
+        self.assertEqual(
+            self.app_modules(state["served"]),
+            ["EveShieldApp.views", "EveShieldApp.views.chatbots", "EveShieldApp.views.common"],
+        )
+
+
+class GeocodeTests(TestCase):
+    def setUp(self):
+        self.nairobi = models.County.objects.get(name="Nairobi")
+        self.mombasa = models.County.objects.get(name="Mombasa")
+        models.Lawyer.objects.create(name="Wanjiru Legal", phone="+254700000000", county=self.nairobi)
+        # Loaded from the database, as the admin would edit it.
+        self.lawyer = models.Lawyer.objects.get()
+
+    def assertAt(self, lawyer, lat, lon):
+        lawyer.refresh_from_db()
+        self.assertEqual((lawyer.latitude, lawyer.longitude), (lat, lon))
+        self.assertEqual(lawyer.geohash, geo.encode_geohash(lat, lon))
+
+    def test_county_change_moves_the_coordinates(self):
+        self.assertAt(self.lawyer, self.nairobi.latitude, self.nairobi.longitude)
+        self.lawyer.county_id = self.mombasa.id
+        self.lawyer.save()
+        self.assertAt(self.lawyer, self.mombasa.latitude, self.mombasa.longitude)
+
+    def test_address_change_moves_the_coordinates(self):
+        self.lawyer.address = "Moi Avenue, Naivasha"
+        self.lawyer.save()
+        self.assertAt(self.lawyer, -0.7167, 36.4333)
+        # And again on the same instance, against what the last save stored.
+        self.lawyer.address = "Kenyatta Avenue"
+        self.lawyer.save()
+        self.assertAt(self.lawyer, self.nairobi.latitude, self.nairobi.longitude)
+
+    def test_coordinates_edited_with_the_address_are_kept(self):
+        self.lawyer.address = "Moi Avenue, Naivasha"
+        self.lawyer.latitude, self.lawyer.longitude = -0.72, 36.43
+        self.lawyer.save()
+        self.assertAt(self.lawyer, -0.72, 36.43)
+
+    def test_other_edits_keep_the_coordinates(self):
+        models.Lawyer.objects.filter(id=self.lawyer.id).update(latitude=-1.3, longitude=36.8)
+        lawyer = models.Lawyer.objects.get()
+        lawyer.phone = "+254711111111"
+        lawyer.save()
+        self.assertAt(lawyer, -1.3, 36.8)
+
+
+@override_settings(SMS_BACKEND="EveShieldApp.notify.LocmemSMSBackend", NOTIFY_SENDERS=2)
+class DeliveryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        nairobi = models.County.objects.get(name="Nairobi")
+        for i in range(3):
+            models.Lawyer.objects.create(
+                name=f"Lawyer {i}",
+                phone="+254700000000",
+                email=f"lawyer{i}@example.com",
+                county=nairobi,
+                specialization="GBV cases",
+            )
+        models.Therapist.objects.create(name="Amani Care", phone="+254700000001", county=nairobi, specialty="Trauma")
+        models.GBVReport.objects.create(type_of_violence="physical", location="Nairobi", county=nairobi, details="x")
+
+    def setUp(self):
+        notify.outbox.clear()
+
+    async def test_deliver(self):
+        outcomes = await notify.deliver(batch_size=2)
+        self.assertEqual(outcomes, {"sent": 4})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual([to for to, _ in notify.outbox], ["+254700000001"])
+
+    async def test_a_failing_sender_stops_delivery(self):
+        with mock.patch.object(notify, "record", side_effect=RuntimeError("database gone")):
+            # The claiming task would otherwise wait forever for the dead senders.
+            with self.assertRaisesMessage(RuntimeError, "database gone"):
+                await asyncio.wait_for(notify.deliver(batch_size=1, senders=1), 5)
+
+
+@override_settings(LIVE_POLL_INTERVAL=0.01, STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class LiveFeedTests(TestCase):
+    def create(self, publish=True, **fields):
+        """A new report; ``publish=False`` stands in for a save by another process, which only polls see"""
+        fields = {"type_of_violence": "physical", "location": "Nairobi", "details": "x", **fields}
+        with self.captureOnCommitCallbacks(execute=publish):
+            return models.GBVReport.objects.create(**fields)
+
+    def save(self, report):
+        with self.captureOnCommitCallbacks(execute=True):
+            report.save()
+
+    async def events(self, feed, pings=2):
+        """(event, data) of the feed's messages up to ``pings`` polls in a row that found nothing new"""
+        events, quiet = [], 0
+        while quiet < pings:
+            text = await asyncio.wait_for(anext(feed), 5)
+            if text.startswith(": ping"):
+                quiet += 1
+                continue
+            quiet = 0
+            fields = dict(line.split(": ", 1) for line in text.strip().splitlines())
+            if "event" in fields:
+                events.append((fields["event"], json.loads(fields["data"])))
+        return events
+
+    def report_ids(self, events):
+        return [data["id"] for name, data in events if name == "report"]
+
+    async def test_a_committed_save_reaches_a_subscriber_once(self):
+        async with aclosing(live.feed(timezone_now())) as feed:
+            self.assertEqual(await anext(feed), f"retry: {live.RETRY_MS}\n\n")
+
+            pushed = await sync_to_async(self.create)()
+            polled = await sync_to_async(self.create)(publish=False)
+            events = await self.events(feed)
+            self.assertCountEqual(self.report_ids(events), [pushed.id, polled.id])
+            self.assertIn("counts", [name for name, _ in events])
+            html = events[self.report_ids(events).index(pushed.id)][1]["html"]
+            self.assertIn(f'data-report-id="{pushed.id}"', html)
+
+            # Saved again: sent again, once.
+            pushed.details = "more"
+            await sync_to_async(self.save)(pushed)
+            self.assertEqual(self.report_ids(await self.events(feed)), [pushed.id])
+
+    @override_settings(LIVE_QUEUE_SIZE=2)
+    async def test_a_full_queue_drops_events_and_the_next_poll_catches_up(self):
+        async with aclosing(live.feed(timezone_now())) as feed:
+            await anext(feed)
+            reports = [await sync_to_async(self.create)(publish=False) for _ in range(5)]
+            for report in reports:
+                live.hub.publish(await sync_to_async(live.report_event)(report, True))
+            await asyncio.sleep(0)
+            ((_, queue),) = live.hub.subscribers
+            self.assertEqual(queue.qsize(), 2)
+            self.assertCountEqual(self.report_ids(await self.events(feed)), [report.id for report in reports])
+
+    async def test_disconnecting_unsubscribes(self):
+        feed = live.feed(timezone_now())
+        await anext(feed)
+        self.assertEqual(len(live.hub.subscribers), 1)
+        await feed.aclose()
+        self.assertEqual(live.hub.subscribers, set())
+
+    def test_a_closed_event_loop_is_unsubscribed(self):
+        hub = live.Hub()
+
+        async def subscribe():
+            return hub.subscribe()
+
+        asyncio.run(subscribe())
+        hub.publish(("delta", {"total": 1}))
+        self.assertEqual(hub.subscribers, set())
+
+    def test_counter_deltas(self):
+        published = []
+        with (
+            mock.patch.object(live.hub, "subscribers", {"a dashboard"}),
+            mock.patch.object(live.hub, "publish", side_effect=published.append),
+        ):
+
+            def deltas(report):
+                published.clear()
+                self.save(report)
+                return [data for name, data in published if name == "delta"]
+
+            report = models.GBVReport(type_of_violence="physical", location="Nairobi", details="x")
+            self.assertEqual(deltas(report), [{"total": 1, "pending": 1}])
+            report.status = models.ReportStatus.REVIEWED
+            self.assertEqual(deltas(report), [{"pending": -1, "reviewed": 1}])
+            report.admin_notes = "Called back"
+            self.assertEqual(deltas(report), [])
+
+            # Loaded fresh: compared with the status it was read with.
+            report = models.GBVReport.objects.get(id=report.id)
+            report.status = models.ReportStatus.RESOLVED
+            self.assertEqual(deltas(report), [{"reviewed": -1}])
+            report.status = models.ReportStatus.IN_PROGRESS
+            self.assertEqual(deltas(report), [])
+            self.assertEqual([name for name, _ in published], ["report"])
+
+        # Nothing is published before the save commits.
+        with mock.patch.object(live.hub, "subscribers", {"a dashboard"}):
+            with mock.patch.object(live.hub, "publish") as publish, self.captureOnCommitCallbacks() as callbacks:
+                models.GBVReport.objects.create(type_of_violence="physical", location="Nairobi", details="x")
+                publish.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+
+
+class LegacyScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """The tuned hasher as it was with a lower cost"""
+
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR // 4
+
+
+class PasswordHashingTests(TestCase):
+    password = "tall-acacia-river-7"
+
+    def user(self, encoded=None, **fields):
+        user = User.objects.create_user("wanjiru", **fields)
+        user.password = encoded or make_password(self.password)
+        user.save()
+        return user
+
+    def stored_hash(self):
+        return User.objects.values_list("password", flat=True).get(username="wanjiru")
+
+    async def test_async_login_hashes_on_the_pool(self):
+        await sync_to_async(self.user)()
+        threads = []
+        verify = hashers.hashers.verify_password
+
+        def record_thread(*args):
+            threads.append(threading.current_thread().name)
+            return verify(*args)
+
+        with mock.patch.object(hashers.hashers, "verify_password", side_effect=record_thread):
+            user = await aauthenticate(username="wanjiru", password=self.password)
+        self.assertEqual(user.username, "wanjiru")
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("password-hash"))
+
+        self.assertIsNone(await aauthenticate(username="wanjiru", password="wrong"))
+        self.assertIsNone(await aauthenticate(username="wanjiru"))
+
+    async def test_unknown_usernames_still_hash_once(self):
+        with mock.patch("EveShieldApp.backends.run_hasher", wraps=hashers.run_hasher) as run_hasher:
+            self.assertIsNone(await aauthenticate(username="nobody", password=self.password))
+        run_hasher.assert_called_once_with(make_password, self.password)
+
+    async def test_inactive_users_cannot_log_in(self):
+        await sync_to_async(self.user)(is_active=False)
+        self.assertIsNone(await aauthenticate(username="wanjiru", password=self.password))
+
+    def test_new_passwords_use_tuned_scrypt(self):
+        self.user()
+        hasher = identify_hasher(self.stored_hash())
+        self.assertIsInstance(hasher, hashers.ScryptPasswordHasher)
+        self.assertEqual(hasher.decode(self.stored_hash())["work_factor"], settings.PASSWORD_SCRYPT_WORK_FACTOR)
+
+    async def test_async_login_upgrades_old_hashes(self):
+        legacy = [
+            make_password(self.password, hasher="pbkdf2_sha1"),
+            make_password(self.password, hasher="pbkdf2_sha256"),
+            LegacyScryptPasswordHasher().encode(self.password, "legacysalt1234"),
+        ]
+        for encoded in legacy:
+            with self.subTest(hasher=encoded.split("$")[0]):
+                await User.objects.all().adelete()
+                await sync_to_async(self.user)(encoded)
+                self.assertIsNone(await aauthenticate(username="wanjiru", password="wrong"))
+                self.assertEqual(await sync_to_async(self.stored_hash)(), encoded)
+
+                self.assertIsNotNone(await aauthenticate(username="wanjiru", password=self.password))
+                upgraded = await sync_to_async(self.stored_hash)()
+                self.assertTrue(upgraded.startswith("scrypt$"))
+                self.assertEqual(
+                    identify_hasher(upgraded).decode(upgraded)["work_factor"], settings.PASSWORD_SCRYPT_WORK_FACTOR
+                )
+                self.assertIsNotNone(await aauthenticate(username="wanjiru", password=self.password))
+                self.assertEqual(await sync_to_async(self.stored_hash)(), upgraded)
+
+    def test_sync_login_upgrades_old_hashes(self):
+        self.user(make_password(self.password, hasher="pbkdf2_sha256"))
+        self.assertIsNotNone(authenticate(username="wanjiru", password=self.password))
+        self.assertTrue(self.stored_hash().startswith("scrypt$"))
+
+    def test_make_passwords(self):
+        encoded = hashers.make_passwords([self.password, None])
+        self.assertTrue(hashers.hashers.check_password(self.password, encoded[0]))
+        self.assertFalse(hashers.hashers.is_password_usable(encoded[1]))
+
+
+class ProfileLabelTests(SimpleTestCase):
+    def test_label(self):
+        label = profiling.label(profiling.Sampler.__init__.__code__)
+        # The class is only in the label where the interpreter records it (3.11+).
+        self.assertIn(label, ("EveShieldApp.profiling:Sampler.__init__", "EveShieldApp.profiling:__init__"))
+        self.assertNotIn(";", profiling.label((lambda: None).__code__))
+
+
+def busy_work(deadline):
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+class SamplerTests(SimpleTestCase):
+    def profile(self, seconds):
+        sampler = profiling.Sampler(sys._getframe(), 0.001)
+        sampler.start()
+        try:
+            busy_work(time.perf_counter() + seconds)
+        finally:
+            sampler.stop()
+        return sampler
+
+    def test_overlapping_samplers_leave_the_switch_interval_alone(self):
+        switch_interval = sys.getswitchinterval()
+        with ThreadPoolExecutor(4) as pool:
+            samplers = list(pool.map(self.profile, [0.05, 0.1, 0.15, 0.2]))
+        self.assertEqual(sys.getswitchinterval(), switch_interval)
+        for sampler in samplers:
+            self.assertIn("busy_work", sampler.collapsed())
+
+
+class DeployVersionTests(SimpleTestCase):
+    def version_after_touching(self, path):
+        stat = path.stat()
+        self.addCleanup(os.utime, path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        decorators._deploy_version = None
+        before = decorators.deploy_version()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        decorators._deploy_version = None
+        self.addCleanup(setattr, decorators, "_deploy_version", None)
+        return before, decorators.deploy_version()
+
+    def test_django_templates_change_the_version(self):
+        before, after = self.version_after_touching(Path(settings.BASE_DIR, "EveShieldApp/Templates/shared/base.html"))
+        self.assertNotEqual(before, after)
+
+    @skipUnless(settings.JINJA2_TEMPLATES, "Jinja2 is not installed")
+    def test_jinja2_templates_change_the_version(self):
+        before, after = self.version_after_touching(Path(settings.BASE_DIR, "EveShieldApp/jinja2/shared/base.jinja"))
+        self.assertNotEqual(before, after)
+
+
+@override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class DirectorySyncTests(TestCase):
+    url = "/api/v1/lawyers/"
+
+    def setUp(self):
+        self.nairobi = models.County.objects.get(name="Nairobi")
+        self.lawyer = models.Lawyer.objects.create(name="Wanjiru Legal", phone="+254700000000", county=self.nairobi)
+
+    def poll(self, since, **headers):
+        return self.client.get(self.url, {"since": since}, **headers)
+
+    def test_late_commits_are_sent_on_the_next_poll(self):
+        version = self.client.get(self.url).json()["version"]
+        # Saved just before the version the client holds, but committed after it polled.
+        late = models.Lawyer.objects.create(name="Late Commit", phone="+254700000001", county=self.nairobi)
+        models.Lawyer.objects.filter(id=late.id).update(
+            updated_at=self.lawyer.updated_at - api.SYNC_OVERLAP + timedelta(milliseconds=100)
+        )
+        self.assertIn(late.id, [row["id"] for row in self.poll(version).json()["results"]])
+
+    def test_snapshot_deltas_overlap_too(self):
+        version = self.client.get("/api/directory/snapshot/").json()["version"]
+        models.Lawyer.objects.filter(id=self.lawyer.id).update(
+            updated_at=self.lawyer.updated_at - timedelta(seconds=1), is_active=False
+        )
+        delta = self.client.get("/api/directory/snapshot/", {"since": version}).json()
+        self.assertEqual([(row["id"], row["is_active"]) for row in delta["lawyers"]], [(self.lawyer.id, False)])
+
+    def test_deactivation_is_a_tombstone(self):
+        version = self.client.get(self.url).json()["version"]
+        self.lawyer.is_active = False
+        self.lawyer.save()
+        delta = self.poll(version).json()
+        self.assertEqual((delta["results"], delta["tombstones"]), ([], [self.lawyer.id]))
+
+    def test_admin_cannot_delete_providers(self):
+        self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+        for model in ("lawyer", "therapist"):
+            with self.subTest(model=model):
+                response = self.client.get(reverse(f"admin:EveShieldApp_{model}_changelist"))
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, 'value="delete_selected"')
+        self.assertEqual(self.client.get(f"/admin/EveShieldApp/lawyer/{self.lawyer.id}/delete/").status_code, 403)
+
+    def test_compressed_polls_revalidate_with_the_weakened_etag(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        again = self.client.get(self.url, HTTP_ACCEPT_ENCODING="br", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+
+class VendorAssetsTests(SimpleTestCase):
+    def test_vendored_files_match_their_pins(self):
+        call_command("vendor_assets", check=True, stdout=StringIO())
+
+
+@override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class PageWeightTests(TestCase):
+    def test_key_pages_are_within_their_transfer_budget(self):
+        stdout = StringIO()
+        call_command("page_weight", stdout=stdout)
+        self.assertIn("Every page is within budget", stdout.getvalue())
+
+
+@override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class ServiceWorkerTests(TestCase):
+    def test_every_precached_asset_exists(self):
+        script = self.client.get("/sw.js").content.decode()
+        assets = re.findall(rf"'{settings.STATIC_URL}([^']+)'", script)
+        self.assertIn("vendor/bootstrap/css/bootstrap.min.css", assets)
+        for asset in assets:
+            with self.subTest(asset=asset):
+                self.assertIsNotNone(finders.find(asset))
+
+    def test_install_stores_the_directory_snapshot_and_only_signed_out_pages(self):
+        script = self.client.get("/sw.js").content.decode()
+        install = script[script.index("addEventListener('install'") : script.index("addEventListener('activate'")]
+        self.assertIn("PRECACHE_URLS.map(anonymous)", install)
+        self.assertIn("syncSnapshot()", install)
+        snapshot_url = re.search(r"const SNAPSHOT_URL = '([^']+)'", script).group(1)
+        self.assertTrue(self.client.get(snapshot_url).json()["full"])
+        # Every page, snapshot and delta the worker stores is fetched without cookies.
+        self.assertEqual(re.findall(r"fetch\((\w+)\(", script), ["anonymous", "anonymous"])
+        for path in re.findall(r"'(/[\w-]+/)': \{ key:", script):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 200)
+
+
+class RelatedArticleTests(TestCase):
+    def setUp(self):
+        topics = ["protection order court", "protection order police", "counselling trauma support", "court fees"]
+        self.articles = [
+            models.ResourceArticle.objects.create(title=topic, slug=f"article-{index}", content=f"{topic} " * 20)
+            for index, topic in enumerate(topics)
+        ]
+
+    def document_frequencies(self):
+        return dict(models.ArticleTerm.objects.values_list("term", "articles"))
+
+    def test_a_save_tokenizes_only_the_saved_article(self):
+        article = self.articles[0]
+        article.content = "protection order court hearing " * 20
+        with mock.patch.object(related, "tokenize", wraps=related.tokenize) as tokenize:
+            article.save()
+        # The title and the body of the one article.
+        self.assertEqual(tokenize.call_count, 2)
+
+    def test_incremental_updates_match_a_rebuild(self):
+        self.articles[2].is_published = False
+        self.articles[2].save()
+        self.articles[3].delete()
+        # Saved last, so its weights use the final document frequencies.
+        self.articles[0].content = "protection order hearing " * 20
+        self.articles[0].save()
+
+        incremental = self.document_frequencies()
+        weights = models.ArticleVector.objects.get(article=self.articles[0]).weights
+        related.rebuild_all()
+        self.assertEqual(incremental, self.document_frequencies())
+        self.assertNotIn("counselling", incremental)
+        rebuilt = models.ArticleVector.objects.get(article=self.articles[0]).weights
+        self.assertEqual(weights.keys(), rebuilt.keys())
+        for term, weight in rebuilt.items():
+            self.assertAlmostEqual(weights[term], weight)
+        self.assertFalse(models.ArticleVector.objects.filter(article=self.articles[2]).exists())
+        listed = models.ResourceArticle.objects.values_list("related_articles", flat=True).get(id=self.articles[0].id)
+        self.assertEqual([item["id"] for item in listed], [self.articles[1].id])
+
+
+class ImportUsersTests(TestCase):
+    def import_rows(self, *lines):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("\n".join(["username,email", *lines]) + "\n")
+        self.addCleanup(os.remove, f.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_users", f.name, skip_invalid=True, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_invalid_and_duplicate_rows_are_reported_and_skipped(self):
+        User.objects.create_user("amina", "amina@example.org")
+        stdout, stderr = self.import_rows(
+            "wanjiru,wanjiru@example.org",
+            "bad name!,bad@example.org",
+            "otieno,AMINA@example.org",
+            "njeri,wanjiru@example.org",
+            "kamau,not-an-email",
+        )
+        self.assertIn("Created 1 accounts, 4 invalid rows skipped", stdout)
+        self.assertIn("line 3 (bad name!): username:", stderr)
+        self.assertIn("line 4 (otieno): email already in use", stderr)
+        self.assertIn("line 5 (njeri): email already in use", stderr)
+        self.assertIn("line 6 (kamau): email:", stderr)
+        self.assertEqual(sorted(User.objects.values_list("username", flat=True)), ["amina", "wanjiru"])
+        self.assertTrue(models.UserProfile.objects.filter(user__username="wanjiru").exists())
+
+
+class RegistrationTests(TestCase):
+    def form(self, **fields):
+        data = {
+            "username": "wanjiru",
+            "email": "wanjiru@example.org",
+            "password1": "tall-acacia-river-7",
+            "password2": "tall-acacia-river-7",
+            "phone": "0700000000",
+            "county": models.County.objects.get(name="Nairobi").id,
+            **fields,
+        }
+        return UserRegistrationForm(data)
+
+    def test_signup_creates_the_user_and_profile(self):
+        form = self.form()
+        self.assertTrue(form.is_valid(), form.errors)
+        user = form.save()
+        self.assertTrue(user.check_password("tall-acacia-river-7"))
+        profile = models.UserProfile.objects.get(user=user)
+        self.assertEqual(profile.phone, "0700000000")
+        self.assertEqual(profile.county.name, "Nairobi")
+
+    def test_email_already_in_use_is_refused_whatever_its_case(self):
+        User.objects.create_user("amina", "Amina@Example.org")
+        form = self.form(email="amina@example.ORG")
+        self.assertFalse(form.is_valid())
+        self.assertIn("email", form.errors)
+
+    def test_password_validators(self):
+        for password, field_error in (
+            ("password123", "too common"),
+            ("sh0rt", "too short"),
+            ("40817263591", "entirely numeric"),
+            ("wanjiru-example", "too similar"),
+        ):
+            with self.subTest(password=password):
+                form = self.form(password1=password, password2=password)
+                self.assertFalse(form.is_valid())
+                self.assertIn(field_error, " ".join(form.errors["password2"]))
+        form = self.form(password2="something-else-42")
+        self.assertFalse(form.is_valid())
+        self.assertIn("password2", form.errors)
+
+    def test_no_user_is_left_without_a_profile(self):
+        form = self.form()
+        self.assertTrue(form.is_valid())
+        with mock.patch.object(models.UserProfile.objects, "create", side_effect=RuntimeError("profile insert failed")):
+            with self.assertRaises(RuntimeError):
+                form.save()
+        self.assertFalse(User.objects.filter(username="wanjiru").exists())
+        self.assertFalse(models.UserProfile.objects.exists())
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media_settings = override_settings(
+            MEDIA_ROOT=self.media_root,
+            EVIDENCE_SENDFILE=None,
+            STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC},
+        )
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def report(self, status=models.ReportStatus.RESOLVED, resolved_days_ago=200):
+        report = models.GBVReport(
+            type_of_violence="sexual",
+            location="Nairobi",
+            details="He came back to the house.\nNeighbours heard it.",
+            incident_date=date(2025, 3, 14),
+            status=status,
+            admin_notes="Referred to the GBV recovery centre",
+        )
+        report.file_upload.save("statement.pdf", ContentFile(b"%PDF evidence"), save=False)
+        report.save()
+        if status == models.ReportStatus.RESOLVED:
+            models.GBVReport.objects.filter(id=report.id).update(
+                resolved_at=timezone_now() - timedelta(days=resolved_days_ago)
+            )
+        return report
+
+    def test_archive_moves_old_resolved_reports_with_every_field(self):
+        report = self.report()
+        before = models.GBVReport.objects.filter(id=report.id).values(*archive.ARCHIVED_FIELDS).get()
+        recent = self.report(resolved_days_ago=10)
+        pending = self.report(status=models.ReportStatus.PENDING)
+
+        self.assertEqual(archive.archive_batch(archive.archive_cutoff(days=90)), 1)
+        self.assertFalse(models.GBVReport.objects.filter(id=report.id).exists())
+        self.assertFalse(models.ReportBand.objects.filter(report_id=report.id).exists())
+        archived = models.ArchivedReport.objects.filter(id=report.id)
+        self.assertEqual(archived.values(*archive.ARCHIVED_FIELDS).get(), before)
+        self.assertEqual(archived.get().year, before["created_at"].year)
+        self.assertIsNotNone(before["county_id"])
+        self.assertTrue(default_storage.exists(before["file_upload"]))
+        self.assertEqual(
+            sorted(models.GBVReport.objects.values_list("id", flat=True)), sorted([recent.id, pending.id])
+        )
+        self.assertEqual(archive.archive_batch(archive.archive_cutoff(days=90)), 0)
+
+    def test_batches(self):
+        reports = [self.report() for _ in range(3)]
+        cutoff = archive.archive_cutoff(days=90)
+        self.assertEqual(archive.archive_batch(cutoff, batch_size=2), 2)
+        self.assertEqual(archive.archive_batch(cutoff, batch_size=2), 1)
+        self.assertEqual(archive.archive_batch(cutoff, batch_size=2), 0)
+        self.assertEqual(
+            sorted(models.ArchivedReport.objects.values_list("id", flat=True)), [report.id for report in reports]
+        )
+
+    def test_archived_report_is_still_served(self):
+        report = self.report()
+        archive.archive_batch(archive.archive_cutoff(days=90))
+        self.client.force_login(User.objects.create_user("staff", password="pw", is_staff=True))
+
+        url = reverse("eveshield:reports:report_detail", args=[report.id])
+        response = self.client.get(url)
+        self.assertContains(response, f"Report #{report.id}")
+        self.assertContains(response, "Archived")
+        self.assertContains(response, "Neighbours heard it.")
+        self.assertContains(response, "Referred to the GBV recovery centre")
+        self.assertContains(response, reverse("eveshield:reports:report_evidence", args=[report.id]))
+        self.assertNotContains(response, "<form method=\"post\">")
+
+        # Read-only: a status change is ignored.
+        self.client.post(url, {"status": models.ReportStatus.PENDING})
+        self.assertEqual(models.ArchivedReport.objects.get(id=report.id).status, models.ReportStatus.RESOLVED)
+        self.assertFalse(models.GBVReport.objects.filter(id=report.id).exists())
+
+        response = self.client.get(reverse("eveshield:reports:report_evidence", args=[report.id]))
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF evidence")
+
+        self.assertEqual(self.client.get(reverse("eveshield:reports:report_detail", args=[999999])).status_code, 404)
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media_settings = override_settings(MEDIA_ROOT=self.media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def report(self, name, resolved_days_ago=None):
+        report = models.GBVReport(type_of_violence="physical", location="Nairobi", details=f"Report {name}")
+        report.file_upload.save(name, ContentFile(b"evidence"), save=False)
+        if resolved_days_ago is not None:
+            report.status = models.ReportStatus.RESOLVED
+        report.save()
+        if resolved_days_ago is not None:
+            models.GBVReport.objects.filter(id=report.id).update(
+                resolved_at=timezone_now() - timedelta(days=resolved_days_ago)
+            )
+        self.age(report.file_upload.name)
+        return report
+
+    def age(self, name):
+        """Make a file older than the orphan grace period"""
+        past = time.time() - retention.ORPHAN_GRACE_PERIOD.total_seconds() - 60
+        os.utime(os.path.join(self.media_root, name), (past, past))
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def test_purge_deletes_expired_reports_and_their_evidence(self):
+        expired = self.report("expired.jpg", resolved_days_ago=400)
+        recent = self.report("recent.jpg", resolved_days_ago=10)
+        open_report = self.report("open.jpg")
+        cutoff = retention.retention_cutoff(days=365)
+        deleted = retention.purge(cutoff, batch_size=1)
+        self.assertEqual(deleted, {models.GBVReport: 1, models.ArchivedReport: 0})
+        self.assertFalse(models.GBVReport.objects.filter(id=expired.id).exists())
+        self.assertFalse(self.exists(expired.file_upload.name))
+        for kept in (recent, open_report):
+            self.assertTrue(self.exists(kept.file_upload.name))
+        self.assertEqual(models.GBVReport.objects.count(), 2)
+
+    def test_orphan_sweep_spares_referenced_and_young_files(self):
+        live = self.report("live.jpg")
+        archived = self.report("archived.jpg", resolved_days_ago=400)
+        archive.archive_batch(archive.archive_cutoff(days=90))
+        directory = os.path.dirname(live.file_upload.name)
+        orphan = default_storage.save(f"{directory}/orphan.jpg", ContentFile(b"left behind"))
+        self.age(orphan)
+        young = default_storage.save(f"{directory}/uploading.jpg", ContentFile(b"row not committed yet"))
+        self.assertEqual(retention.orphaned_files(workers=2), [(orphan, len(b"left behind"))])
+        self.assertTrue(models.ArchivedReport.objects.filter(id=archived.id).exists())
+        self.assertTrue(self.exists(young))
+
+    def test_a_report_archived_during_the_sweep_keeps_its_evidence(self):
+        report = self.report("moving.jpg", resolved_days_ago=400)
+        queries = []
+
+        def archive_midway(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            queries.append(sql)
+            if len(queries) == 1:
+                # Moved right after the sweep's first read of the references.
+                archive.archive_batch(archive.archive_cutoff(days=90))
+            return result
+
+        with connection.execute_wrapper(archive_midway):
+            orphans = retention.orphaned_files(workers=1)
+        self.assertEqual(orphans, [])
+        self.assertIn("UNION", queries[0])
+        self.assertTrue(models.ArchivedReport.objects.filter(id=report.id).exists())
+
+
+class SanitizerTests(SimpleTestCase):
+    def assertSanitized(self, html, expected):
+        self.assertEqual(rendering.sanitize_html(html), expected)
+
+    def test_unsafe_link_schemes_are_dropped(self):
+        for href in (
+            "javascript:alert(1)",
+            "JaVaScRiPt:alert(1)",
+            " javascript:alert(1)",
+            "\x01javascript:alert(1)",
+            "java\nscript:alert(1)",
+            "vbscript:msgbox(1)",
+            "data:text/html,<script>alert(1)</script>",
+            "data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==",
+            # Entity-encoded schemes are decoded before the check, as browsers do.
+            "&#106;avascript:alert(1)",
+            "&#x6A;avascript:alert(1)",
+            "jav&#x09;ascript:alert(1)",
+            "javascript&colon;alert(1)",
+            "http://[::1",
+        ):
+            with self.subTest(href=href):
+                self.assertSanitized(f'<a href="{href}">x</a>', '<p><a rel="noopener nofollow">x</a></p>')
+
+    def test_safe_links_are_kept(self):
+        for href in ("https://example.org/help?a=1&b=2", "/resources/", "mailto:help@example.org", "tel:1195"):
+            with self.subTest(href=href):
+                self.assertIn(f'href="{escape(href)}"', rendering.sanitize_html(f'<a href="{escape(href)}">x</a>'))
+
+    def test_scripts_frames_and_their_content_are_dropped(self):
+        self.assertSanitized("<p>a<script>alert(1)</script>b</p>", "<p>ab</p>")
+        self.assertSanitized('<iframe src="//evil.example"><p>inside</p></iframe><p>after</p>', "<p>after</p>")
+        self.assertSanitized("<svg><script>alert(1)</script></svg><p>x</p>", "<p>x</p>")
+        self.assertSanitized("<style>body{display:none}</style><p>x</p>", "<p>x</p>")
+        self.assertSanitized("<p>x</p><script>alert(1)", "<p>x</p>")
+        self.assertSanitized("<!--<script>alert(1)--><p>x</p>", "<p>x</p>")
+
+    def test_event_handlers_and_other_attributes_are_dropped(self):
+        self.assertSanitized('<p onclick="alert(1)" style="color:red" class="x">hi</p>', "<p>hi</p>")
+        self.assertSanitized(
+            '<a href="/help" onmouseover="alert(1)" title="&quot; onfocus=alert(1)">t</a>',
+            '<p><a href="/help" title="&quot; onfocus=alert(1)" rel="noopener nofollow">t</a></p>',
+        )
+        self.assertSanitized('<img src="x" onerror="alert(1)"><p>x</p>', "<p>x</p>")
+
+    def test_nested_and_unbalanced_markup(self):
+        # What is left of a tag split around another is text, escaped.
+        self.assertSanitized("<scr<script>ipt>alert(1)</script><p>x</p>", "ipt&gt;alert(1)<p>x</p>")
+        escaped = "<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>"
+        self.assertSanitized(escaped, escaped)
+        self.assertSanitized("<p><b><i>x</b> tail", "<p><b><i>x</i></b> tail</p>")
+        self.assertSanitized("<p>a</p></p></div></b>", "<p>a</p>")
+        self.assertSanitized("<ul><li>one<li>two</ul>", "<ul><li>one<li>two</li></li></ul>")
+        self.assertSanitized("**<script>alert(1)</script>**", "<p><strong></strong></p>")
+
+
+@override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+class ArticlePageTests(TestCase):
+    def test_the_detail_page_shows_the_sanitized_body(self):
+        article = models.ResourceArticle.objects.create(
+            title="Safety planning",
+            slug="safety-planning",
+            content='<p onclick="alert(1)">Plan ahead</p><script>alert(2)</script><a href="javascript:alert(3)">x</a>',
+        )
+        response = self.client.get(reverse("eveshield:resources:detail", args=[article.slug]))
+        self.assertContains(response, "<p>Plan ahead</p>", html=False)
+        for payload in ("alert(1)", "alert(2)", "alert(3)"):
+            self.assertNotContains(response, payload)
+
+
+class DedupTests(TestCase):
+    vocabulary = [f"word{index}" for index in range(2000)]
+
+    def setUp(self):
+        # Seeded, so every run checks the same texts.
+        self.rng = random.Random(7)
+
+    def text(self, length=60):
+        """Long enough that one changed word leaves most trigrams shared"""
+        return " ".join(self.rng.choice(self.vocabulary) for _ in range(length))
+
+    def near_duplicate(self, text):
+        words = text.split()
+        words[len(words) // 2] = "changed"
+        return " ".join(words)
+
+    def report(self, details):
+        return models.GBVReport.objects.create(type_of_violence="physical", location="Nairobi", details=details)
+
+    def test_signature(self):
+        text = self.text()
+        self.assertIsNone(minhash.signature(""))
+        self.assertIsNone(minhash.signature("!? ..."))
+        self.assertEqual(len(minhash.signature(text)), minhash.NUM_PERM * 4)
+        self.assertEqual(minhash.signature(text), minhash.signature(text.upper()))
+        self.assertEqual(minhash.similarity(minhash.signature(text), minhash.signature(text)), 1)
+        packed = minhash.signature(text)
+        self.assertGreater(minhash.similarity(packed, minhash.signature(self.near_duplicate(text))), 0.7)
+        self.assertLess(minhash.similarity(packed, minhash.signature(self.text())), 0.1)
+
+    def test_near_duplicates_share_a_band_and_unrelated_texts_do_not(self):
+        for _ in range(50):
+            text = self.text()
+            original = minhash.band_buckets(minhash.signature(text))
+            close = minhash.band_buckets(minhash.signature(self.near_duplicate(text)))
+            unrelated = minhash.band_buckets(minhash.signature(self.text()))
+            self.assertEqual(len(original), minhash.BANDS)
+            self.assertTrue(any(a == b for a, b in zip(original, close)))
+            self.assertFalse(any(a == b for a, b in zip(original, unrelated)))
+
+    def test_saving_a_report_indexes_its_bands(self):
+        report = self.report(self.text())
+        self.assertEqual(models.ReportBand.objects.filter(report=report).count(), minhash.BANDS)
+        duplicate = self.report(self.near_duplicate(report.details))
+        self.report(self.text())
+        self.assertEqual(dedup.candidate_ids(duplicate), [report.id])
+
+        report.details = self.text()
+        report.save()
+        self.assertEqual(models.ReportBand.objects.filter(report=report).count(), minhash.BANDS)
+        self.assertEqual(dedup.candidate_ids(duplicate), [])
+
+    def test_possible_duplicates_and_clusters(self):
+        originals = [self.report(self.text()) for _ in range(20)]
+        duplicates = [self.report(self.near_duplicate(report.details)) for report in originals]
+        for _ in range(20):
+            self.report(self.text())
+
+        for original, duplicate in zip(originals, duplicates):
+            self.assertEqual([match.id for match, _ in dedup.possible_duplicates(original)], [duplicate.id])
+        expected = sorted([original.id, duplicate.id] for original, duplicate in zip(originals, duplicates))
+        self.assertEqual(sorted(dedup.clusters()), expected)
+        self.assertEqual(sorted(dedup.clusters(workers=2)), expected)
+
+    @override_settings(STORAGES={**settings.STORAGES, "staticfiles": PLAIN_STATIC})
+    def test_report_page_lists_possible_duplicates(self):
+        report = self.report(self.text())
+        duplicate = self.report(self.near_duplicate(report.details))
+        self.client.force_login(User.objects.create_user("staff", password="pw", is_staff=True))
+        response = self.client.get(reverse("eveshield:reports:report_detail", args=[report.id]))
+        self.assertContains(response, "Possible Duplicates")
+        self.assertContains(response, reverse("eveshield:reports:report_detail", args=[duplicate.id]))
+        self.assertContains(response, f"Report #{duplicate.id}")
+
+        response = self.client.get(reverse("eveshield:reports:report_detail", args=[self.report(self.text()).id]))
+        self.assertNotContains(response, "Possible Duplicates")
+
+
+class TriageTests(TestCase):
+    def score(self, **fields):
+        fields = {"type_of_violence": "emotional", "location": "Nairobi", "details": "", **fields}
+        return triage.urgency_score(models.GBVReport(**fields))
+
+    def test_urgency_score(self):
+        undated = triage.VIOLENCE_WEIGHTS["emotional"] + triage.UNDATED_WEIGHT
+        self.assertEqual(self.score(), undated)
+        self.assertEqual(self.score(type_of_violence="sexual") - self.score(), 20)
+        self.assertEqual(self.score(type_of_violence="unknown"), self.score(type_of_violence="other"))
+        self.assertEqual(self.score(details="He has a knife") - undated, triage.THREAT_WEIGHT)
+        self.assertEqual(
+            self.score(details="a knife, a gun and a panga, he is coming back tonight") - undated,
+            triage.MAX_THREAT_WEIGHT,
+        )
+        self.assertEqual(self.score(file_upload="reports/photo.jpg") - undated, triage.EVIDENCE_WEIGHT)
+
+        submitted = timezone_now()
+        today = timezone.localdate(submitted)
+        self.assertEqual(self.score(incident_date=today, created_at=submitted), 15 + 15)
+        self.assertEqual(self.score(incident_date=today - timedelta(days=3), created_at=submitted), 15 + 10)
+        self.assertEqual(self.score(incident_date=today - timedelta(days=20), created_at=submitted), 15 + 5)
+        self.assertEqual(self.score(incident_date=date(2020, 1, 1), created_at=submitted), 15)
+
+        worst = self.score(
+            type_of_violence="sexual",
+            details="I want to kill myself, he has a gun and a knife",
+            incident_date=today,
+            created_at=submitted,
+            file_upload="reports/photo.jpg",
+        )
+        self.assertEqual(worst, triage.MAX_URGENCY)
+
+    def test_crisis_keywords_raise_urgency_and_the_chatbot_escalates(self):
+        calm = self.score(details="It happened at work")
+        for keyword in triage.CRISIS_KEYWORDS:
+            with self.subTest(keyword=keyword):
+                self.assertEqual(self.score(details=f"It happened at work, {keyword.upper()}"), calm + 30)
+                reply = get_chatbot_response(f"hi, {keyword}", MENTAL_HEALTH_RESPONSES)
+                self.assertIn(reply, MENTAL_HEALTH_RESPONSES["crisis"])
+
+    def test_saving_a_report_scores_it(self):
+        report = models.GBVReport.objects.create(type_of_violence="emotional", location="Nairobi", details="calm")
+        report.details = "I am in danger"
+        report.save()
+        report.refresh_from_db()
+        self.assertEqual(report.urgency, self.score(details="I am in danger", created_at=report.created_at))
+
+    def test_next_urgent_report_steps_through_pending_reports(self):
+        def report(urgency, status=models.ReportStatus.PENDING):
+            created = models.GBVReport.objects.create(type_of_violence="other", location="Nairobi", details="x")
+            # Fixed scores, and creation times in insertion order for the ties.
+            models.GBVReport.objects.filter(id=created.id).update(
+                urgency=urgency, status=status, created_at=timezone_now() - timedelta(hours=100 - created.id)
+            )
+            return created.id
+
+        middle_first, top, middle_second, low = report(50), report(90), report(50), report(10)
+        report(95, status=models.ReportStatus.RESOLVED)
+        self.client.force_login(User.objects.create_user("staff", password="pw", is_staff=True))
+        url = reverse("eveshield:reports:next_urgent")
+
+        visited, after = [], ""
+        while True:
+            response = self.client.get(url, {"after": after} if after else {})
+            if response.url == reverse("eveshield:reports:admin_dashboard"):
+                break
+            after = response.url.rstrip("/").rsplit("/", 1)[-1]
+            visited.append(int(after))
+        self.assertEqual(visited, [top, middle_first, middle_second, low])
+
+        # A report the queue no longer holds restarts it from the top.
+        response = self.client.get(url, {"after": "999999"})
+        self.assertEqual(response.url, reverse("eveshield:reports:report_detail", args=[top]))
+
+    def test_triage_orders_come_from_indexes(self):
+        reports = models.GBVReport.objects.for_list().order_by("-urgency", "created_at")
+        queue = reports.filter(status=models.ReportStatus.PENDING)
+        self.assertIn("report_triage_idx", queue.explain())
+        self.assertIn("report_urgency_idx", reports.explain())
+        self.assertNotIn("TEMP B-TREE", reports.explain())
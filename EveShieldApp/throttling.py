@@ -0,0 +1,201 @@
+import ipaddress
+import math
+import time
+from functools import lru_cache, wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import salted_hmac
+
+PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "second": 1,
+    "m": 60,
+    "min": 60,
+    "minute": 60,
+    "h": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "day": 86400,
+}
+
+
+def parse_rate(rate):
+    """``"5/hour"`` as ``(5, 3600)``; None disables the bucket"""
+    if rate is None:
+        return None
+    count, _, period = rate.partition("/")
+    return int(count), PERIODS[period.strip().lower()]
+
+
+@lru_cache(maxsize=8)
+def networks(proxies):
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
+
+
+def trusted(ip):
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in networks(tuple(settings.TRUSTED_PROXIES)))
+
+
+def client_ip(request):
+    """
+    The client's address: REMOTE_ADDR, or when that is one of the
+    TRUSTED_PROXIES, the right-most X-Forwarded-For hop that is not. Hops
+    further left were written by the client and cannot be trusted.
+    """
+    ip = request.META.get("REMOTE_ADDR", "")
+    if not trusted(ip):
+        return ip
+    hops = [hop.strip() for hop in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not trusted(hop):
+            return hop
+        ip = hop
+    return ip
+
+
+def client_hash(request):
+    """Keyed hash of the client IP so raw addresses never reach the cache"""
+    return salted_hmac("EveShieldApp.throttling", client_ip(request)).hexdigest()[:20]
+
+
+def wait_time(previous, current, capacity, period, elapsed):
+    """
+    Seconds to wait before one more request fits a sliding window of
+    ``capacity`` requests per ``period``; 0 when it fits now.
+
+    ``current`` requests were counted in the fixed window ``elapsed``
+    seconds old and ``previous`` in the one before. The sliding window
+    holds the current count plus the share of the previous one it still
+    overlaps, which assumes those requests were spread evenly; this keeps
+    the limit without a log of timestamps and with no burst at a window
+    boundary.
+    """
+    room = capacity - 1 - current
+    if room >= 0:
+        if previous * (1 - elapsed / period) <= room:
+            return 0
+        # The previous window slides out until its share leaves room.
+        return (1 - room / previous) * period - elapsed
+    # Full until the next window, where this one's count is the previous one.
+    return (period - elapsed) + (1 - (capacity - 1) / current) * period
+
+
+def window_keys(key, period, now):
+    window = int(now // period)
+    return f"{key}:{window}", f"{key}:{window - 1}", now - window * period
+
+
+def consume(request, scope):
+    """
+    Count a request for ``request`` in ``scope``; returns seconds to wait, 0 if allowed.
+
+    Counts are kept with cache.add()/incr(), which are atomic in the
+    shared backends (and locmem), so concurrent requests each see a
+    different count and cannot slip past the limit together. A refused
+    request is taken off again in every bucket it was counted in, so a
+    busy route does not use up the quota clients have elsewhere.
+    """
+    cache = caches[settings.THROTTLE_CACHE]
+    now = time.time()
+    counted = []
+    for key, capacity, period in buckets(request, scope):
+        current_key, previous_key, elapsed = window_keys(key, period, now)
+        # Kept for two periods: the next window still reads this one.
+        cache.add(current_key, 0, 2 * period)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.add(current_key, 1, 2 * period)
+            current = 1
+        counted.append(current_key)
+        wait = wait_time(cache.get(previous_key, 0), current - 1, capacity, period, elapsed)
+        if wait:
+            for counted_key in counted:
+                try:
+                    cache.decr(counted_key)
+                except ValueError:
+                    pass
+            return wait
+    return 0
+
+
+async def aconsume(request, scope):
+    cache = caches[settings.THROTTLE_CACHE]
+    now = time.time()
+    counted = []
+    for key, capacity, period in buckets(request, scope):
+        current_key, previous_key, elapsed = window_keys(key, period, now)
+        await cache.aadd(current_key, 0, 2 * period)
+        try:
+            current = await cache.aincr(current_key)
+        except ValueError:
+            await cache.aadd(current_key, 1, 2 * period)
+            current = 1
+        counted.append(current_key)
+        wait = wait_time(await cache.aget(previous_key, 0), current - 1, capacity, period, elapsed)
+        if wait:
+            for counted_key in counted:
+                try:
+                    await cache.adecr(counted_key)
+                except ValueError:
+                    pass
+            return wait
+    return 0
+
+
+def buckets(request, scope):
+    """(cache key, capacity, period) for the client's bucket and the route-wide one"""
+    client_rate, route_rate = settings.THROTTLE_RATES[scope]
+    for key, rate in (
+        (f"throttle:{scope}:{client_hash(request)}", parse_rate(client_rate)),
+        (f"throttle:{scope}:*", parse_rate(route_rate)),
+    ):
+        if rate is not None:
+            yield key, *rate
+
+
+def throttled_response(request, response):
+    if request.throttled:
+        response.status_code = 429
+        response.headers["Retry-After"] = str(request.throttled)
+    return response
+
+
+def throttle(scope):
+    """
+    Rate-limit POSTs to a view with the buckets configured for ``scope``.
+
+    The view still runs when the limit is hit so it can answer gracefully:
+    ``request.throttled`` is the number of seconds the client should wait
+    (0 when allowed), and the response is sent as a 429 with Retry-After.
+    The view must skip any writes when it is set.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                wait = await aconsume(request, scope) if request.method == "POST" else 0
+                request.throttled = math.ceil(wait)
+                return throttled_response(request, await view(request, *args, **kwargs))
+
+        else:
+
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                wait = consume(request, scope) if request.method == "POST" else 0
+                request.throttled = math.ceil(wait)
+                return throttled_response(request, view(request, *args, **kwargs))
+
+        return inner
+
+    return decorator
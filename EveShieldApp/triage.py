@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+# Shared with the mental health chatbot, which escalates on the same phrases.
+CRISIS_KEYWORDS = ["suicide", "self harm", "hurt myself", "end it", "kill myself", "danger", "emergency"]
+
+# Phrases in a report that point to an ongoing threat rather than a past incident.
+THREAT_KEYWORDS = [
+    "kill me",
+    "threatened to kill",
+    "knife",
+    "panga",
+    "gun",
+    "weapon",
+    "locked me",
+    "right now",
+    "tonight",
+    "still here",
+    "coming back",
+    "bleeding",
+    "unconscious",
+    "child",
+]
+
+VIOLENCE_WEIGHTS = {
+    "sexual": 35,
+    "physical": 35,
+    "emotional": 15,
+    "digital": 10,
+    "economic": 10,
+    "other": 15,
+}
+
+CRISIS_WEIGHT = 30
+THREAT_WEIGHT = 8
+MAX_THREAT_WEIGHT = 16
+EVIDENCE_WEIGHT = 5
+
+# Points by how long before submission the incident happened.
+RECENCY_WEIGHTS = [
+    (timedelta(days=1), 15),
+    (timedelta(days=7), 10),
+    (timedelta(days=30), 5),
+]
+UNDATED_WEIGHT = 5
+
+MAX_URGENCY = 100
+
+
+def recency_weight(incident_date, submitted_at):
+    if incident_date is None:
+        return UNDATED_WEIGHT
+    age = timezone.localdate(submitted_at) - incident_date
+    for window, weight in RECENCY_WEIGHTS:
+        if age < window:
+            return weight
+    return 0
+
+
+def urgency_score(report):
+    """
+    Urgency of a report from 0 to 100, as of when it was submitted.
+
+    Combines the type of violence, crisis and threat phrases in the
+    details, how recent the incident was and whether evidence was attached.
+    """
+    details = (report.details or "").lower()
+    submitted_at = report.created_at or timezone.now()
+
+    score = VIOLENCE_WEIGHTS.get(report.type_of_violence, VIOLENCE_WEIGHTS["other"])
+    if any(keyword in details for keyword in CRISIS_KEYWORDS):
+        score += CRISIS_WEIGHT
+    score += min(sum(keyword in details for keyword in THREAT_KEYWORDS) * THREAT_WEIGHT, MAX_THREAT_WEIGHT)
+    score += recency_weight(report.incident_date, submitted_at)
+    if report.file_upload:
+        score += EVIDENCE_WEIGHT
+    return min(score, MAX_URGENCY)
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
 
-from EveShieldApp import views
+from EveShieldApp.lazy import LazyView
 
 # Customize admin site branding
 admin.site.site_header = "EveShield Administration"
@@ -11,62 +11,94 @@ admin.site.index_title = "Welcome to EveShield Admin Panel"
 
 app_name = "eveshield"
 
+
+def view(dotted_path):
+    """Refer to a view in this app by dotted path; it is imported on first request"""
+    return LazyView(f"EveShieldApp.{dotted_path}")
+
+
 accounts_patterns = (
     [
-        path("signup/", views.signup, name="signup"),
-        path("login/", views.user_login, name="login"),
+        path("signup/", view("views.accounts.signup"), name="signup"),
+        path("login/", view("views.accounts.user_login"), name="login"),
         path("logout/", auth_views.LogoutView.as_view(), name="logout"),
-        path("profile/", views.profile, name="profile"),
+        path("profile/", view("views.accounts.profile"), name="profile"),
     ],
     "accounts",
 )
 
 reports_patterns = (
     [
-        path("submit/", views.submit_report, name="submit_report"),
-        path("admin/dashboard/", views.admin_dashboard, name="admin_dashboard"),
-        path("admin/report/<int:report_id>/", views.report_detail, name="report_detail"),
+        path("submit/", view("views.reports.submit_report"), name="submit_report"),
+        path("admin/dashboard/", view("views.reports.admin_dashboard"), name="admin_dashboard"),
+        path("admin/live/", view("views.reports.live_feed"), name="live_feed"),
+        path("admin/report/<int:report_id>/", view("views.reports.report_detail"), name="report_detail"),
+        path("admin/report/<int:report_id>/evidence/", view("views.reports.report_evidence"), name="report_evidence"),
+        path("admin/triage/next/", view("views.reports.next_urgent_report"), name="next_urgent"),
     ],
     "reports",
 )
 
 lawyer_patterns = (
     [
-        path("", views.lawyer_directory, name="directory"),
+        path("", view("views.directory.lawyer_directory"), name="directory"),
     ],
     "lawyers",
 )
 
 mental_health_patterns = (
     [
-        path("", views.therapist_directory, name="directory"),
-        path("chatbot/", views.mental_health_chatbot, name="chatbot"),
+        path("", view("views.directory.therapist_directory"), name="directory"),
+        path("chatbot/", view("views.chatbots.mental_health_chatbot"), name="chatbot"),
     ],
     "mental_health",
 )
 
 chatbot_patterns = (
     [
-        path("legal/", views.legal_chatbot, name="legal_chatbot"),
+        path("legal/", view("views.chatbots.legal_chatbot"), name="legal_chatbot"),
     ],
     "chatbot",
 )
 
 resource_patterns = (
     [
-        path("", views.resource_list, name="list"),
-        path("article/<slug:slug>/", views.resource_detail, name="detail"),
-        path("emergency-contacts/", views.emergency_contacts, name="emergency_contacts"),
+        path("", view("views.resources.resource_list"), name="list"),
+        path("article/<slug:slug>/", view("views.resources.resource_detail"), name="detail"),
+        path("emergency-contacts/", view("views.resources.emergency_contacts"), name="emergency_contacts"),
     ],
     "resources",
 )
 
+profiling_patterns = (
+    [
+        path("", view("views.profiling.profile_summary"), name="summary"),
+        path("stacks/", view("views.profiling.profile_stacks"), name="stacks"),
+    ],
+    "profiling",
+)
+
+api_patterns = (
+    [
+        path("directory/snapshot/", view("api.directory_snapshot"), name="directory_snapshot"),
+        path("v1/lawyers/", view("api.lawyer_list"), name="lawyers"),
+        path("v1/therapists/", view("api.therapist_list"), name="therapists"),
+        path("v1/lawyers/nearby/", view("api.lawyer_nearby"), name="lawyers_nearby"),
+        path("v1/therapists/nearby/", view("api.therapist_nearby"), name="therapists_nearby"),
+    ],
+    "api",
+)
+
 urlpatterns = [
-    path("", views.home, name="home"),
+    path("", view("views.pages.home"), name="home"),
+    path("manifest.webmanifest", view("views.pages.web_manifest"), name="web_manifest"),
+    path("sw.js", view("views.pages.service_worker"), name="service_worker"),
     path("accounts/", include(accounts_patterns, namespace="accounts")),
     path("reports/", include(reports_patterns, namespace="reports")),
     path("lawyers/", include(lawyer_patterns, namespace="lawyers")),
     path("mental-health/", include(mental_health_patterns, namespace="mental_health")),
     path("chatbot/", include(chatbot_patterns, namespace="chatbot")),
     path("resources/", include(resource_patterns, namespace="resources")),
+    path("profiling/", include(profiling_patterns, namespace="profiling")),
+    path("api/", include(api_patterns, namespace="api")),
 ]
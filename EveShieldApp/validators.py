@@ -0,0 +1,34 @@
+import functools
+import gzip
+
+from django.contrib.auth import password_validation
+
+
+@functools.cache
+def load_password_list(path):
+    """The lowercased password list at ``path`` (optionally gzipped), read once per process"""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return frozenset(line.strip() for line in f)
+    except OSError:
+        with open(path) as f:
+            return frozenset(line.strip() for line in f)
+
+
+class CommonPasswordValidator(password_validation.CommonPasswordValidator):
+    """
+    Django's common-password check backed by a shared frozenset.
+
+    Every instance reuses the list loaded by the first one, instead of
+    reading and decompressing the file again.
+    """
+
+    def __init__(self, password_list_path=None):
+        self.password_list_path = password_list_path or self.DEFAULT_PASSWORD_LIST_PATH
+        # Read now, as Django's validator does, so the WSGI/ASGI modules'
+        # preloading of the validators loads the list before the first signup.
+        load_password_list(str(self.password_list_path))
+
+    @property
+    def passwords(self):
+        return load_password_list(str(self.password_list_path))
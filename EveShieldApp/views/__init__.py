@@ -0,0 +1,8 @@
+"""
+Views, one module per subsystem.
+
+Nothing is imported here: the URLconf refers to views by dotted path
+through ``EveShieldApp.lazy.LazyView``, so a worker only imports a
+subsystem's views, forms and data tables when it first serves a request
+for that subsystem.
+"""
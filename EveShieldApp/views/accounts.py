@@ -0,0 +1,64 @@
+from django.contrib import messages
+from django.contrib.auth import aauthenticate, alogin
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+
+from EveShieldApp.forms import UserProfileForm, UserRegistrationForm
+from EveShieldApp.views.common import arender
+
+
+def signup(request):
+    """User registration view"""
+    if request.user.is_authenticated:
+        return redirect("eveshield:accounts:profile")
+
+    if request.method == "POST":
+        form = UserRegistrationForm(request.POST)
+        if form.is_valid():
+            user = form.save()
+            messages.success(request, f"Account created for {user.username}! You can now log in.")
+            return redirect("eveshield:accounts:login")
+    else:
+        form = UserRegistrationForm()
+
+    return render(request, "users/signup.html", {"form": form})
+
+
+async def user_login(request):
+    """User login view"""
+    if (await request.auser()).is_authenticated:
+        return redirect("eveshield:accounts:profile")
+
+    if request.method == "POST":
+        username = request.POST.get("username")
+        password = request.POST.get("password")
+        # Password hashing runs on a thread pool, not the event loop (see EveShieldApp.backends).
+        user = await aauthenticate(request, username=username, password=password)
+        if user is not None:
+            await alogin(request, user)
+            messages.success(request, f"Welcome back, {user.username}!")
+            return redirect("eveshield:accounts:profile")
+        messages.error(request, "Invalid username or password.")
+
+    return await arender(request, "users/login.html")
+
+
+@login_required
+def profile(request):
+    """User profile view"""
+    profile_obj = request.profile
+
+    if request.method == "POST":
+        form = UserProfileForm(request.POST, instance=profile_obj)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Profile updated successfully!")
+            return redirect("eveshield:accounts:profile")
+    else:
+        form = UserProfileForm(instance=profile_obj)
+
+    return render(
+        request,
+        "users/profile.html",
+        {"profile": profile_obj, "form": form},
+    )
@@ -0,0 +1,51 @@
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Count, Max
+from django.shortcuts import render
+
+
+async def apaginate(queryset, per_page, page_number):
+    """Async counterpart of Paginator.get_page using acount/aiterator"""
+    paginator = Paginator(queryset, per_page)
+    paginator.count = await queryset.acount()
+
+    try:
+        number = paginator.validate_number(page_number)
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        number = paginator.num_pages
+
+    bottom = (number - 1) * per_page
+    object_list = [obj async for obj in queryset[bottom : bottom + per_page].aiterator()]
+    return Page(object_list, number, paginator)
+
+
+async def arender(request, template_name, context=None):
+    """Render a template from an async view without lazy sync DB access"""
+    # The auth and messages context processors touch request.user and the
+    # session lazily; resolve both up front so rendering never hits the ORM.
+    request.user = await request.auser()
+    await request.session.akeys()
+    return render(request, template_name, context)
+
+
+def hot_template(name):
+    """
+    Template names for a page with a Jinja2 twin: ``name.jinja`` first,
+    then the Django template ``name.html``.
+
+    The Django engine comes first in TEMPLATES and never finds the
+    ``.jinja`` name, so the twin is used exactly when the Jinja2 engine
+    is configured (settings.JINJA2_TEMPLATES).
+    """
+    return [f"{name}.jinja", f"{name}.html"]
+
+
+async def table_version(queryset):
+    """Version string for a set of rows: latest updated_at plus row count"""
+    stats = await queryset.aaggregate(latest=Max("updated_at"), total=Count("id"))
+    return f"{stats['latest']}:{stats['total']}"
+
+
+async def static_page_version(request):
+    return "static"
@@ -0,0 +1,83 @@
+from EveShieldApp import models
+from EveShieldApp.decorators import conditional_page
+from EveShieldApp.views.common import apaginate, arender, hot_template, table_version
+
+
+async def lawyer_directory_version(request):
+    return await table_version(models.Lawyer.objects.all())
+
+
+async def therapist_directory_version(request):
+    return await table_version(models.Therapist.objects.all())
+
+
+# Lawyers
+@conditional_page(lawyer_directory_version)
+async def lawyer_directory(request):
+    """Display directory of lawyers"""
+    lawyers_qs = models.Lawyer.objects.filter(is_active=True).for_directory()
+
+    county_filter = request.GET.get("county", "")
+    if county_filter:
+        lawyers_qs = lawyers_qs.filter(county__name=county_filter)
+
+    search_query = request.GET.get("search", "")
+    if search_query:
+        lawyers_qs = lawyers_qs.filter(name__icontains=search_query) | lawyers_qs.filter(
+            specialization__icontains=search_query
+        )
+
+    counties = [
+        county
+        async for county in models.County.objects.filter(lawyers__is_active=True)
+        .values_list("name", flat=True)
+        .distinct()
+        .aiterator()
+    ]
+
+    page_obj = await apaginate(lawyers_qs, 12, request.GET.get("page"))
+
+    context = {
+        "page_obj": page_obj,
+        "counties": counties,
+        "county_filter": county_filter,
+        "search_query": search_query,
+    }
+
+    return await arender(request, hot_template("resources/lawyers/directory"), context)
+
+
+# Mental health
+@conditional_page(therapist_directory_version)
+async def therapist_directory(request):
+    """Display directory of mental health professionals"""
+    therapists_qs = models.Therapist.objects.filter(is_active=True).for_directory()
+
+    county_filter = request.GET.get("county", "")
+    if county_filter:
+        therapists_qs = therapists_qs.filter(county__name=county_filter)
+
+    search_query = request.GET.get("search", "")
+    if search_query:
+        therapists_qs = therapists_qs.filter(name__icontains=search_query) | therapists_qs.filter(
+            specialty__icontains=search_query
+        )
+
+    counties = [
+        county
+        async for county in models.County.objects.filter(therapists__is_active=True)
+        .values_list("name", flat=True)
+        .distinct()
+        .aiterator()
+    ]
+
+    page_obj = await apaginate(therapists_qs, 12, request.GET.get("page"))
+
+    context = {
+        "page_obj": page_obj,
+        "counties": counties,
+        "county_filter": county_filter,
+        "search_query": search_query,
+    }
+
+    return await arender(request, hot_template("resources/mental_health/directory"), context)
@@ -0,0 +1,36 @@
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.views.decorators.cache import cache_control
+
+from EveShieldApp.decorators import deploy_version
+
+
+def home(request):
+    """Home page view"""
+    return render(request, "onboarding/home.html")
+
+
+# Offline support (PWA)
+def web_manifest(request):
+    """Web app manifest so the site can be installed to the home screen"""
+    manifest = {
+        "name": "EveShield - GBV Support & Resources",
+        "short_name": "EveShield",
+        "start_url": "/",
+        "scope": "/",
+        "display": "standalone",
+        "background_color": "#f8fafc",
+        "theme_color": "#6366f1",
+    }
+    return JsonResponse(manifest, content_type="application/manifest+json")
+
+
+@cache_control(no_cache=True)
+def service_worker(request):
+    """Service worker script, served from the site root so it controls every page"""
+    return render(
+        request,
+        "pwa/service_worker.js",
+        {"cache_version": deploy_version()},
+        content_type="application/javascript",
+    )
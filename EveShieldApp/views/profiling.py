@@ -0,0 +1,50 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import Avg, Count, Max
+from django.http import Http404, HttpResponse
+from django.shortcuts import render
+
+from EveShieldApp import models, profiling
+
+TOP_FUNCTIONS = 25
+
+
+@staff_member_required
+def profile_summary(request):
+    """Profiled views, slowest first, and the functions one of them spends its time in"""
+    views = list(
+        models.RequestProfile.objects.values("view_name")
+        .annotate(requests=Count("id"), avg_duration=Avg("duration"), max_duration=Max("duration"))
+        .order_by("-avg_duration")
+    )
+    selected = request.GET.get("view") or (views[0]["view_name"] if views else "")
+
+    self_time, total_time = profiling.top_functions(
+        models.RequestProfile.objects.filter(view_name=selected).values_list("stacks", flat=True).iterator()
+    )
+    sampled = sum(self_time.values()) or 1
+    functions = [
+        {
+            "name": name,
+            "self_ms": micros / 1000,
+            "self_share": micros / sampled * 100,
+            "total_ms": total_time[name] / 1000,
+            "total_share": total_time[name] / sampled * 100,
+        }
+        for name, micros in self_time.most_common(TOP_FUNCTIONS)
+    ]
+
+    context = {"views": views, "selected": selected, "functions": functions, "sampled_ms": sampled / 1000}
+    return render(request, "tracking/profiles.html", context)
+
+
+@staff_member_required
+def profile_stacks(request):
+    """All stored stacks of one view, merged, as a collapsed stack file for flamegraph.pl or speedscope"""
+    view_name = request.GET.get("view", "")
+    profiles = models.RequestProfile.objects.filter(view_name=view_name).values_list("stacks", flat=True)
+    if not profiles.exists():
+        raise Http404("No profiles for this view")
+
+    response = HttpResponse(profiling.merge(profiles.iterator()), content_type="text/plain; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{view_name.replace(":", "-")}.folded"'
+    return response
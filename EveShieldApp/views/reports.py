@@ -0,0 +1,187 @@
+import math
+
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from EveShieldApp import dedup, evidence, live, models
+from EveShieldApp.forms import GBVReportForm
+from EveShieldApp.throttling import throttle
+
+
+@throttle("report")
+def submit_report(request):
+    """Anonymous GBV report submission view"""
+    if request.method == "POST":
+        form = GBVReportForm(request.POST, request.FILES)
+        if request.throttled:
+            # Keep what they typed so nothing is lost while they wait.
+            messages.warning(
+                request,
+                (
+                    "We are receiving a lot of reports from your connection, so this one has not been sent yet. "
+                    f"Please try again in {math.ceil(request.throttled / 60)} minute(s). "
+                    "If you are in danger right now, call 999 or the GBV hotline on 1195."
+                ),
+            )
+        elif form.is_valid():
+            form.save()
+            messages.success(
+                request,
+                (
+                    "Thank you for your report. Your submission has been received and will be reviewed. "
+                    "Your identity remains anonymous."
+                ),
+            )
+            return redirect("eveshield:reports:submit_report")
+    else:
+        form = GBVReportForm()
+
+    return render(request, "tracking/submit_report.html", {"form": form})
+
+
+@staff_member_required
+def admin_dashboard(request):
+    """Admin dashboard for managing GBV reports"""
+    reports_qs = models.GBVReport.objects.for_list()
+
+    # Filtering
+    status_filter = request.GET.get("status", "")
+    if status_filter:
+        reports_qs = reports_qs.filter(status=status_filter)
+
+    county_filter = request.GET.get("county", "")
+    if county_filter.isdigit():
+        reports_qs = reports_qs.filter(county_id=int(county_filter))
+
+    sort = request.GET.get("sort", "")
+    if sort == "urgency":
+        reports_qs = reports_qs.order_by("-urgency", "created_at")
+
+    # Search
+    search_query = request.GET.get("search", "")
+    if search_query:
+        reports_qs = reports_qs.filter(location__icontains=search_query) | reports_qs.filter(
+            details__icontains=search_query
+        )
+
+    # Pagination
+    paginator = Paginator(reports_qs, 20)
+    page_number = request.GET.get("page")
+    page_obj = paginator.get_page(page_number)
+
+    # Statistics
+    total_reports = models.GBVReport.objects.count()
+    pending_reports = models.GBVReport.objects.filter(status=models.ReportStatus.PENDING).count()
+    reviewed_reports = models.GBVReport.objects.filter(status=models.ReportStatus.REVIEWED).count()
+    archived_reports = models.ArchivedReport.objects.count()
+    counties = models.County.objects.annotate(report_count=Count("reports")).filter(report_count__gt=0)
+
+    context = {
+        "page_obj": page_obj,
+        "total_reports": total_reports,
+        "pending_reports": pending_reports,
+        "reviewed_reports": reviewed_reports,
+        "archived_reports": archived_reports,
+        "counties": counties,
+        "status_filter": status_filter,
+        "county_filter": county_filter,
+        "sort": sort,
+        "search_query": search_query,
+        # New reports from the live feed go on top only where they belong there.
+        "live_prepend": page_obj.number == 1 and not (status_filter or county_filter or sort or search_query),
+        "live_since": timezone.now().isoformat(),
+    }
+
+    return render(request, "tracking/admin_dashboard.html", context)
+
+
+@staff_member_required
+async def live_feed(request):
+    """Server-sent events that keep an open admin dashboard current"""
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the stream would hold a worker thread for as long as the
+        # page stays open; 204 tells EventSource not to reconnect.
+        return HttpResponse(status=204)
+
+    # A reconnecting EventSource sends the id of the last event it received.
+    since = request.headers.get("Last-Event-ID") or request.GET.get("since", "")
+    try:
+        since = parse_datetime(since)
+    except ValueError:
+        since = None
+    if since is None or timezone.is_naive(since):
+        since = timezone.now()
+
+    response = StreamingHttpResponse(live.feed(since), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@staff_member_required
+def report_detail(request, report_id):
+    """View and update individual report details"""
+    report = models.GBVReport.objects.filter(id=report_id).first()
+    if report is None:
+        # Reports resolved long ago live in the archive table and are read-only.
+        archived = get_object_or_404(models.ArchivedReport, id=report_id)
+        return render(request, "tracking/report_detail.html", {"report": archived, "archived": True})
+
+    if request.method == "POST":
+        new_status = request.POST.get("status")
+        admin_notes = request.POST.get("admin_notes", "")
+
+        if new_status in [choice[0] for choice in models.ReportStatus.choices]:
+            report.status = new_status
+            report.admin_notes = admin_notes
+            report.save()
+            messages.success(request, "Report updated successfully!")
+            return redirect("eveshield:reports:report_detail", report_id=report_id)
+
+    return render(
+        request,
+        "tracking/report_detail.html",
+        {"report": report, "duplicates": dedup.possible_duplicates(report)},
+    )
+
+
+@staff_member_required
+def report_evidence(request, report_id):
+    """The evidence file attached to a live or archived report, for staff only"""
+    name = (
+        models.GBVReport.objects.filter(id=report_id).values_list("file_upload", flat=True).first()
+        or models.ArchivedReport.objects.filter(id=report_id).values_list("file_upload", flat=True).first()
+    )
+    if not name:
+        raise Http404("This report has no evidence file")
+    return evidence.serve(request, name)
+
+
+@staff_member_required
+def next_urgent_report(request):
+    """Open the most urgent pending report, or the next one after ``?after=<id>``"""
+    queue = models.GBVReport.objects.filter(status=models.ReportStatus.PENDING).order_by("-urgency", "created_at")
+
+    # Keyset step along report_triage_idx, so skipping a report never sorts the table.
+    after = request.GET.get("after", "")
+    current = None
+    if after.isdigit():
+        current = models.GBVReport.objects.filter(id=int(after)).values("urgency", "created_at").first()
+    if current:
+        queue = queue.filter(
+            Q(urgency__lt=current["urgency"]) | Q(urgency=current["urgency"], created_at__gt=current["created_at"])
+        )
+
+    report_id = queue.values_list("id", flat=True).first()
+    if report_id is None:
+        messages.info(request, "There are no more pending reports in the triage queue.")
+        return redirect("eveshield:reports:admin_dashboard")
+    return redirect("eveshield:reports:report_detail", report_id=report_id)
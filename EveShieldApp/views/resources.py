@@ -0,0 +1,80 @@
+from django.shortcuts import aget_object_or_404
+
+from EveShieldApp import models
+from EveShieldApp.decorators import conditional_page
+from EveShieldApp.views.common import apaginate, arender, hot_template, static_page_version
+
+
+async def resource_detail_version(request, slug):
+    article = (
+        await models.ResourceArticle.objects.filter(slug=slug, is_published=True)
+        .values("updated_at", "related_articles")
+        .afirst()
+    )
+    if article is None:
+        return None
+    return f"{article['updated_at']}:{article['related_articles']}"
+
+
+async def resource_list(request):
+    """List all educational resources"""
+    articles_qs = models.ResourceArticle.objects.filter(is_published=True).for_list()
+
+    category_filter = request.GET.get("category", "")
+    if category_filter:
+        articles_qs = articles_qs.filter(category=category_filter)
+
+    search_query = request.GET.get("search", "")
+    if search_query:
+        articles_qs = articles_qs.filter(title__icontains=search_query) | articles_qs.filter(
+            content__icontains=search_query
+        )
+
+    page_obj = await apaginate(articles_qs, 10, request.GET.get("page"))
+
+    categories = models.ResourceArticle._meta.get_field("category").choices
+
+    context = {
+        "page_obj": page_obj,
+        "category_filter": category_filter,
+        "search_query": search_query,
+        "categories": categories,
+    }
+
+    return await arender(request, hot_template("resources/articles/list"), context)
+
+
+@conditional_page(resource_detail_version)
+async def resource_detail(request, slug):
+    """View individual resource article"""
+    article = await aget_object_or_404(models.ResourceArticle, slug=slug, is_published=True)
+
+    return await arender(
+        request,
+        "resources/articles/detail.html",
+        {"article": article, "related_articles": article.related_articles},
+    )
+
+
+@conditional_page(static_page_version)
+async def emergency_contacts(request):
+    """Emergency contacts page"""
+    contacts = {
+        "national_gbv_hotline": {
+            "name": "National GBV Hotline",
+            "phone": "1195",
+            "description": "24/7 helpline for gender-based violence support",
+        },
+        "police_emergency": {
+            "name": "Police Emergency",
+            "phone": "999",
+            "description": "Emergency police services",
+        },
+        "child_helpline": {
+            "name": "Child Helpline",
+            "phone": "116",
+            "description": "Support for children in distress",
+        },
+    }
+
+    return await arender(request, "resources/articles/emergency_contacts.html", {"contacts": contacts})
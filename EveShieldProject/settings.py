@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -36,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
     # Unified EveShield app
     'EveShieldApp',
@@ -43,31 +45,59 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'EveShieldApp.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'EveShieldApp.middleware.ProfileMiddleware',
+    'EveShieldApp.middleware.SamplingProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'EveShieldProject.urls'
 
+TEMPLATE_CONTEXT_PROCESSORS = [
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
+]
+
+# Django caches compiled templates per process (even with DEBUG on, where the
+# autoreloader clears the cache when a template changes).
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'EveShieldApp' / 'Templates'],
         'APP_DIRS': True,
         'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
+            'context_processors': TEMPLATE_CONTEXT_PROCESSORS,
         },
     },
 ]
 
+# The busiest listing pages (both directories and the resource library) have
+# Jinja2 twins in EveShieldApp/jinja2 that render several times faster. They
+# are used when Jinja2 is installed; otherwise, or with this set to False,
+# those pages render from the Django templates.
+JINJA2_TEMPLATES = find_spec('jinja2') is not None
+if JINJA2_TEMPLATES:
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'environment': 'EveShieldApp.templating.environment',
+            'context_processors': TEMPLATE_CONTEXT_PROCESSORS,
+        },
+    })
+
+# Compile every template when a worker boots (wsgi.py/asgi.py) instead of on
+# the first request that renders it.
+PRECOMPILE_TEMPLATES = not DEBUG
+
 WSGI_APPLICATION = 'EveShieldProject.wsgi.application'
 
 
@@ -78,10 +108,87 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Readers, including `manage.py backup_site`, never block writers in WAL mode.
+            'init_command': 'PRAGMA journal_mode=WAL;',
+            # Transactions take the write lock when they begin, so one that
+            # reads and then writes (the archive and purge batches) waits its
+            # turn behind another writer instead of failing with "database is
+            # locked" when it tries to write.
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+# Whether every worker process reads the same cache. The locmem cache is per
+# process: a logout, flushed session or profile change in one worker would
+# stay invisible to the others' copies, so sessions and user profiles are only
+# cached when this is true. Point CACHES at Redis or Memcached to turn it on.
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# With a shared cache, sessions are read from it and written through to the
+# database, so an authenticated request normally does not query django_session.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cached_db' if SHARED_CACHE else 'django.contrib.sessions.backends.db'
+)
+
+# Sliding-window rate limits for anonymous POST endpoints
+# (EveShieldApp.throttling). Each scope is (per client, per route across all
+# clients); None disables a limit. Counters live in THROTTLE_CACHE, which must
+# be shared by every worker process to be exact (e.g. a
+# django.core.cache.backends.redis alias when running more than one worker).
+THROTTLE_CACHE = 'default'
+THROTTLE_RATES = {
+    'report': ('5/hour', '60/minute'),
+    'chatbot': ('30/minute', '600/minute'),
+}
+# Addresses or networks of the reverse proxies in front of the site (e.g.
+# ['127.0.0.1'] behind a local nginx). Requests arriving from one are
+# attributed to the right-most X-Forwarded-For address that is not a proxy;
+# without this every client behind the proxy shares one rate limit.
+TRUSTED_PROXIES = []
+
+
+# Authentication and password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+
+AUTHENTICATION_BACKENDS = [
+    'EveShieldApp.backends.HashingPoolModelBackend',
+]
+
+# New hashes use the first hasher. Hashes made by any other entry, or with a
+# different cost, are upgraded on the user's next successful login. To use
+# Argon2id instead of scrypt, install argon2-cffi and move it to the top.
+# `manage.py benchmark_hashers` shows the cost against login throughput.
+PASSWORD_HASHERS = [
+    'EveShieldApp.hashers.ScryptPasswordHasher',
+    'EveShieldApp.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+PASSWORD_SCRYPT_WORK_FACTOR = 2 ** 14
+PASSWORD_SCRYPT_BLOCK_SIZE = 8
+PASSWORD_SCRYPT_PARALLELISM = 1
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 19456
+PASSWORD_ARGON2_PARALLELISM = 1
+# Threads that hash passwords for async logins, off the event loop.
+PASSWORD_HASHING_THREADS = 4
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -93,7 +200,7 @@ AUTH_PASSWORD_VALIDATORS = [
         'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+        'NAME': 'EveShieldApp.validators.CommonPasswordValidator',
     },
     {
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
@@ -122,10 +229,86 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Vendored assets (manage.py vendor_assets) and app CSS are served by
+# WhiteNoise. collectstatic writes content-hashed copies plus .gz/.br
+# variants; hashed files get far-future immutable cache headers.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+# Fall back to the unhashed URL instead of erroring when collectstatic
+# hasn't been run (tests, fresh checkouts).
+WHITENOISE_MANIFEST_STRICT = False
+
 # Media files (User uploads)
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Media is evidence and never served publicly: staff download it through
+# the report pages (EveShieldApp.evidence). Behind a front server that can
+# send files itself, EVIDENCE_SENDFILE hands the transfer off once Django has
+# checked permission: 'X-Accel-Redirect' for nginx, with an `internal`
+# location at EVIDENCE_ACCEL_PREFIX aliasing MEDIA_ROOT, or 'X-Sendfile' for
+# Apache mod_xsendfile and lighttpd. None makes Django send files itself.
+EVIDENCE_SENDFILE = None
+EVIDENCE_ACCEL_PREFIX = '/protected-media/'
+
+# Resolved reports older than this many days are moved to the archive table
+# by `manage.py archive_reports`.
+REPORT_ARCHIVE_AFTER_DAYS = 90
+
+# Resolved reports, live or archived, and their evidence files are deleted
+# this many days after resolution by `manage.py purge_reports`.
+REPORT_RETENTION_DAYS = 5 * 365
+
+# Snapshots written by `manage.py backup_site`.
+BACKUP_ROOT = BASE_DIR / 'backups'
+
+# Sampling profiler (EveShieldApp.middleware.SamplingProfilerMiddleware):
+# profile one request in PROFILING_SAMPLE_RATE (0 turns random sampling off;
+# staff can still profile a request by sending an X-Profile header), reading
+# its stacks about every PROFILING_INTERVAL seconds. The newest PROFILING_KEEP
+# profiles of each view are kept; staff see them at /profiling/.
+PROFILING_SAMPLE_RATE = 0
+PROFILING_INTERVAL = 0.001
+PROFILING_KEEP = 50
+
+# Live admin dashboard feed (EveShieldApp.live, served under ASGI only). Saves
+# reach open dashboards in the same process at once; every LIVE_POLL_INTERVAL
+# seconds each feed also polls for reports saved by other worker processes.
+# A feed more than LIVE_QUEUE_SIZE events behind skips to its next poll.
+LIVE_POLL_INTERVAL = 5
+LIVE_QUEUE_SIZE = 100
+
+# Report notifications (EveShieldApp.notify). A new report queues a message
+# to up to NOTIFY_MAX_RECIPIENTS active lawyers, and as many counsellors, in
+# its county whose specialization matches. `manage.py send_notifications`
+# delivers them with NOTIFY_SENDERS connections per channel, claiming
+# NOTIFY_BATCH_SIZE at a time. A failed message is retried NOTIFY_RETRY_DELAY
+# seconds later, then twice as long each time, up to NOTIFY_MAX_ATTEMPTS.
+NOTIFY_FROM_EMAIL = 'EveShield <no-reply@eveshield.org>'
+NOTIFY_MAX_RECIPIENTS = 5
+NOTIFY_SENDERS = 4
+NOTIFY_BATCH_SIZE = 100
+NOTIFY_RETRY_DELAY = 60
+NOTIFY_MAX_ATTEMPTS = 5
+# Seconds send_notifications waits between looking for due messages.
+NOTIFY_POLL_INTERVAL = 10
+
+# Outgoing email and SMS. In development both are printed to the console; the
+# README shows how to test against a local SMTP sink and the stub SMS gateway
+# (`manage.py sms_gateway_stub`).
+EMAIL_BACKEND = (
+    'django.core.mail.backends.console.EmailBackend' if DEBUG else 'django.core.mail.backends.smtp.EmailBackend'
+)
+SMS_BACKEND = 'EveShieldApp.notify.ConsoleSMSBackend' if DEBUG else 'EveShieldApp.notify.HTTPSMSBackend'
+SMS_GATEWAY_URL = 'http://localhost:8090/messages'
+SMS_GATEWAY_TOKEN = ''
+
 # Login/Logout URLs
 LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'accounts:profile'
@@ -74,6 +74,7 @@ lawyers_data = [
 ]
 
 for lawyer_data in lawyers_data:
+    lawyer_data['county'] = models.County.objects.resolve(lawyer_data['county'])
     models.Lawyer.objects.get_or_create(
         name=lawyer_data['name'],
         defaults=lawyer_data
@@ -139,6 +140,7 @@ therapists_data = [
 ]
 
 for therapist_data in therapists_data:
+    therapist_data['county'] = models.County.objects.resolve(therapist_data['county'])
     models.Therapist.objects.get_or_create(
         name=therapist_data['name'],
         defaults=therapist_data